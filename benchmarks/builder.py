@@ -0,0 +1,269 @@
+"""
+Builder of Curve artboards
+
+Builds the GUID JSON of Curve artboards, the inverse of the decoder.
+Used to make synthetic documents for the benchmarks and tests.
+"""
+
+import math
+import random
+import uuid
+from typing import Dict, List, Optional
+
+CELL = 100
+"""size of the grid cell of each element."""
+
+
+def hsba(hue: float, saturation=1.0, brightness=1.0, alpha=1.0) -> Dict:
+    return {
+        "hsba": {
+            "alpha": alpha,
+            "brightness": brightness,
+            "hue": hue,
+            "saturation": saturation,
+        }
+    }
+
+
+def run(upper_bound: int, value) -> Dict:
+    return {"upperBound": upper_bound, "value": value}
+
+
+class ArtboardBuilder:
+    """
+    Builds the GUID JSON of a single artboard.
+
+    Curve stores each kind of object in its own top-level list,
+    objects refer to each other by their indices in those lists.
+    """
+
+    def __init__(self, file_version: int, rng: random.Random) -> None:
+        self.file_version = file_version
+        self.rng = rng
+        self.lists: Dict[str, List] = {}
+        self.add("pathStrokeStyles", self.stroke_style())
+        self.add("textStrokeStyles", self.text_stroke_style())
+
+    def add(self, key: str, item) -> int:
+        """Append `item` to the list `key` and return its index."""
+        items = self.lists.setdefault(key, [])
+        items.append(item)
+        return len(items) - 1
+
+    def gid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128))).upper()
+
+    @staticmethod
+    def stroke_style() -> Dict:
+        return {
+            "basicStrokeStyle": {
+                "cap": 0,
+                "dashPattern": [0, 0, 0, 0],
+                "join": 0,
+                "position": 0,
+            },
+            "color": hsba(0, 0, 0),
+            "width": 1,
+        }
+
+    @staticmethod
+    def text_stroke_style() -> Dict:
+        return {"cap": 0, "dashPattern": [0, 0, 0, 0], "join": 1, "position": 0}
+
+    def transform(self, x: float, y: float) -> int:
+        return self.add(
+            "localTransforms",
+            {"rotation": 0, "scale": [1, 1], "shear": 0, "translation": [x, y]},
+        )
+
+    def color_fill(self) -> int:
+        return self.add("fills", {"color": {"_0": hsba(self.rng.random())}})
+
+    def gradient_fill(self, x: float, y: float, stops: int = 3) -> int:
+        gradient = {
+            "gradient": {
+                "stops": [
+                    {"color": hsba(self.rng.random()), "ratio": i / (stops - 1)}
+                    for i in range(stops)
+                ],
+                "typeRawValue": self.rng.randrange(2),
+            },
+            "transform": {
+                "start": [x, y + CELL / 2],
+                "end": [x + CELL, y + CELL / 2],
+                "secondaryEnd": [x, y + CELL],
+            },
+        }
+        return self.add("fills", {"gradient": {"_0": gradient}})
+
+    def geometry(self, x: float, y: float, nodes: int) -> int:
+        """Closed polygon of `nodes` nodes around the cell centre, every other smooth."""
+        node_list = []
+        radius = CELL * 0.4
+        for i in range(nodes):
+            angle = 2 * math.pi * i / nodes
+            r = radius * (1 if i % 2 == 0 else 0.6)
+            anchor = [
+                x + CELL / 2 + r * math.cos(angle),
+                y + CELL / 2 + r * math.sin(angle),
+            ]
+            handle = [0.0, 0.0]
+            node_type: Dict = {"disconnected": {}}
+            if i % 2:
+                length = radius * 0.2
+                handle = [-length * math.sin(angle), length * math.cos(angle)]
+                node_type = {"symmetric": {}}
+            node_list.append(
+                {
+                    "anchorPoint": anchor,
+                    "cornerRadius": 0,
+                    "inPoint": [anchor[0] - handle[0], anchor[1] - handle[1]],
+                    "nodeType": node_type,
+                    "outPoint": [anchor[0] + handle[0], anchor[1] + handle[1]],
+                }
+            )
+        return self.add("pathGeometries", {"closed": True, "nodes": node_list})
+
+    def brush_stroke(self) -> int:
+        profile = self.add(
+            "brushProfiles",
+            {
+                "angle": 0,
+                "containsPressure": False,
+                "handles": [[0, 0], [0.3, self.rng.random()], [0.7, 0.5], [1, 0]],
+                "minimumWidth": 0,
+                "roundness": 1,
+            },
+        )
+        return self.add("brushStrokes", {"brushProfileId": profile})
+
+    def path(self, geometry: int, fill: int, brush_stroke: Optional[int]) -> Dict:
+        """Returns the subElement of a stylable path."""
+        style: Dict = {
+            "fillId": fill,
+            "fillRule": 0,
+            "strokeStyleId": 0,
+            "strokeType": 0,
+        }
+        if brush_stroke is not None:
+            style["brushStrokeId"] = brush_stroke
+            style["strokeType"] = 1
+        input_params = {"shapeDescription": {"_0": "(path)"}}
+
+        if self.file_version >= 51:
+            path = dict(style, inputParams=input_params, subpathIds=[geometry])
+            return {"path": {"_0": self.add("paths", path)}}
+
+        path_id = self.add(
+            "paths", {"geometryId": geometry, "inputParams": input_params}
+        )
+        abstract_path = dict(style, subElement={"path": {"_0": path_id}})
+        return {"abstractPath": {"_0": self.add("abstractPaths", abstract_path)}}
+
+    def text(self, runs: int) -> Dict:
+        """Returns the subElement of a stylable text with `runs` style runs."""
+        words = [f"run{i}" for i in range(runs)]
+        string = " ".join(words)
+        bounds = []
+        end = 0
+        for word in words:
+            end += len(word) + 1
+            bounds.append(min(end, len(string)))
+
+        def runs_of(values) -> Dict:
+            return {"values": [run(b, v) for b, v in zip(bounds, values)]}
+
+        styled_text = {
+            "alignment": runs_of([1] * runs),
+            "fillColor": runs_of([hsba(self.rng.random()) for _ in bounds]),
+            "fontName": runs_of(
+                [("Helvetica", "Helvetica-Bold")[i % 2] for i in range(runs)]
+            ),
+            "fontSize": runs_of([8 + i % 8 for i in range(runs)]),
+            "kerning": runs_of([0] * runs),
+            "lineHeight": runs_of([{"multiple": {"_0": 1.2}}] * runs),
+            "strikethrough": runs_of([False] * runs),
+            "string": string,
+            "underline": runs_of([False] * runs),
+        }
+        text_id = self.add("styledTexts", styled_text)
+        layout = self.add(
+            "texts", {"textFrameLimits": {"autoWidth": {}}, "textFramePivot": [0, 0]}
+        )
+        abstract_text = {"subElement": {"text": {"_0": layout}}, "textId": text_id}
+        return {"abstractText": {"_0": self.add("abstractTexts", abstract_text)}}
+
+    def element(self, name: str, transform: int, sub_element: Dict) -> int:
+        return self.add(
+            "elements",
+            {
+                "blendMode": 0,
+                "blur": 0,
+                "gid": self.gid(),
+                "isHidden": False,
+                "isLocked": False,
+                "localTransformId": transform,
+                "name": name,
+                "opacity": 1,
+                "subElement": sub_element,
+            },
+        )
+
+    def stylable(self, name: str, transform: int, sub_element: Dict) -> int:
+        stylable = self.add("stylables", {"mask": 0, "subElement": sub_element})
+        return self.element(name, transform, {"stylable": {"_0": stylable}})
+
+    def group(self, name: str, element_ids: List[int]) -> int:
+        group = self.add("groups", {"elementIds": element_ids})
+        return self.element(name, self.transform(0, 0), {"group": {"_0": group}})
+
+    def image(self, name: str, x: float, y: float, image_data: int) -> int:
+        image = self.add(
+            "images", {"imageData": {"sharedFileImage": {"_0": image_data}}}
+        )
+        return self.element(name, self.transform(x, y), {"image": {"_0": image}})
+
+    def layer(self, name: str, element_ids: List[int]) -> int:
+        return self.add(
+            "layers",
+            {
+                "elementIds": element_ids,
+                "gid": self.gid(),
+                "isExpanded": True,
+                "isLocked": False,
+                "isVisible": True,
+                "name": name,
+                "opacity": 1,
+            },
+        )
+
+    def artboard(self, title: str, width: float, height: float, layer_ids: List[int]):
+        guide_line = self.add("guideLines", {"offset": width / 2, "orientation": 1})
+        guide = self.element(
+            "Guide", self.transform(0, 0), {"guideLine": {"_0": guide_line}}
+        )
+        guide_layer = self.layer("Guides", [guide])
+        artboard = {
+            "activeLayerIndex": 0,
+            "fillId": self.add("fills", {"color": {"_0": hsba(0, 0, 1)}}),
+            "frame": {"height": height, "width": width, "x": 0, "y": 0},
+            "gid": self.gid(),
+            "guideLayerId": guide_layer,
+            "layerIds": layer_ids,
+            "title": title,
+        }
+        if self.file_version >= 51:
+            artboard.update(exportSettingsId=0, gridSettingsId=0)
+            self.lists["exportSettings"] = [{}]
+            self.lists["gridSettings"] = [{}]
+        else:
+            artboard["settingsId"] = 0
+            self.lists["artboardSettings"] = [
+                {
+                    "gridAngle": 45,
+                    "gridMode": 0,
+                    "gridSpacing": 20,
+                    "isGridVisible": False,
+                }
+            ]
+        self.lists["artboards"] = [artboard]
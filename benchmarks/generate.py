@@ -0,0 +1,186 @@
+"""
+Generator of synthetic Curve documents
+
+Writes .curve archives of file format 44 (Curve 5.x) or 51 (Curve 6.x)
+with chosen numbers of artboards, layers, groups, paths, texts, gradients,
+brush strokes and images, to measure how the conversion scales with size.
+
+Counts are per layer, except artboards and layers (per document / artboard).
+Elements of each layer are placed inside `--group-depth` nested groups.
+
+usage: python -m benchmarks.generate [--format {44,51}] [--artboards N] [--layers N]
+                                     [--paths N] [--nodes N] ... OUTPUT
+"""
+
+import argparse
+import colorsys
+import hashlib
+import io
+import json
+import math
+import random
+import sys
+import uuid
+import zipfile
+from typing import List, Optional
+
+from PIL import Image
+
+from benchmarks.builder import CELL, ArtboardBuilder
+
+FORMATS = {44: "5.19.0", 51: "6.1.0"}
+"""app version of each supported file format."""
+
+
+def bitmap(size: int, hue: float) -> bytes:
+    """PNG of a single colour, stored as *.dat."""
+    color = tuple(int(c * 255) for c in colorsys.hsv_to_rgb(hue, 1, 1))
+    output = io.BytesIO()
+    Image.new("RGB", (size, size), color).save(output, "PNG")
+    return output.getvalue()
+
+
+def build_artboard(
+    builder: ArtboardBuilder,
+    options: argparse.Namespace,
+    title: str,
+    bitmaps: List[str],
+) -> None:
+    """Fill `builder` with one artboard of `options` counts."""
+    per_layer = (
+        options.paths
+        + options.gradients
+        + options.brushes
+        + options.texts
+        + options.images
+    )
+    columns = max(1, math.ceil(math.sqrt(per_layer)))
+    rows = max(1, math.ceil(per_layer / columns))
+
+    layer_ids = []
+    for layer_index in range(options.layers):
+        cells = (
+            (CELL * (i % columns), CELL * (i // columns)) for i in range(per_layer)
+        )
+        element_ids = []
+        for i in range(options.paths):
+            x, y = next(cells)
+            sub = builder.path(
+                builder.geometry(x, y, options.nodes), builder.color_fill(), None
+            )
+            element_ids.append(
+                builder.stylable(f"Path {i}", builder.transform(0, 0), sub)
+            )
+        for i in range(options.gradients):
+            x, y = next(cells)
+            fill = builder.gradient_fill(x, y)
+            sub = builder.path(builder.geometry(x, y, options.nodes), fill, None)
+            element_ids.append(
+                builder.stylable(f"Gradient {i}", builder.transform(0, 0), sub)
+            )
+        for i in range(options.brushes):
+            x, y = next(cells)
+            geometry = builder.geometry(x, y, options.nodes)
+            sub = builder.path(geometry, builder.color_fill(), builder.brush_stroke())
+            element_ids.append(
+                builder.stylable(f"Brush {i}", builder.transform(0, 0), sub)
+            )
+        for i in range(options.texts):
+            x, y = next(cells)
+            sub = builder.text(options.text_runs)
+            element_ids.append(
+                builder.stylable(f"Text {i}", builder.transform(x, y + CELL / 2), sub)
+            )
+        for i in range(options.images):
+            x, y = next(cells)
+            element_ids.append(builder.image(f"Image {i}", x, y, i % len(bitmaps)))
+
+        for depth in range(options.group_depth):
+            element_ids = [builder.group(f"Group {depth}", element_ids)]
+        layer_ids.append(builder.layer(f"Layer {layer_index + 1}", element_ids))
+
+    for relative_path in bitmaps:
+        builder.add("imageDatas", {"relativePath": relative_path})
+    builder.artboard(title, CELL * columns, CELL * rows, layer_ids)
+
+
+def generate(output, options: argparse.Namespace) -> int:
+    """Write the document to `output` (path or binary file), returns element count."""
+    rng = random.Random(options.seed)
+    file_version = options.format
+    document_gid = str(uuid.UUID(int=rng.getrandbits(128))).upper()
+    elements = 0
+
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        bitmaps = []
+        for i in range(options.bitmaps if options.images else 0):
+            data = bitmap(options.image_size, i / max(options.bitmaps, 1))
+            name = hashlib.sha1(data).hexdigest() + ".dat"
+            archive.writestr(name, data)
+            bitmaps.append(name)
+
+        artboard_paths = []
+        for i in range(options.artboards):
+            builder = ArtboardBuilder(file_version, rng)
+            build_artboard(builder, options, f"Artboard {i + 1}", bitmaps)
+            elements += len(builder.lists["elements"])
+            artboard_path = f"{document_gid}{i}.json"
+            archive.writestr(
+                artboard_path, json.dumps(builder.lists, separators=(",", ":"))
+            )
+            artboard_paths.append(artboard_path)
+
+        document = {
+            "appVersion": FORMATS[file_version],
+            "drawing": {
+                "activeArtboardIndex": 0,
+                "artboardPaths": artboard_paths,
+                "settings": {
+                    "dimensionsVisible": True,
+                    "guidesVisible": True,
+                    "rulersVisible": True,
+                    "snapToGrid": False,
+                    "units": "Pixels",
+                },
+            },
+        }
+        manifest = {
+            "documentJSONFilename": "Document.json",
+            "fileFormatVersion": file_version,
+            "thumbnailImageFilename": "Thumbnail.png",
+        }
+        archive.writestr("Manifest.json", json.dumps(manifest))
+        archive.writestr("Document.json", json.dumps(document))
+        archive.writestr("Thumbnail.png", bitmap(16, 0))
+    return elements
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("output", help="path of the .curve file")
+    parser.add_argument("--format", type=int, choices=sorted(FORMATS), default=51)
+    parser.add_argument("--artboards", type=int, default=1)
+    parser.add_argument("--layers", type=int, default=1, help="layers per artboard")
+    parser.add_argument("--group-depth", type=int, default=0, help="nested groups")
+    parser.add_argument("--paths", type=int, default=100, help="filled paths")
+    parser.add_argument("--nodes", type=int, default=8, help="nodes per path")
+    parser.add_argument("--gradients", type=int, default=0, help="gradient paths")
+    parser.add_argument("--brushes", type=int, default=0, help="brush stroke paths")
+    parser.add_argument("--texts", type=int, default=0, help="text elements")
+    parser.add_argument("--text-runs", type=int, default=3, help="style runs per text")
+    parser.add_argument("--images", type=int, default=0, help="image elements")
+    parser.add_argument("--bitmaps", type=int, default=1, help="distinct bitmaps")
+    parser.add_argument("--image-size", type=int, default=64, help="bitmap size in px")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+
+    if options.nodes < 2 or options.text_runs < 1 or options.bitmaps < 1:
+        parser.error("--nodes needs at least 2, --text-runs and --bitmaps at least 1")
+
+    elements = generate(options.output, options)
+    print(f"{options.output}: {elements} elements", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
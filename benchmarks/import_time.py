@@ -0,0 +1,193 @@
+"""
+Benchmark of cold start time
+
+Imports the extension and converts a document with CurveInput.load()
+in fresh interpreters with `-X importtime`, like Inkscape runs it,
+and compares the result with a baseline recorded on this machine with --save
+(import_time.json, it isn't committed as timings depend on the machine).
+The import alone hides the modules load() imports lazily, so both are measured.
+Regressions are modules which should be imported lazily showing up at startup,
+or a slower cold start or import than the baseline (over the threshold).
+
+usage: python -m benchmarks.import_time [--runs N] [--threshold R] [--save]
+                                        [--file FILE] [MODULE]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BASELINE = os.path.join(os.path.dirname(__file__), "import_time.json")
+DEFAULT_FILE = os.path.join(
+    ROOT, "tests", "converter", "data", "variousshapes_51.curve"
+)
+
+LAZY_MODULES = [
+    "PIL",
+    "plistlib",
+    "colorsys",
+    "multiprocessing",
+    "concurrent.futures.process",
+    "inkvn.reader.read",
+    "inkvn.svg.convert",
+]
+"""modules which must not be imported when the extension starts."""
+
+LOAD_MARKER = "-- load --"
+
+COLD_START = f"""
+import sys, time
+start = time.perf_counter()
+import {{module}}
+imported = time.perf_counter()
+print({LOAD_MARKER!r}, file=sys.stderr)
+from inkvn.vninput import CurveInput
+effect = CurveInput()
+effect.parse_arguments([sys.argv[1]])
+with open(sys.argv[1], "rb") as stream:
+    effect.load(stream)
+end = time.perf_counter()
+print(round((imported - start) * 1e6), round((end - start) * 1e6))
+"""
+"""import `module`, then convert the file, prints both times in microseconds."""
+
+
+def cold_start(module: str, file_name: str) -> Dict:
+    """Times and imported modules of a cold start, in a new interpreter."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            COLD_START.format(module=module),
+            file_name,
+        ],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_us, total_us = (int(t) for t in result.stdout.split()[-2:])
+
+    # cumulative import time of each module, before and during load()
+    startup: Dict[str, int] = {}
+    loaded: Dict[str, int] = {}
+    times = startup
+    for line in result.stderr.splitlines():
+        if line == LOAD_MARKER:
+            times = loaded
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return {
+        "import_us": import_us,
+        "total_us": total_us,
+        "startup": startup,
+        "loaded": loaded,
+    }
+
+
+def measure(module: str, file_name: str, runs: int) -> Dict:
+    """Best of `runs`, the first run also compiles the bytecode."""
+    cold_start(module, file_name)
+    results = [cold_start(module, file_name) for _ in range(runs)]
+    best = min(results, key=lambda r: r["total_us"])
+
+    def inkvn_us(stage: str) -> Dict[str, int]:
+        return {
+            name: min(r[stage].get(name, 0) for r in results)
+            for name in sorted(best[stage])
+            if name.split(".")[0] == "inkvn"
+        }
+
+    return {
+        "module": module,
+        "file": os.path.relpath(file_name, ROOT),
+        "import_us": min(r["import_us"] for r in results),
+        "total_us": best["total_us"],
+        "inkvn_us": inkvn_us("startup"),
+        "load_inkvn_us": inkvn_us("loaded"),
+        "modules": sorted(best["startup"]),
+        "load_modules": sorted(best["loaded"]),
+    }
+
+
+def eager_imports(result: Dict) -> List[str]:
+    """Returns the modules of LAZY_MODULES imported at startup."""
+    return [
+        f"{name} is imported at startup"
+        for name in result["modules"]
+        if any(name == m or name.startswith(m + ".") for m in LAZY_MODULES)
+    ]
+
+
+def compare(result: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Returns the timing regressions of `result` against `baseline`."""
+    regressions = []
+    for key, what in [("import_us", "import"), ("total_us", "cold start")]:
+        limit = baseline[key] * (1 + threshold)
+        if result[key] > limit:
+            regressions.append(
+                f"{what} of {result['module']} takes {result[key] / 1e3:.1f} ms,"
+                f" baseline {baseline[key] / 1e3:.1f} ms"
+            )
+    return regressions
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("module", nargs="?", default="inkvn.vninput")
+    parser.add_argument("--file", default=DEFAULT_FILE, help="document to convert")
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown relative to the baseline",
+    )
+    parser.add_argument("--save", action="store_true", help="record a new baseline")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON file")
+    options = parser.parse_args(args)
+
+    result = measure(options.module, options.file, options.runs)
+    print(f"import {options.module:<28} {result['import_us'] / 1e3:>8.1f} ms")
+    for name, time_us in result["inkvn_us"].items():
+        print(f"  {name:<33} {time_us / 1e3:>8.1f} ms")
+    print(
+        f"import + load({os.path.basename(options.file)})".ljust(36),
+        f"{result['total_us'] / 1e3:>8.1f} ms",
+    )
+    for name, time_us in result["load_inkvn_us"].items():
+        print(f"  {name:<33} {time_us / 1e3:>8.1f} ms")
+
+    regressions = eager_imports(result)
+    if options.save:
+        with open(options.baseline, "w") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+        print(f"baseline saved to {options.baseline}")
+    elif not os.path.isfile(options.baseline):
+        print("no baseline to compare times with, run with --save first")
+    else:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        if "import_us" in baseline:
+            regressions += compare(result, baseline, options.threshold)
+        else:
+            print("baseline of an older format, run with --save first")
+
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
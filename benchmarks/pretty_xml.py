@@ -0,0 +1,72 @@
+"""
+Benchmark of pretty printing
+
+Compares re-parsing the serialized document (to_pretty_xml)
+with pretty printing the tree directly (pretty_tostring) on the image fixtures.
+
+usage: python -m benchmarks.pretty_xml [--repeat N] [FILE ...]
+"""
+
+import argparse
+import copy
+import glob
+import os
+import time
+from typing import Callable, List, Optional
+
+from inkvn.reader.read import CurveReader
+from inkvn.svg.convert import CurveConverter
+from inkvn.utils import pretty_tostring, to_pretty_xml
+
+DATA_DIR = os.path.join(
+    os.path.dirname(__file__), os.pardir, "tests", "converter", "data"
+)
+
+
+def _best_of(repeat: int, func: Callable[[], bytes]) -> float:
+    """Best wall time of `func` in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_file(file_name: str, repeat: int) -> None:
+    with open(file_name, "rb") as stream:
+        converter = CurveConverter()
+        with CurveReader(stream, False) as reader:
+            converter.convert(reader)
+    svg = converter.doc.getroot()
+
+    # pretty_tostring modifies whitespace in place, so each run gets a copy
+    copies = [copy.deepcopy(converter.doc).getroot() for _ in range(repeat + 1)]
+
+    expected = to_pretty_xml(svg.tostring())
+    assert pretty_tostring(copies.pop()) == expected, f"{file_name}: output differs"
+
+    reparse = _best_of(repeat, lambda: to_pretty_xml(svg.tostring()))
+    direct = _best_of(repeat, lambda: pretty_tostring(copies.pop()))
+
+    print(
+        f"{os.path.basename(file_name):<28} {len(expected) / 1e6:>8.2f} MB"
+        f" {reparse * 1e3:>10.2f} ms {direct * 1e3:>10.2f} ms"
+        f" {reparse / direct:>7.2f}x"
+    )
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("files", nargs="*", help="files to convert")
+    parser.add_argument("--repeat", type=int, default=10, help="runs per file")
+    options = parser.parse_args(args)
+
+    files = options.files or sorted(glob.glob(os.path.join(DATA_DIR, "image*")))
+    print(f"{'file':<28} {'output':>11} {'re-parse':>13} {'direct':>13} {'speedup':>8}")
+    for file_name in files:
+        bench_file(file_name, options.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark suite of the conversion stages
+
+Runs every fixture through read, decode, convert and pretty printing separately,
+records wall time, CPU time and peak allocations (tracemalloc) of each stage,
+and compares them with a stored baseline.
+
+usage: python -m benchmarks.suite [--repeat N] [--output FILE]
+                                  [--compare BASELINE] [--threshold R] [FILE ...]
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import IO, Callable, Dict, List, Optional
+
+from inkvn.reader.read import CurveReader
+from inkvn.svg.convert import CurveConverter
+from inkvn.utils import svg_to_bytes
+
+DATA_DIR = os.path.join(
+    os.path.dirname(__file__), os.pardir, "tests", "converter", "data"
+)
+
+STAGES = ["read", "decode", "convert", "pretty"]
+
+
+def pipeline(stream: IO[bytes]) -> List[Callable[[], object]]:
+    """Stages of converting the document in `stream`, to be called in order."""
+    state: Dict = {}
+
+    def read():
+        state["reader"] = CurveReader(stream, False, decode=False)
+
+    def decode():
+        state["reader"].read_artboards()
+
+    def convert():
+        converter = CurveConverter()
+        converter.convert(state["reader"])
+        state["reader"].close()
+        state["converter"] = converter
+
+    def pretty():
+        svg_to_bytes(state["converter"].document, pretty_print=True)
+
+    return [read, decode, convert, pretty]
+
+
+def bench_file(file_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Best wall and CPU time of each stage, and its peak allocations."""
+    result = {stage: {"wall": float("inf"), "cpu": float("inf")} for stage in STAGES}
+    for _ in range(repeat):
+        with open(file_name, "rb") as stream:
+            for stage, func in zip(STAGES, pipeline(stream)):
+                wall, cpu = time.perf_counter(), time.process_time()
+                func()
+                wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+                result[stage]["wall"] = min(result[stage]["wall"], wall)
+                result[stage]["cpu"] = min(result[stage]["cpu"], cpu)
+
+    # tracing slows everything down, so it has its own run
+    tracemalloc.start()
+    try:
+        with open(file_name, "rb") as stream:
+            for stage, func in zip(STAGES, pipeline(stream)):
+                tracemalloc.reset_peak()
+                start = tracemalloc.get_traced_memory()[0]
+                func()
+                result[stage]["peak"] = tracemalloc.get_traced_memory()[1] - start
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def run_suite(files: List[str], repeat: int) -> Dict:
+    results = {}
+    for file_name in files:
+        name = os.path.basename(file_name)
+        results[name] = bench_file(file_name, repeat)
+        times = " ".join(
+            f"{results[name][stage]['wall'] * 1e3:>9.2f}" for stage in STAGES
+        )
+        print(f"{name:<34} {times}")
+
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    results: Dict, baseline: Dict, threshold: float, min_time: float
+) -> List[str]:
+    """
+    Returns the regressions of `results` against `baseline`.
+
+    Stages faster than `min_time` in the baseline are too noisy and skipped.
+    """
+    regressions = []
+    print(f"\n{'file':<34} {'stage':<8} {'base ms':>9} {'now ms':>9} {'ratio':>7}")
+    for name, stages in results["results"].items():
+        base_stages = baseline["results"].get(name)
+        if base_stages is None:
+            continue
+        for stage, now in stages.items():
+            base = base_stages.get(stage)
+            if base is None or base["wall"] < min_time:
+                continue
+            ratio = now["wall"] / base["wall"]
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = " <-"
+                regressions.append(f"{name} {stage}: {ratio:.2f}x slower")
+            print(
+                f"{name:<34} {stage:<8} {base['wall'] * 1e3:>9.2f}"
+                f" {now['wall'] * 1e3:>9.2f} {ratio:>6.2f}x{flag}"
+            )
+    return regressions
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("files", nargs="*", help="files to convert")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each stage")
+    parser.add_argument("--output", help="save the results as JSON")
+    parser.add_argument("--compare", help="baseline JSON to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown relative to the baseline",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.001,
+        help="skip stages faster than this in the baseline (seconds)",
+    )
+    options = parser.parse_args(args)
+
+    files = options.files or sorted(
+        glob.glob(os.path.join(DATA_DIR, "*.curve"))
+        + glob.glob(os.path.join(DATA_DIR, "*.vectornator"))
+    )
+
+    print(f"{'file':<34} " + " ".join(f"{stage + ' ms':>9}" for stage in STAGES))
+    results = run_suite(files, options.repeat)
+
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, options.threshold, options.min_time)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Benchmark of NSKeyedUnarchiver
+
+Times unarchiving the legacy attributed strings (attributedText) of the
+text.vectornator fixture, and of a synthetic attributed string with many
+style runs.
+
+usage: python -m benchmarks.unarchiver [--repeat N] [--runs N]
+"""
+
+import argparse
+import base64
+import json
+import os
+import plistlib
+import time
+import zipfile
+from typing import Any, Callable, Iterator, List, Optional
+
+from inkvn.utils import NSKeyedUnarchiver
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+    "tests",
+    "converter",
+    "data",
+    "text.vectornator",
+)
+
+
+def _best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Best wall time of `func` in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _attributed_texts(obj: Any) -> Iterator[str]:
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key == "attributedText" and isinstance(value, str):
+                yield value
+            else:
+                yield from _attributed_texts(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from _attributed_texts(value)
+
+
+def fixture_archives(file_name: str = FIXTURE) -> List[bytes]:
+    """Archived attributed strings of a Vectornator document."""
+    archives = []
+    with zipfile.ZipFile(file_name) as archive:
+        for name in archive.namelist():
+            if name.endswith(".json"):
+                data = json.loads(archive.read(name))
+                archives += [base64.b64decode(t) for t in _attributed_texts(data)]
+    return archives
+
+
+def synthetic_archive(runs: int) -> bytes:
+    """
+    Archived attributed string with `runs` style runs, sharing one font
+    and paragraph style.
+    """
+    uid = plistlib.UID
+    objects: List[Any] = ["$null"]
+
+    def add(obj: Any) -> plistlib.UID:
+        objects.append(obj)
+        return uid(len(objects) - 1)
+
+    def cls(*names: str) -> plistlib.UID:
+        return add({"$classname": names[0], "$classes": list(names)})
+
+    dictionary = cls("NSDictionary", "NSObject")
+    array = cls("NSArray", "NSObject")
+    color_class = cls("UIColor", "NSObject")
+    font = add(
+        {
+            "$class": cls("UIFont", "NSObject"),
+            "NSName": add("Helvetica"),
+            "NSSize": 12.0,
+        }
+    )
+    paragraph = add({"$class": cls("NSParagraphStyle", "NSObject"), "NSAlignment": 0})
+    keys = [add(k) for k in ("NSColor", "NSFont", "NSParagraphStyle")]
+
+    attributes = []
+    for i in range(runs):
+        color = add(
+            {
+                "$class": color_class,
+                "UIRed": (i % 256) / 255,
+                "UIGreen": 0.0,
+                "UIBlue": 0.0,
+                "UIAlpha": 1.0,
+            }
+        )
+        attributes.append(
+            add(
+                {
+                    "$class": dictionary,
+                    "NS.keys": keys,
+                    "NS.objects": [color, font, paragraph],
+                }
+            )
+        )
+
+    info = b"".join(
+        bytes([4, i]) if i < 128 else bytes([4, i & 0x7F | 0x80, i >> 7])
+        for i in range(runs)
+    )
+    root = add(
+        {
+            "$class": cls("NSAttributedString", "NSObject"),
+            "NSString": add(
+                {"$class": cls("NSString", "NSObject"), "NS.string": "abcd" * runs}
+            ),
+            "NSAttributes": add({"$class": array, "NS.objects": attributes}),
+            "NSAttributeInfo": add(
+                {"$class": cls("NSData", "NSObject"), "NS.data": info}
+            ),
+        }
+    )
+    plist = {
+        "$version": 100000,
+        "$archiver": "NSKeyedArchiver",
+        "$top": {"root": root},
+        "$objects": objects,
+    }
+    return plistlib.dumps(plist, fmt=plistlib.FMT_BINARY)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=20, help="runs per input")
+    parser.add_argument(
+        "--runs", type=int, default=2000, help="style runs of the synthetic string"
+    )
+    options = parser.parse_args(args)
+
+    archives = fixture_archives()
+    elapsed = _best_of(options.repeat, lambda: [NSKeyedUnarchiver(a) for a in archives])
+    print(
+        f"{'text.vectornator':<28} {len(archives):>6} strings {elapsed * 1e3:>10.3f} ms"
+    )
+
+    synthetic = synthetic_archive(options.runs)
+    elapsed = _best_of(options.repeat, lambda: NSKeyedUnarchiver(synthetic))
+    print(f"{'synthetic':<28} {options.runs:>6} runs    {elapsed * 1e3:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
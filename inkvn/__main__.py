@@ -38,4 +38,6 @@ else:
     # seems like we should be executed.
     from .vninput import main
 
-main()
+# worker processes (spawn) import this module as __mp_main__
+if __name__ == "__main__":
+    main()
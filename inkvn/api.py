@@ -0,0 +1,139 @@
+"""
+inkvn API
+
+Converts Linearity Curve / Vectornator files to SVG without Inkscape.
+
+Conversions can be profiled with inkvn.trace:
+
+    with trace.tracing() as tracer:
+        convert_file("input.curve", "output.svg")
+    tracer.write_chrome_trace("trace.json")
+    print(tracer.summary())
+"""
+
+import os
+from typing import IO, Optional, Sequence, Union
+
+from inkvn.reader.read import CurveReader
+from inkvn.svg.convert import CurveConverter
+from inkvn.svg.stream import CurveStreamConverter
+from inkvn.utils import svg_to_bytes
+
+
+def convert(
+    stream: IO[bytes],
+    clip_page: bool = False,
+    pretty_print: bool = True,
+    image_dir: Optional[str] = None,
+    image_href_base: Optional[str] = None,
+    is_debug: bool = False,
+    workers: int = 0,
+    artboards: Optional[Sequence[Union[int, str]]] = None,
+    bake_effects: bool = False,
+    keep_effect_params: bool = False,
+) -> bytes:
+    """
+    Convert a .curve / .vectornator document to SVG.
+
+    Bitmaps are embedded as Base64 unless `image_dir` is given,
+    see CurveConverter for `image_href_base`.
+    With `workers` > 1, artboards are decoded in parallel.
+    `artboards` selects artboards by index (starting from 1) or title.
+    With `bake_effects`, LPEs are written as plain paths
+    (see CurveConverter for `keep_effect_params`).
+    """
+    converter = CurveConverter(
+        image_dir=image_dir,
+        image_href_base=image_href_base,
+        bake_effects=bake_effects,
+        keep_effect_params=keep_effect_params,
+    )
+    with CurveReader(stream, is_debug, workers, artboards) as reader:
+        converter.convert(reader, clip_page)
+    return svg_to_bytes(converter.doc.getroot(), pretty_print)
+
+
+def convert_to(
+    stream: IO[bytes],
+    output: IO[bytes],
+    clip_page: bool = False,
+    pretty_print: bool = True,
+    image_dir: Optional[str] = None,
+    image_href_base: Optional[str] = None,
+    is_debug: bool = False,
+    workers: int = 0,
+    artboards: Optional[Sequence[Union[int, str]]] = None,
+    bake_effects: bool = False,
+    keep_effect_params: bool = False,
+) -> None:
+    """
+    Convert a .curve / .vectornator document and write the SVG to `output`.
+
+    The SVG is written layer by layer (see CurveStreamConverter).
+    """
+    converter = CurveStreamConverter(
+        image_dir=image_dir,
+        image_href_base=image_href_base,
+        bake_effects=bake_effects,
+        keep_effect_params=keep_effect_params,
+    )
+    with CurveReader(stream, is_debug, workers, artboards) as reader:
+        converter.write(reader, output, clip_page, pretty_print)
+
+
+def convert_file(
+    input_path: str,
+    output_path: str,
+    clip_page: bool = False,
+    pretty_print: bool = True,
+    external_images: bool = False,
+    streaming: bool = False,
+    workers: int = 0,
+    artboards: Optional[Sequence[Union[int, str]]] = None,
+    bake_effects: bool = False,
+    keep_effect_params: bool = False,
+) -> None:
+    """
+    Convert a .curve / .vectornator file and write the SVG to `output_path`.
+
+    With `external_images`, bitmaps are written to `<output name>_images/`
+    next to the SVG and referenced by relative hrefs.
+    With `streaming`, the SVG is written while converting (see convert_to()).
+    """
+    image_dir = None
+    if external_images:
+        image_dir = f"{os.path.splitext(output_path)[0]}_images"
+
+    image_href_base = os.path.dirname(os.path.abspath(output_path))
+
+    with open(input_path, "rb") as stream:
+        if streaming:
+            with open(output_path, "wb") as f:
+                convert_to(
+                    stream,
+                    f,
+                    clip_page=clip_page,
+                    pretty_print=pretty_print,
+                    image_dir=image_dir,
+                    image_href_base=image_href_base,
+                    workers=workers,
+                    artboards=artboards,
+                    bake_effects=bake_effects,
+                    keep_effect_params=keep_effect_params,
+                )
+            return
+
+        result = convert(
+            stream,
+            clip_page=clip_page,
+            pretty_print=pretty_print,
+            image_dir=image_dir,
+            image_href_base=image_href_base,
+            workers=workers,
+            artboards=artboards,
+            bake_effects=bake_effects,
+            keep_effect_params=keep_effect_params,
+        )
+
+    with open(output_path, "wb") as f:
+        f.write(result)
@@ -0,0 +1,289 @@
+"""
+inkvn Batch Converter
+
+Converts many .curve / .vectornator files in worker processes
+and writes a JSON report with timings, memory and element counts per file.
+
+usage: python -m inkvn.batch [-j N] [-o DIR] [--report FILE] [--trace-memory] PATH ...
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from inkvn.reader.read import CurveReader
+from inkvn.svg.convert import CurveConverter
+from inkvn.utils import svg_to_bytes
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+EXTENSIONS = (".curve", ".vectornator")
+
+
+def find_documents(paths: List[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield documents in `paths`, directories are searched recursively.
+
+    Each document comes with its path relative to the searched directory,
+    or its file name if it was given directly.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(EXTENSIONS):
+                        document = os.path.join(root, name)
+                        yield document, os.path.relpath(document, path)
+        else:
+            yield path, os.path.basename(path)
+
+
+def output_paths(
+    documents: List[Tuple[str, str]], output_dir: Optional[str]
+) -> List[str]:
+    """
+    SVG paths of `documents`, next to them unless `output_dir` is given.
+
+    In `output_dir` the directories searched for documents are mirrored.
+    Documents which would still be written to the same file
+    (a.curve and a.vectornator, or files of the same name given directly)
+    get a numeric suffix, so no output of the batch overwrites another.
+    """
+    outputs: List[str] = []
+    used = set()
+    for path, name in documents:
+        if output_dir is None:
+            base = os.path.splitext(path)[0]
+        else:
+            base = os.path.join(output_dir, os.path.splitext(name)[0])
+        output = f"{base}.svg"
+        number = 2
+        while os.path.normcase(os.path.abspath(output)) in used:
+            output = f"{base}-{number}.svg"
+            number += 1
+        used.add(os.path.normcase(os.path.abspath(output)))
+        outputs.append(output)
+    return outputs
+
+
+def _max_rss() -> Optional[int]:
+    """Peak resident memory of this process in bytes."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def convert_one(
+    input_path: str,
+    output_file: str,
+    clip_page: bool = False,
+    pretty_print: bool = True,
+    external_images: bool = False,
+    trace_memory: bool = False,
+    bake_effects: bool = False,
+    keep_effect_params: bool = False,
+) -> Dict[str, Any]:
+    """
+    Convert a single file and return its report.
+
+    With `trace_memory`, peak_memory is the peak of Python allocations
+    while converting; tracing makes the conversion several times slower.
+    max_rss is the peak of the worker process, including earlier files.
+    """
+    report: Dict[str, Any] = {
+        "input": input_path,
+        "output": output_file,
+        "pid": os.getpid(),
+        "times": {},
+        "error": None,
+        "peak_memory": None,
+    }
+    times = report["times"]
+    stage = "read"
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with open(input_path, "rb") as stream:
+            start = time.perf_counter()
+            reader = CurveReader(stream, False, decode=False)
+            times["read"] = time.perf_counter() - start
+
+            with reader:
+                stage = "decode"
+                start = time.perf_counter()
+                reader.read_artboards()
+                times["decode"] = time.perf_counter() - start
+
+                stage = "convert"
+                image_dir = None
+                if external_images:
+                    image_dir = f"{os.path.splitext(output_file)[0]}_images"
+                start = time.perf_counter()
+                converter = CurveConverter(
+                    image_dir=image_dir,
+                    image_href_base=os.path.dirname(os.path.abspath(output_file)),
+                    bake_effects=bake_effects,
+                    keep_effect_params=keep_effect_params,
+                )
+                converter.convert(reader, clip_page)
+                times["convert"] = time.perf_counter() - start
+
+        report["counts"] = {
+            "artboards": len(reader.artboards),
+            "layers": sum(len(a.layers) for a in reader.artboards),
+            "elements": sum(
+                sum(1 for _ in a.iter_elements()) for a in reader.artboards
+            ),
+            "images": len(reader.images),
+            "svg_elements": sum(1 for _ in converter.document.iter()),
+        }
+
+        stage = "serialize"
+        start = time.perf_counter()
+        result = svg_to_bytes(converter.document, pretty_print)
+        with open(output_file, "wb") as f:
+            f.write(result)
+        times["serialize"] = time.perf_counter() - start
+        report["size"] = len(result)
+    except Exception as e:
+        report["error"] = _error(stage, e)
+    finally:
+        if trace_memory:
+            report["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        report["max_rss"] = _max_rss()
+
+    times["total"] = sum(times.values())
+    return report
+
+
+def _error(stage: str, e: BaseException) -> Dict[str, Any]:
+    """Error entry of a report, for the exception being handled."""
+    return {
+        "stage": stage,
+        "type": type(e).__name__,
+        "message": str(e),
+        "traceback": traceback.format_exc(),
+    }
+
+
+def _init_worker() -> None:
+    # workers import inkex once with this module and are reused for many files.
+    # stdout is kept for the report.
+    sys.stdout = sys.stderr
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Convert .curve / .vectornator files to SVG."
+    )
+    parser.add_argument("paths", nargs="+", help="files or directories to convert")
+    parser.add_argument(
+        "-o", "--output-dir", help="directory for SVG files (default: next to input)"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes",
+    )
+    parser.add_argument("--report", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--clip-page", action="store_true", help="clip pages")
+    parser.add_argument(
+        "--no-pretty", action="store_true", help="don't pretty print the SVG"
+    )
+    parser.add_argument(
+        "--external-images",
+        action="store_true",
+        help="write bitmaps next to the SVG instead of embedding them",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="report peak Python memory per file (slow)",
+    )
+    parser.add_argument(
+        "--bake-effects",
+        action="store_true",
+        help="write PowerStroke and rounded corners as plain paths instead of LPEs",
+    )
+    parser.add_argument(
+        "--keep-effect-params",
+        action="store_true",
+        help="keep the parameters of baked LPEs in data-path-effect attributes",
+    )
+    options = parser.parse_args(args)
+
+    documents = list(find_documents(options.paths))
+    outputs = output_paths(documents, options.output_dir)
+    if options.output_dir is not None:
+        for output_dir in sorted({os.path.dirname(output) for output in outputs}):
+            os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max(options.jobs, 1), initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(
+                convert_one,
+                document,
+                output,
+                options.clip_page,
+                not options.no_pretty,
+                options.external_images,
+                options.trace_memory,
+                options.bake_effects,
+                options.keep_effect_params,
+            )
+            for (document, _), output in zip(documents, outputs)
+        ]
+        files = []
+        for (document, _), output, future in zip(documents, outputs, futures):
+            try:
+                report = future.result()
+            except Exception as e:
+                # the worker died or the job couldn't be sent to it
+                report = {
+                    "input": document,
+                    "output": output,
+                    "times": {},
+                    "error": _error("worker", e),
+                }
+            status = "error" if report["error"] else "ok"
+            print(
+                f"{status:<5} {report['times'].get('total', 0.0):8.3f}s {report['input']}",
+                file=sys.stderr,
+            )
+            files.append(report)
+
+    summary = {
+        "files": len(files),
+        "errors": sum(1 for report in files if report["error"]),
+        "jobs": options.jobs,
+        "wall_time": time.perf_counter() - start,
+    }
+    result = json.dumps({"summary": summary, "files": files}, indent=2)
+    if options.report is None:
+        print(result)
+    else:
+        with open(options.report, "w") as f:
+            f.write(result)
+
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+inkvn Client
+
+Thin client of the conversion server (inkvn.server), it only uses the standard library
+so that it starts quickly. Takes the same arguments as the extension and writes the SVG
+to stdout. If no server is running, the document is converted locally.
+Options are given as --name=value, as Inkscape does.
+
+usage: python -m inkvn.client [--name=value ...] INPUT_FILE
+
+To use it from Inkscape, the .inx command can be changed to:
+    <command location="inx" interpreter="python">inkvn/client.py</command>
+
+Protocol (one request per connection):
+    request:  JSON header line {"args": [...], "path": ...} or {"args": [...], "size": n},
+              followed by n bytes of document if "size" is given.
+    response: JSON header line {"status": "ok", "size": n, "messages": ...}
+              followed by n bytes of SVG,
+              or {"status": "error", "message": ..., "messages": ...}.
+
+Over TCP, client and server first prove to each other that they know the token,
+which is never sent:
+    client:   {"nonce": c}
+    server:   {"nonce": s, "proof": proof(token, "server", c, s)}
+    request:  the header also has "proof": proof(token, "client", c, s).
+The client doesn't send its request to a server which fails to prove it.
+
+The Unix socket and its directory must belong to the user
+and not be writable by others, or the client doesn't connect.
+"""
+
+import getpass
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import List, Optional, Tuple, Union
+
+Address = Union[str, Tuple[str, int]]
+
+DEFAULT_PORT = 47317
+
+PATH_OPTIONS = ("--image_dir", "--profile")
+"""options with paths, resolved by the client as the server has another cwd."""
+
+
+class ServerError(Exception):
+    """The server failed to convert the document."""
+
+
+def runtime_file(suffix: str) -> str:
+    """
+    Path of a file of the user in the runtime directory.
+
+    Without runtime directory, the file is in a directory of the user
+    in the temporary directory, as that one is writable by everyone.
+    """
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        runtime_dir = os.path.join(tempfile.gettempdir(), f"inkvn-{user}")
+        os.makedirs(runtime_dir, 0o700, exist_ok=True)
+    return os.path.join(runtime_dir, f"inkvn-{user}{suffix}")
+
+
+def default_address() -> Address:
+    """Unix socket path, or localhost port where Unix sockets are unavailable."""
+    if os.environ.get("INKVN_SOCKET"):
+        return os.environ["INKVN_SOCKET"]
+    if hasattr(socket, "AF_UNIX"):
+        return runtime_file(".sock")
+    return ("127.0.0.1", int(os.environ.get("INKVN_PORT", DEFAULT_PORT)))
+
+
+def default_token_file() -> str:
+    """File with the token of a TCP server, only readable by the user."""
+    return os.environ.get("INKVN_TOKEN_FILE") or runtime_file(".token")
+
+
+def read_token(token_file: Optional[str] = None) -> Optional[str]:
+    """Token of the TCP server, None if there is none."""
+    try:
+        with open(token_file or default_token_file()) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def check_owner(path: str) -> None:
+    """
+    Raises PermissionError if `path` or its directory isn't owned by the user,
+    or is writable by others: another user could have put a server there.
+    """
+    if not hasattr(os, "getuid"):
+        return
+    for checked in (path, os.path.dirname(os.path.abspath(path))):
+        stat = os.stat(checked)
+        if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+            raise PermissionError(f"{checked} is not private to the user.")
+
+
+def proof(token: str, role: str, *nonces: str) -> str:
+    """Proof that `role` ("client" or "server") knows `token`, for these nonces."""
+    # only TCP connections need them
+    import hashlib
+    import hmac
+
+    message = "\n".join((role,) + nonces).encode()
+    return hmac.new(token.encode(), message, hashlib.sha256).hexdigest()
+
+
+def connect(address: Address, timeout: Optional[float] = None) -> socket.socket:
+    """
+    Connect to the server, raises OSError if it's not running.
+
+    Unix sockets are checked with check_owner() first.
+    """
+    if isinstance(address, str):
+        check_owner(address)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def authenticate(stream, token: Optional[str]) -> str:
+    """
+    Check that the TCP server knows `token`, raises PermissionError if not.
+
+    Returns the proof of the client, sent with the request.
+    """
+    import secrets
+
+    if not token:
+        raise PermissionError("no token for the TCP server.")
+    nonce = secrets.token_urlsafe(16)
+    stream.write(json.dumps({"nonce": nonce}).encode() + b"\n")
+    stream.flush()
+    reply = json.loads(stream.readline() or "{}")
+    server_nonce = str(reply.get("nonce", ""))
+    expected = proof(token, "server", nonce, server_nonce)
+    if not secrets.compare_digest(str(reply.get("proof", "")), expected):
+        raise PermissionError("the TCP server doesn't know the token.")
+    return proof(token, "client", nonce, server_nonce)
+
+
+def read_exactly(stream, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ConnectionError("connection closed before the end of data.")
+    return data
+
+
+def request(
+    args: List[str],
+    path: Optional[str] = None,
+    data: Optional[bytes] = None,
+    address: Optional[Address] = None,
+    timeout: Optional[float] = None,
+    token: Optional[str] = None,
+) -> Tuple[bytes, str]:
+    """
+    Convert the document at `path` (or `data`) with extension `args`.
+
+    Returns the SVG and the messages of the extension.
+    TCP servers need their `token`, read from default_token_file() by default,
+    PermissionError is raised if the server doesn't know it.
+    """
+    header: dict = {"args": args}
+    if path is not None:
+        header["path"] = os.path.abspath(path)
+    elif data is not None:
+        header["size"] = len(data)
+    else:
+        raise ValueError("path or data is required.")
+
+    address = address or default_address()
+    with connect(address, timeout) as sock:
+        with sock.makefile("rwb") as stream:
+            if not isinstance(address, str):
+                header["proof"] = authenticate(stream, token or read_token())
+            stream.write(json.dumps(header).encode() + b"\n")
+            if data is not None and path is None:
+                stream.write(data)
+            stream.flush()
+
+            response = json.loads(stream.readline())
+            messages = response.get("messages", "")
+            if response.get("status") != "ok":
+                raise ServerError(response.get("message", "unknown error"), messages)
+            return read_exactly(stream, response["size"]), messages
+
+
+def split_input_file(argv: List[str]) -> Tuple[List[str], Optional[str]]:
+    """
+    Separate options from the input file, the last argument if it's not an option.
+
+    Options with paths are made absolute. Raises ValueError for other arguments,
+    e.g. "--artboards 2", the value would be taken for the input file.
+    """
+    input_file = None
+    if argv and not argv[-1].startswith("-"):
+        argv, input_file = argv[:-1], argv[-1]
+
+    options = []
+    for arg in argv:
+        name, equal, value = arg.partition("=")
+        if not name.startswith("--") or not equal:
+            raise ValueError(f"options are given as --name=value, not {arg!r}.")
+        if name in PATH_OPTIONS and value:
+            arg = f"{name}={os.path.abspath(value)}"
+        options.append(arg)
+    return options, input_file
+
+
+def convert_locally(argv: List[str]) -> None:
+    """Run the extension in this process."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(here))
+    from inkvn.vninput import CurveInput
+
+    CurveInput().run(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        options, input_file = split_input_file(argv)
+    except ValueError as e:
+        sys.stderr.write(f"{e}\n")
+        return 2
+
+    try:
+        if input_file is None:
+            svg, messages = request(options, data=sys.stdin.buffer.read())
+        else:
+            svg, messages = request(options, path=input_file)
+    except ServerError as e:
+        message, messages = e.args
+        sys.stderr.write(messages)
+        sys.stderr.write(f"{message}\n")
+        return 1
+    except OSError:
+        # no server, or it went away
+        if input_file is None:
+            raise
+        convert_locally(argv)
+        return 0
+
+    sys.stderr.write(messages)
+    sys.stdout.buffer.write(svg)
+    sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,10 @@ VNArtboard, Frame, VNLayer
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from .base import VNBaseElement
+from .group import VNGroupElement
 from .styles import VNColor, VNGradient
 
 
@@ -22,6 +23,15 @@ class VNArtboard:
     fillColor: Optional[VNColor]
     fillGradient: Optional[VNGradient]
 
+    def iter_elements(self) -> Iterator[VNBaseElement]:
+        """Iterate over all elements of the layers, including grouped ones."""
+        stack = [e for layer in reversed(self.layers) for e in reversed(layer.elements)]
+        while stack:
+            element = stack.pop()
+            yield element
+            if isinstance(element, VNGroupElement):
+                stack.extend(reversed(element.groupElements))
+
 
 @dataclass
 class Frame:
@@ -3,46 +3,107 @@ VNImageElement
 """
 
 import base64
+import shutil
 from dataclasses import dataclass
-from io import BytesIO
-from typing import List, Optional, Tuple
+from typing import IO, Callable, List, Optional, Tuple
 
 import inkex
-from PIL import Image
 
 from .base import VNBaseElement
 
 
+class VNImageData:
+    """
+    Lazy handle to a bitmap (.dat) stored in the archive.
+
+    The bitmap is only read when it's needed, format and dimension
+    are detected from the header bytes.
+    """
+
+    CHUNK_SIZE = 3 * 64 * 1024
+    """multiple of 3, so that chunks can be encoded separately."""
+
+    def __init__(self, relative_path: str, opener: Callable[[], IO[bytes]]):
+        self.relative_path = relative_path
+        self._opener = opener
+        self.references = 0
+        """number of image elements using this bitmap."""
+        self._header: Optional[Tuple[str, Tuple[int, int]]] = None
+
+    def __repr__(self):
+        return f"VNImageData(relative_path: {self.relative_path})"
+
+    def __getstate__(self):
+        # archive handles can't be pickled, see rebind()
+        state = self.__dict__.copy()
+        state["_opener"] = None
+        return state
+
+    def rebind(self, opener: Callable[[], IO[bytes]]) -> None:
+        """Set the opener of the bitmap, after being unpickled."""
+        self._opener = opener
+
+    def open(self) -> IO[bytes]:
+        """Open the bitmap data for reading."""
+        return self._opener()
+
+    def _read_header(self) -> Tuple[str, Tuple[int, int]]:
+        """Detect format and dimension, PIL only parses the header here."""
+        if self._header is None:
+            # PIL is only imported for documents with bitmaps
+            from PIL import Image
+
+            try:
+                with self.open() as f:
+                    image = Image.open(f)
+                    img_format = image.format.lower() if image.format else "png"
+                    self._header = (img_format, (image.width, image.height))
+            except Exception:
+                self._header = ("png", (0, 0))
+        return self._header
+
+    @property
+    def format(self) -> str:
+        return self._read_header()[0]
+
+    @property
+    def dimension(self) -> Tuple[int, int]:
+        return self._read_header()[1]
+
+    def to_base64(self) -> str:
+        """Encode the bitmap in Base64, chunk by chunk."""
+        encoded = bytearray()
+        with self.open() as f:
+            while chunk := f.read(self.CHUNK_SIZE):
+                encoded += base64.b64encode(chunk)
+        return encoded.decode("ascii")
+
+    def save(self, file_name: str) -> None:
+        """Copy the bitmap to `file_name`, chunk by chunk."""
+        with self.open() as src, open(file_name, "wb") as dst:
+            shutil.copyfileobj(src, dst, self.CHUNK_SIZE)
+
+
 @dataclass
 class VNImageElement(VNBaseElement):
     """
-    Holds imageData as base64 texts.
+    Holds imageData as lazy handle to the bitmap.
 
     transform contains matrix (old format).
     """
 
-    imageData: str
+    imageData: VNImageData
     transform: Optional[List[float]]
     cropRect: Optional[Tuple[Tuple[float, float], Tuple[float, float]]]
     """(width, height), (x, y)"""
 
     def image_format(self) -> str:
-        """Detect the image format of b64 encoded image."""
-        try:
-            binary_data = base64.b64decode(self.imageData)
-            image = Image.open(BytesIO(binary_data))
-            return image.format.lower() if image.format else "png"
-        except Exception:
-            return "png"
+        """Detect the image format from the header."""
+        return self.imageData.format
 
     def image_dimension(self) -> Tuple[int, int]:
-        """Detect the dimension format of b64 encoded image."""
-        try:
-            binary_data = base64.b64decode(self.imageData)
-            image = Image.open(BytesIO(binary_data))
-            return image.width, image.height
-        except Exception:
-            return (0, 0)
+        """Detect the dimension of image from the header."""
+        return self.imageData.dimension
 
     def convert_crop_rect(self) -> Optional[inkex.Rectangle]:
         if self.cropRect is not None:
@@ -4,11 +4,19 @@ VNPathElement, pathGeometry
 
 from __future__ import annotations
 
+import cmath
+from array import array
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
 
 import inkex
 
+try:
+    import numpy as np
+except ImportError:  # numpy comes with inkex, but isn't required here
+    np = None  # type: ignore
+
 from .base import VNBaseElement
 from .styles import VNColor, VNGradient, brushProfile, pathStrokeStyle
 
@@ -28,53 +36,176 @@ class VNPathElement(VNBaseElement):
 
 
 class pathGeometry:
-    """path format in Linearity Curve(nodes)."""
+    """
+    path format in Linearity Curve(nodes).
+
+    The nodes are kept as they are and read on first use, which defers the
+    work from decoding to converting. Every converted path is still read,
+    hidden ones included (they are written with display:none).
+    Anchor, in and out points are then kept as (n, 2)
+    float arrays, or flat array("d") of x, y pairs without numpy.
+    """
 
     def __init__(self, closed: bool, nodes: List[Dict]):
-        self.corner_radius: List[float] = []
-        self.path = self.parse_nodes(closed, nodes)
+        self.closed = closed
+        self.nodes = nodes
 
     def __repr__(self):
         return f"pathGeometry(path: {self.path}, corner_radius: {self.corner_radius})"
 
-    def parse_nodes(self, closed: bool, nodes: List[Dict]) -> inkex.Path:
-        """Converts single pathGeometry data to inkex path."""
-        path = inkex.Path()
-        prev = None
-        outpt = None
+    def __getstate__(self):
+        # cached values are rebuilt from the nodes
+        return {"closed": self.closed, "nodes": self.nodes}
 
-        if closed and nodes:
-            nodes.append(nodes[0])
+    @cached_property
+    def anchors(self):
+        return _points(self.nodes, "anchorPoint")
 
-        for node in nodes:
-            # Path data is stored as  list of [inPoint, anchor, outPoint]
-            # (plus some extra attributes for which we don't have enough data atm)
-            anchor = inkex.Vector2d(node["anchorPoint"])
+    @cached_property
+    def in_points(self):
+        return _points(self.nodes, "inPoint")
 
-            if len(path) == 0:
-                path.append(inkex.paths.Move(*anchor))
-            else:
-                inpt = inkex.Vector2d(node["inPoint"])
-                anchor = inkex.Vector2d(node["anchorPoint"])
+    @cached_property
+    def out_points(self):
+        return _points(self.nodes, "outPoint")
 
-                # added * to add support for Inkscape 1.3
-                if prev is not None and inpt is not None and outpt is not None:
-                    if prev.is_close(outpt) and inpt.is_close(anchor):
-                        path.append(inkex.paths.Line(*anchor))
-                    else:
-                        path.append(inkex.paths.Curve(*outpt, *inpt, *anchor))
+    @cached_property
+    def corner_radius(self) -> List[float]:
+        """Corner radius of the sharp nodes."""
+        corner_radius: List[float] = []
 
-            prev = anchor
-            outpt = inkex.Vector2d(node["outPoint"])
+        # the first node closes the path again, the input is left as it is
+        nodes = self.nodes
+        if self.closed and nodes:
+            nodes = nodes + nodes[:1]
 
-            # add corner radius to the list if the node is sharp
-            # nodeType(Curve Only): "disconnected", "asymmetric", "symmetric"
+        # add corner radius to the list if the node is sharp
+        # nodeType(Curve Only): "disconnected", "asymmetric", "symmetric"
+        for node in nodes:
             node_type = node.get("nodeType")
             if node_type is not None:
                 if isinstance(node_type.get("disconnected"), dict):
-                    self.corner_radius.append(node["cornerRadius"])
+                    corner_radius.append(node["cornerRadius"])
+        return corner_radius
+
+    @cached_property
+    def path(self) -> inkex.Path:
+        return self.parse_nodes()
+
+    def segments(
+        self,
+    ) -> Tuple[List[complex], List[complex], List[complex], List[bool]]:
+        """
+        Anchor, in and out points of the nodes as complex numbers, the first
+        node repeated if closed, and whether each segment is a line.
+        """
+        anchors = _complex(self.anchors)
+        in_points = _complex(self.in_points)
+        out_points = _complex(self.out_points)
+
+        if np is not None:
+            if self.closed and len(anchors):
+                anchors = np.append(anchors, anchors[:1])
+                in_points = np.append(in_points, in_points[:1])
+                out_points = np.append(out_points, out_points[:1])
+            # handles on the anchors on both ends
+            lines = _is_close(anchors[:-1], out_points[:-1]) & _is_close(
+                in_points[1:], anchors[1:]
+            )
+            return (
+                anchors.tolist(),
+                in_points.tolist(),
+                out_points.tolist(),
+                lines.tolist(),
+            )
+
+        if self.closed and anchors:
+            anchors.append(anchors[0])
+            in_points.append(in_points[0])
+            out_points.append(out_points[0])
+        lines = [
+            _is_close(a, o) and _is_close(i, b)
+            for a, o, i, b in zip(anchors, out_points, in_points[1:], anchors[1:])
+        ]
+        return anchors, in_points, out_points, lines
+
+    def parse_nodes(self) -> inkex.Path:
+        """Converts single pathGeometry data to inkex path."""
+        path = inkex.Path()
+        anchors, in_points, out_points, lines = self.segments()
+
+        if anchors:
+            path.append(inkex.paths.Move(anchors[0]))
+        for i, line in enumerate(lines, 1):
+            if line:
+                path.append(inkex.paths.Line(anchors[i]))
+            else:
+                path.append(
+                    inkex.paths.Curve(out_points[i - 1], in_points[i], anchors[i])
+                )
 
-        if path is not None and closed:
+        if self.closed:
             path.append(inkex.paths.ZoneClose())
 
         return path
+
+    @cached_property
+    def d(self) -> str:
+        """SVG path data, formatted like inkex.Path."""
+        anchors, in_points, out_points, lines = self.segments()
+
+        commands = []
+        if anchors:
+            commands.append(f"M {_format(anchors[0])}")
+        for i, line in enumerate(lines, 1):
+            if line:
+                commands.append(f"L {_format(anchors[i])}")
+            else:
+                commands.append(
+                    f"C {_format(out_points[i - 1])} {_format(in_points[i])}"
+                    f" {_format(anchors[i])}"
+                )
+
+        if self.closed:
+            commands.append("Z")
+
+        return " ".join(commands)
+
+
+# tolerances of inkex.Vector2d.is_close
+REL_TOL = 1e-5
+ABS_TOL = 1e-8
+
+
+def _points(nodes: List[Dict], key: str):
+    """x, y of `key` of every node."""
+    if np is not None:
+        return np.array([node[key] for node in nodes], dtype=float).reshape(-1, 2)
+    points = array("d")
+    for node in nodes:
+        points.extend(node[key])
+    return points
+
+
+def _complex(points):
+    """
+    Points as complex numbers, built like inkex path commands do (x + y * 1j),
+    so that signed zeros are formatted the same.
+    """
+    if np is not None:
+        return points[:, 0] + points[:, 1] * 1j
+    return [x + y * 1j for x, y in zip(points[::2], points[1::2])]
+
+
+def _is_close(a, b):
+    """cmath.isclose, element-wise for numpy arrays."""
+    if np is None:
+        return cmath.isclose(a, b, rel_tol=REL_TOL, abs_tol=ABS_TOL)
+    with np.errstate(invalid="ignore"):
+        tolerance = np.maximum(REL_TOL * np.maximum(np.abs(a), np.abs(b)), ABS_TOL)
+        close = (np.abs(a - b) <= tolerance) & np.isfinite(a) & np.isfinite(b)
+    return close | (a == b)
+
+
+def _format(point: complex) -> str:
+    return f"{point.real:.6g} {point.imag:.6g}"
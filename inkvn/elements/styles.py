@@ -4,7 +4,6 @@ VNColor, VNGradient, pathStrokeStyle, basicStrokeStyle, styledElementData, brush
 
 from __future__ import annotations
 
-import colorsys
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -66,6 +65,8 @@ class VNColor:
         brightness = hsba.get("b", 0)
         alpha = hsba.get("a", 1)
 
+        import colorsys
+
         r, g, b = colorsys.hsv_to_rgb(hue, saturation, brightness)
         return r, g, b, alpha
 
@@ -76,6 +77,8 @@ class VNColor:
         brightness = hsba.get("brightness", 0)
         alpha = hsba.get("alpha", 1)
 
+        import colorsys
+
         r, g, b = colorsys.hsv_to_rgb(hue, saturation, brightness)
         return r, g, b, alpha
 
@@ -113,6 +116,8 @@ class VNGradient:
         """
         Initializes the Gradient object from a Linearity Curve data.
         """
+        # inkex elements can't be pickled, gradients are rebuilt from these
+        self._args = (fill_transform, transform_matrix, stops, typeRawValue)
         self.gradient: inkex.Gradient = self._convert_gradient(
             tr=fill_transform, type_value=typeRawValue
         )
@@ -130,6 +135,9 @@ class VNGradient:
             tr.add_matrix(*transform_matrix)
             self.transform = tr
 
+    def __reduce__(self):
+        return (VNGradient, self._args)
+
     def __repr__(self):
         return f"VNGradient(gradient: {self.gradient}, stops: {self.stops}, transform: {self.transform})"
 
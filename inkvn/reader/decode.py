@@ -9,10 +9,11 @@ Needs more Vectornator files and fileFormatVersion 30~39 for reference
 
 import base64
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 import inkvn.reader.extract as ext
 import inkvn.reader.text as t
+from inkvn import trace
 from inkvn.const import CURVE_MAPPING
 from inkvn.utils import NSKeyedUnarchiver
 
@@ -20,7 +21,7 @@ from ..elements.artboard import Frame, VNArtboard, VNLayer
 from ..elements.base import VNBaseElement, VNTransform
 from ..elements.group import VNGroupElement
 from ..elements.guide import VNGuideElement
-from ..elements.image import VNImageElement
+from ..elements.image import VNImageData, VNImageElement
 from ..elements.path import VNPathElement, pathGeometry
 from ..elements.styles import (
     VNColor,
@@ -34,6 +35,8 @@ from ..elements.text import VNTextElement, singleStyledText, textProperty
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class CurveDecoder:
     """
@@ -43,12 +46,25 @@ class CurveDecoder:
     """
 
     def __init__(
-        self, archive: Any, gid_json: Dict, is_curve: bool, file_version: int
+        self,
+        archive: ext.ArchiveIndex,
+        gid_json: Dict,
+        is_curve: bool,
+        file_version: int,
+        image_cache: Optional[Dict[str, VNImageData]] = None,
     ) -> None:
         self.archive = archive
         self.gid_json = gid_json
         self.is_curve = is_curve
         self.file_version = file_version
+        # bitmaps shared by relativePath, across artboards if given by the reader
+        self.image_cache: Dict[str, VNImageData] = (
+            image_cache if image_cache is not None else {}
+        )
+        self.accessors: Dict[Tuple[str, bool], Callable[[Dict], Any]] = {}
+        """get_child() lookups by key and is_curve, see compile_accessor()."""
+        self.decoded: Dict[Tuple[int, ...], Tuple[Tuple[Dict, ...], Any]] = {}
+        """shared style objects by their source entries, see memoize()."""
         self.artboard = self.read_artboard()
 
     def get_child(
@@ -60,12 +76,51 @@ class CurveDecoder:
         Linearity Curve makes use of IDs and lists of elements.
         This function makes it easier to get Curve elements.
         """
+        accessor = self.accessors.get((key, is_curve))
+        if accessor is None:
+            accessor = self.compile_accessor(key, is_curve)
+            self.accessors[key, is_curve] = accessor
+
+        try:
+            return accessor(elem)
+        except Exception as e:
+            logger.error(
+                f"Couldn't read the child element: {e}",
+                exc_info=logger.isEnabledFor(logging.INFO),
+            )
+            return None
+
+    def compile_accessor(self, key: str, is_curve: bool) -> Callable[[Dict], Any]:
+        """
+        Returns the lookup of `key` for get_child().
 
-        def _traverse_ids(
-            ids: Any, element_list: Optional[List]
-        ) -> Union[List, Any, None]:
+        Everything that doesn't depend on the element is resolved here, once:
+        the mapping, the element list in gid_json and the file version quirks.
+        """
+        mapping = CURVE_MAPPING.get(key)
+        id_key = mapping.id if mapping is not None else None
+
+        # the first candidate list present in gid_json
+        element_list: Optional[List] = None
+        if mapping is not None:
+            candidates = (
+                mapping.list if isinstance(mapping.list, list) else [mapping.list]
+            )
+            for candidate in candidates:
+                if candidate in self.gid_json:
+                    element_list = self.gid_json[candidate]
+                    break
+        if not element_list:
+            element_list = None
+
+        # ! Vectornator 4.13.6 (19), singleStyle sub as abstractPath
+        sub_as_path = self.file_version == 19 and key == "abstractPath"
+        # ! Curve 5.1.2 (21), singleStyle sub as abstractPath
+        int_sub = key == "abstractPath"
+
+        def traverse(ids: Any) -> Any:
             """pick elements specified by `ids` from `element_list`."""
-            if not element_list:
+            if element_list is None:
                 return None
             if isinstance(ids, list):
                 return [element_list[i] for i in ids]
@@ -73,76 +128,57 @@ class CurveDecoder:
                 return element_list[ids]
             return None
 
-        def _find_key_in_dict(
-            source: Dict, key_candidates: Union[str, List[str]]
-        ) -> List[Any]:
-            """
-            find the list of elements from `source` dictionary,
-            using multiple keys as query.
-            """
-            # using multiple keys as query
-            if isinstance(key_candidates, list):
-                for k in key_candidates:
-                    if k in source:
-                        return source[k]
-
-            # using single key as query
-            elif isinstance(key_candidates, str) and key_candidates in source:
-                return source[key_candidates]
-
-            return []
-
-        try:
+        def accessor(elem: Dict) -> Any:
             # Case 1: Vectornator direct
             if not is_curve and key in elem:
                 return elem[key]
 
             # Case 2: mapping
-            mapping = CURVE_MAPPING.get(key)
-            if mapping:
-                # element_list contains a list of element(like `localTransforms`)
-                id = elem.get(mapping.id)
-                element_list = _find_key_in_dict(self.gid_json, mapping.list)
-                result = _traverse_ids(id, element_list)
+            if id_key is not None and element_list is not None:
+                result = traverse(elem.get(id_key))
                 if result is not None:
                     return result
 
             # Case 3: subElement, same key
+            sub = elem.get("subElement")
             sub_vn = None
-            if isinstance(elem.get("subElement"), dict):
-                sub_vn = elem.get("subElement", {}).get(key, {}).get("_0")
-
-                # ! Vectornator 4.13.6 (19), singleStyle sub as abstractPath
-                if sub_vn is None and self.file_version == 19 and key == "abstractPath":
-                    sub_vn = elem.get("subElement")
-
-            # ! Curve 5.1.2 (21), singleStyle sub as abstractPath
-            elif isinstance(elem.get("subElement"), int) and key == "abstractPath":
-                sub_vn = elem.get("subElement")
+            if isinstance(sub, dict):
+                sub_vn = sub.get(key, {}).get("_0")
+                if sub_vn is None and sub_as_path:
+                    sub_vn = sub
+            elif isinstance(sub, int) and int_sub:
+                sub_vn = sub
+            else:
+                return None
 
             if sub_vn is not None:
                 if not is_curve:
                     return sub_vn
                 # assume sub == ids
-                result = _traverse_ids(sub_vn, element_list)
-                if result is not None:
-                    return result
+                return traverse(sub_vn)
 
             # Case 3-1: subElement, Curve key
-            elif mapping is not None and isinstance(elem.get("subElement"), dict):
-                sub_c = elem.get("subElement", {}).get(mapping.id, {}).get("_0")
-                result = _traverse_ids(sub_c, element_list)
-                if result is not None:
-                    return result
-
+            if id_key is not None and isinstance(sub, dict):
+                return traverse(sub.get(id_key, {}).get("_0"))
             return None
 
-        except Exception as e:
-            logger.error(
-                f"Couldn't read the child element: {e}",
-                exc_info=logger.isEnabledFor(logging.INFO),
-            )
-            return None
+        return accessor
+
+    def memoize(self, sources: Tuple[Dict, ...], decode: Callable[[], T]) -> T:
+        """
+        Decode style objects (fills, strokes, transforms) once.
+
+        Curve elements refer to shared entries of the gid_json lists by index,
+        so the entries are used as key. Decoded objects are shared by
+        all elements using them and must not be modified.
+        """
+        key = tuple(id(source) for source in sources)
+        entry = self.decoded.get(key)
+        if entry is None:
+            # sources are kept, so that their ids are not reused
+            entry = (sources, decode())
+            self.decoded[key] = entry
+        return entry[1]
 
     def get_child_from_id(self, list_key: str, index: int) -> Optional[Dict]:
         """Retrieve an attribute according to key and index from gid_json."""
@@ -228,6 +264,14 @@ class CurveDecoder:
 
     def read_element(self, element: Dict) -> VNBaseElement:
         """Traverse specified element and extract their attributes."""
+        if not trace.active():
+            return self._read_element(element)
+        with trace.span("read_element", "decode") as span:
+            result = self._read_element(element)
+            span.name = f"read_element ({type(result).__name__})"
+            return result
+
+    def _read_element(self, element: Dict) -> VNBaseElement:
         base_element_data = {
             "name": element.get("name", "Unnamed Element"),
             "blur": element.get("blur", 0.0),
@@ -242,7 +286,9 @@ class CurveDecoder:
             # localTransform (BaseElement)
             local_transform = self.get_child(element, "localTransform", self.is_curve)
             if isinstance(local_transform, dict):
-                base_element_data["localTransform"] = VNTransform(**local_transform)
+                base_element_data["localTransform"] = self.memoize(
+                    (local_transform,), lambda: VNTransform(**local_transform)
+                )
 
             # Guide (GuideElement)
             guide = self.get_child(element, "guideLine", self.is_curve)
@@ -380,7 +426,7 @@ class CurveDecoder:
     def read_image(
         self, image: Dict, base_element: Dict
     ) -> Union[VNImageElement, VNBaseElement]:
-        """Reads image element, encodes image in Base64 and returns VNImageElement."""
+        """Reads image element and returns VNImageElement with lazy image data."""
 
         def _crop_rect() -> Optional[Tuple[Tuple[float, float], Tuple[float, float]]]:
             crop_rect = image.get("cropRect")
@@ -403,7 +449,6 @@ class CurveDecoder:
         image_data = None
         transform = None
         crop_rect = None
-        encoded_image = ""
 
         new_image_id = image.get("imageData", {}).get("sharedFileImage", {}).get("_0")
         abs_image_id = image.get("subElement", {}).get("image", {}).get("_0")
@@ -427,10 +472,8 @@ class CurveDecoder:
             image_data = self.get_child_from_id("imageDatas", image_data_id)
 
         if image_data is not None:
-            image_file = image_data["relativePath"]
-            encoded_image = ext.read_dat_from_zip(self.archive, image_file)
             return VNImageElement(
-                imageData=encoded_image,
+                imageData=self.read_image_data(image_data["relativePath"]),
                 transform=transform,
                 cropRect=crop_rect,
                 **base_element,
@@ -438,6 +481,17 @@ class CurveDecoder:
         else:
             return VNBaseElement(**base_element)
 
+    def read_image_data(self, image_file: str) -> VNImageData:
+        """Returns the bitmap handle of `image_file`, shared by all its users."""
+        image_data = self.image_cache.get(image_file)
+        if image_data is None:
+            opener = ext.open_dat_from_zip(self.archive, image_file)
+            image_data = VNImageData(image_file, opener)
+            self.image_cache[image_file] = image_data
+
+        image_data.references += 1
+        return image_data
+
     def read_abs_path(
         self,
         path_element: styledElementData,
@@ -746,36 +800,42 @@ class CurveDecoder:
         if stroke_style is None and stylable.get("strokeStyle") is not None:
             stroke_style = stylable["strokeStyle"]
 
-        if isinstance(stroke_style, dict):
-            # older format
-            if (
-                "dashPattern" in stroke_style
-                and "join" in stroke_style
-                and "cap" in stroke_style
-            ):
-                stroke_style["basicStrokeStyle"] = {
-                    "cap": stroke_style["cap"],
-                    "dashPattern": stroke_style["dashPattern"],
-                    "join": stroke_style["join"],
-                    "position": stroke_style.get("position"),
-                }
-            if (
-                basic_stroke_style is None
-                and stroke_style.get("basicStrokeStyle") is not None
-            ):
-                basic_stroke_style = basicStrokeStyle(
-                    **stroke_style["basicStrokeStyle"]
-                )
-
-            return pathStrokeStyle(
-                basicStrokeStyle=basic_stroke_style,
-                color=VNColor(color_dict=stroke_style["color"]),
-                width=stroke_style["width"],
-                startArrow=stroke_style.get("startArrow"),
-                endArrow=stroke_style.get("endArrow"),
-            )
-        else:
+        if not isinstance(stroke_style, dict):
             return None
+        if basic_stroke_style is not None:
+            return self.decode_stroke(stroke_style, basic_stroke_style)
+        return self.memoize((stroke_style,), lambda: self.decode_stroke(stroke_style))
+
+    @staticmethod
+    def decode_stroke(
+        stroke_style: Dict, basic_stroke_style: Optional[basicStrokeStyle] = None
+    ) -> pathStrokeStyle:
+        """Converts a stroke style entry to pathStrokeStyle."""
+        # older format
+        if (
+            "dashPattern" in stroke_style
+            and "join" in stroke_style
+            and "cap" in stroke_style
+        ):
+            stroke_style["basicStrokeStyle"] = {
+                "cap": stroke_style["cap"],
+                "dashPattern": stroke_style["dashPattern"],
+                "join": stroke_style["join"],
+                "position": stroke_style.get("position"),
+            }
+        if (
+            basic_stroke_style is None
+            and stroke_style.get("basicStrokeStyle") is not None
+        ):
+            basic_stroke_style = basicStrokeStyle(**stroke_style["basicStrokeStyle"])
+
+        return pathStrokeStyle(
+            basicStrokeStyle=basic_stroke_style,
+            color=VNColor(color_dict=stroke_style["color"]),
+            width=stroke_style["width"],
+            startArrow=stroke_style.get("startArrow"),
+            endArrow=stroke_style.get("endArrow"),
+        )
 
     @staticmethod
     def read_brush(brush_prof_dict: Dict) -> brushProfile:
@@ -840,7 +900,18 @@ class CurveDecoder:
         if isinstance(fill_data, dict):
             color = fill_data.get("color", {}).get("_0")
             gradient = fill_data.get("gradient", {}).get("_0")
-            return _process_fills(gradient, color)
+            if gradient is not None and gradient.get("transform") is None:
+                # old gradients are placed by the fillTransform of `stylable`
+                fill_transform = self.get_child(
+                    stylable, "fillTransform", self.is_curve
+                )
+                if not isinstance(fill_transform, dict):
+                    return _process_fills(gradient, color)
+                return self.memoize(
+                    (fill_data, fill_transform),
+                    lambda: _process_fills(gradient, color),
+                )
+            return self.memoize((fill_data,), lambda: _process_fills(gradient, color))
 
         # Vectornator 4.10.4, format 8
         elif fill_color is not None or fill_gradient is not None:
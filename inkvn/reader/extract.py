@@ -5,94 +5,182 @@ reads Vectornator / Linearity Curve JSON data from .vectornator or .curve files.
 """
 
 import base64
+import functools
 import io
 import json
 import zipfile
-from typing import Any, Dict
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 from inkex.utils import errormsg
 
+from inkvn import trace
+
+T = TypeVar("T", bound="ArchiveIndex")
+
+
+class ArchiveIndex:
+    """
+    Index of the members of a Curve / Vectornator archive.
+
+    The index is built once per document and maps member names and basenames
+    to `ZipInfo`, so every lookup avoids scanning `namelist()`.
+    Embedded .curve / .vectornator archives are opened once, on first lookup,
+    and closed with the index by close().
+    """
+
+    def __init__(self, archive: zipfile.ZipFile, max_depth: int = 2) -> None:
+        self.archive = archive
+        self.filename = archive.filename
+        self.max_depth = max_depth
+        self._members: Dict[str, zipfile.ZipInfo] = {}
+        self._basenames: Dict[str, List[zipfile.ZipInfo]] = {}
+        self._nested_infos: List[zipfile.ZipInfo] = []
+        self._nested: Optional[List[ArchiveIndex]] = None
+
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            self._members[info.filename] = info
+            basename = info.filename.rsplit("/", 1)[-1]
+            self._basenames.setdefault(basename, []).append(info)
+
+            if info.filename.endswith((".curve", ".vectornator")) and max_depth > 0:
+                self._nested_infos.append(info)
+
+    def __contains__(self, file_name: str) -> bool:
+        return self.find(file_name) is not None
+
+    def __enter__(self: T) -> T:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the embedded archives and `archive`."""
+        for nested in self._nested or ():
+            nested.close()
+        self._nested = None
+        self.archive.close()
+
+    @property
+    def nested(self) -> List["ArchiveIndex"]:
+        """Indexes of embedded archives (.vectornator in .vectornator)."""
+        if self._nested is None:
+            self._nested = [
+                ArchiveIndex(
+                    zipfile.ZipFile(io.BytesIO(self.archive.read(info)), "r"),
+                    self.max_depth - 1,
+                )
+                for info in self._nested_infos
+            ]
+        return self._nested
+
+    def find(self, file_name: str) -> Optional[Tuple[zipfile.ZipFile, zipfile.ZipInfo]]:
+        """Find the archive and member matching `file_name`."""
+        # exact match at the top level
+        info = self._members.get(file_name)
+        if info is not None:
+            return self.archive, info
+
+        # match within nested folders
+        basename = file_name.rsplit("/", 1)[-1]
+        for info in self._basenames.get(basename, ()):
+            if info.filename.endswith(file_name):
+                return self.archive, info
+
+        # embedded archives
+        for nested in self.nested:
+            found = nested.find(file_name)
+            if found is not None:
+                return found
+
+        return None
+
+    def getinfo(self, file_name: str) -> zipfile.ZipInfo:
+        """Return the `ZipInfo` of `file_name`, raise FileNotFoundError if missing."""
+        found = self.find(file_name)
+        if found is None:
+            raise FileNotFoundError(
+                f"File '{file_name}' not found in the zip archive '{self.filename}'."
+            )
+        return found[1]
+
+    def open(self, file_name: str) -> IO[bytes]:
+        """Open `file_name` for reading, raise FileNotFoundError if missing."""
+        found = self.find(file_name)
+        if found is None:
+            raise FileNotFoundError(
+                f"File '{file_name}' not found in the zip archive '{self.filename}'."
+            )
+        archive, info = found
+        return archive.open(info)
+
+    def read(self, file_name: str) -> bytes:
+        """Read the whole content of `file_name`."""
+        with self.open(file_name) as f:
+            return f.read()
+
+
+def _as_index(
+    archive: Union[zipfile.ZipFile, ArchiveIndex], max_depth: int
+) -> ArchiveIndex:
+    """Wrap `archive` in ArchiveIndex if it's a plain ZipFile."""
+    if isinstance(archive, ArchiveIndex):
+        return archive
+    return ArchiveIndex(archive, max_depth)
+
 
 def read_json_from_zip(
-    archive: zipfile.ZipFile, file_name: str, max_depth: int = 2
+    archive: Union[zipfile.ZipFile, ArchiveIndex], file_name: str, max_depth: int = 2
 ) -> Dict[str, Any]:
     """Reads JSON file from zip, handling nested folders and embedded zip files."""
+    index = _as_index(archive, max_depth)
     try:
-        archive_name = archive.filename
-
-        # Check if the file exists at the top level
-        if file_name in archive.namelist():
-            with archive.open(file_name) as f:
+        with trace.span("parse json", "read", file=file_name):
+            with index.open(file_name) as f:
                 return json.load(f)
 
-        # Search for the file within nested folders if not found at the top level
-        for name in archive.namelist():
-            if name.endswith(file_name):
-                with archive.open(name) as f:
-                    return json.load(f)
-
-            # extract .curve / .vectornator if it's there (.vectornator in .vectornator)
-            if name.endswith((".curve", ".vectornator")) and max_depth > 0:
-                with archive.open(name) as nested_zip_file:
-                    with zipfile.ZipFile(
-                        io.BytesIO(nested_zip_file.read()), "r"
-                    ) as nested_zip:
-                        return read_json_from_zip(nested_zip, file_name, max_depth - 1)
-
-        # Raise an error if the file is not found anywhere in the archive
-        raise FileNotFoundError(
-            f"File '{file_name}' not found in the zip archive '{archive_name}'."
-        )
-
     except (json.JSONDecodeError, FileNotFoundError) as e:
         errormsg(
-            f"Archive name: {archive_name}, Failed to read or parse JSON file '{file_name}': {e}"
+            f"Archive name: {index.filename}, Failed to read or parse JSON file '{file_name}': {e}"
         )
         raise
 
 
 def read_dat_from_zip(
-    archive: zipfile.ZipFile, file_name: str, max_depth: int = 2
+    archive: Union[zipfile.ZipFile, ArchiveIndex], file_name: str, max_depth: int = 2
 ) -> str:
     """Encode dat (bitmap) file from zip (Vectornator file) in Base64 string."""
+    index = _as_index(archive, max_depth)
     try:
-        archive_name = archive.filename
-
-        if file_name in archive.namelist():
-            with archive.open(file_name) as f:
-                return base64.b64encode(f.read()).decode("utf-8")
-
-        for name in archive.namelist():
-            if name.endswith(file_name):
-                with archive.open(name) as f:
-                    return base64.b64encode(f.read()).decode("utf-8")
-
-            if name.endswith((".curve", ".vectornator")) and max_depth > 0:
-                with archive.open(name) as nested_zip_file:
-                    with zipfile.ZipFile(
-                        io.BytesIO(nested_zip_file.read()), "r"
-                    ) as nested_zip:
-                        return read_dat_from_zip(nested_zip, file_name, max_depth - 1)
-
-        raise FileNotFoundError(
-            f"File '{file_name}' not found in the zip archive '{archive_name}'."
-        )
+        return base64.b64encode(index.read(file_name)).decode("utf-8")
 
     except Exception as e:
         errormsg(
-            f"Archive name: {archive_name}, Failed to read or encode bitmap file '{file_name}': {e}"
+            f"Archive name: {index.filename}, Failed to read or encode bitmap file '{file_name}': {e}"
+        )
+        raise
+
+
+def open_dat_from_zip(archive: ArchiveIndex, file_name: str) -> Callable[[], IO[bytes]]:
+    """Return an opener for dat (bitmap) file from zip, without reading it."""
+    try:
+        archive.getinfo(file_name)
+    except FileNotFoundError as e:
+        errormsg(
+            f"Archive name: {archive.filename}, Failed to find bitmap file '{file_name}': {e}"
         )
         raise
+    return functools.partial(archive.open, file_name)
 
 
-def extract_manifest(archive: zipfile.ZipFile) -> Dict[str, Any]:
+def extract_manifest(archive: ArchiveIndex) -> Dict[str, Any]:
     """Extract and parse the Manifest.json."""
     return read_json_from_zip(archive, "Manifest.json")
 
 
-def extract_document(
-    archive: zipfile.ZipFile, manifest: Dict[str, Any]
-) -> Dict[str, Any]:
+def extract_document(archive: ArchiveIndex, manifest: Dict[str, Any]) -> Dict[str, Any]:
     """Extract and parse the Document.json specified in the Manifest."""
     document_name = manifest.get("documentJSONFilename", "Document.json")
     return read_json_from_zip(archive, document_name)
@@ -103,6 +191,6 @@ def extract_drawing_data(document: Dict[str, Any]) -> Dict[str, Any]:
     return document.get("drawing", {})
 
 
-def extract_gid_json(archive: zipfile.ZipFile, artboard_path: str) -> Dict[str, Any]:
+def extract_gid_json(archive: ArchiveIndex, artboard_path: str) -> Dict[str, Any]:
     """Extract and parse a GUID JSON file (artboard)."""
     return read_json_from_zip(archive, artboard_path)
@@ -4,19 +4,103 @@ inkvn Reader
 Reads Linearity Curve / Vectornator files and convert them into intermediate data.
 """
 
+import io
 import logging
+import os
+import re
 import zipfile
-from typing import List
-
-from packaging import version
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import inkvn.reader.extract as ext
+from inkvn import trace
 from inkvn.reader.decode import CurveDecoder
 
 from ..elements.artboard import VNArtboard
+from ..elements.image import VNImageData, VNImageElement
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
 logger = logging.getLogger(__name__)
 
+DecodeResult = Tuple[VNArtboard, Dict[str, VNImageData]]
+R = TypeVar("R", bound="CurveReader")
+SelectedArtboard = Tuple[str, Optional[Dict[str, Any]]]
+"""artboard path and its GUID JSON, if already parsed."""
+
+
+def decode_artboard(
+    archive: ext.ArchiveIndex,
+    artboard_path: str,
+    is_curve: bool,
+    file_version: int,
+    image_cache: Optional[Dict[str, VNImageData]] = None,
+    gid_json: Optional[Dict[str, Any]] = None,
+) -> DecodeResult:
+    """
+    Decode a single artboard (GUID JSON), returns it with the bitmaps it uses.
+
+    `gid_json` is the parsed GUID JSON, if it has already been read.
+    """
+    images = image_cache if image_cache is not None else {}
+    with trace.span("decode artboard", "decode", file=artboard_path):
+        if gid_json is None:
+            gid_json = ext.extract_gid_json(archive, artboard_path)
+        decoder = CurveDecoder(
+            archive=archive,
+            gid_json=gid_json,
+            is_curve=is_curve,
+            file_version=file_version,
+            image_cache=images,
+        )
+    return decoder.artboard, images
+
+
+def parse_version(text: str) -> Tuple[int, ...]:
+    """
+    Release numbers of an app version, "5.1" is (5, 1, 0).
+
+    Suffixes (pre-releases, builds) are ignored, raises ValueError if invalid.
+    """
+    match = re.match(r"\s*v?(\d+(?:\.\d+)*)", text)
+    if match is None:
+        raise ValueError(f"Invalid version: {text!r}")
+    release = tuple(int(part) for part in match.group(1).split("."))
+    return release + (0,) * (3 - len(release))
+
+
+def artboard_title(gid_json: Dict[str, Any], is_curve: bool, index: int) -> str:
+    """Title of the `index`th artboard in a GUID JSON, without decoding it."""
+    artboard = gid_json["artboards"][0] if is_curve else gid_json
+    return artboard.get("title") or f"Artboard {index}"
+
+
+# archive opened once by each worker process
+_worker_index: Optional[ext.ArchiveIndex] = None
+
+
+def _init_worker(source: Union[str, bytes]) -> None:
+    global _worker_index
+    stream = source if isinstance(source, str) else io.BytesIO(source)
+    _worker_index = ext.ArchiveIndex(zipfile.ZipFile(stream, "r"))
+
+
+def _decode_in_worker(
+    artboard_path: str, is_curve: bool, file_version: int
+) -> DecodeResult:
+    assert _worker_index is not None, "worker is not initialized."
+    return decode_artboard(_worker_index, artboard_path, is_curve, file_version)
+
 
 class CurveReader:
     """
@@ -25,19 +109,55 @@ class CurveReader:
     A Linearity Curve / Vectornator file reader to convert Curve documents into dataclasses.
     """
 
-    def __init__(self, stream, is_debug: bool):
+    def __init__(
+        self,
+        stream,
+        is_debug: bool,
+        workers: int = 0,
+        artboards: Optional[Sequence[Union[int, str]]] = None,
+        decode: bool = True,
+    ):
         self.is_debug: bool = is_debug
-        self.archive = zipfile.ZipFile(stream, "r")
+        self.workers: int = workers
+        """decode artboards concurrently with more than 1 worker."""
+        self.selection = artboards
+        """artboards to read, by index (starting from 1) or title. all if None."""
+        self.stream = stream
+        with trace.span("open archive", "read"):
+            self.archive = zipfile.ZipFile(stream, "r")
+            self.index = ext.ArchiveIndex(self.archive)
         self.file_version: int = 44  # main support
         self.app_version: str
         self.units: str = "px"
         self.artboards: List[VNArtboard] = []
+        self.images: Dict[str, VNImageData] = {}
+        """bitmaps by relativePath, shared between artboards."""
+        self.artboard_paths: List[str] = []
+
+        if decode:
+            self.read()
+        else:
+            # artboards are decoded later by read_artboards()
+            self.read_document()
 
-        self.read()
+    def __enter__(self: R) -> R:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the archive, bitmaps can't be read afterwards."""
+        self.index.close()
 
     def read(self):
-        manifest = ext.extract_manifest(self.archive)
-        document = ext.extract_document(self.archive, manifest)
+        self.read_document()
+        self.read_artboards()
+
+    def read_document(self):
+        """Read manifest and document settings."""
+        manifest = ext.extract_manifest(self.index)
+        document = ext.extract_document(self.index, manifest)
         drawing_data = ext.extract_drawing_data(document)
 
         assert drawing_data, "This document has no drawing data."
@@ -45,7 +165,7 @@ class CurveReader:
         self.units = drawing_data["settings"]["units"]
         self.app_version = document["appVersion"]
         self.file_version = manifest["fileFormatVersion"]
-        artboard_paths = drawing_data["artboardPaths"]
+        self.artboard_paths = drawing_data["artboardPaths"]
 
         # different file versions have incompatible structure.
         # reporting App version & File version greatly helps
@@ -55,22 +175,160 @@ class CurveReader:
                 f"App version: {self.app_version}, File format: {self.file_version}, File name: {self.archive.filename}"
             )
 
-        assert len(artboard_paths), "No artboard paths found in the document."
+        assert len(self.artboard_paths), "No artboard paths found in the document."
+
+    def read_artboards(self):
+        """Decode the (selected) artboards."""
+        is_curve = self.check_if_curve(self.app_version)
+
+        selected: List[SelectedArtboard]
+        if self.selection is not None:
+            selected = self.select_artboards(self.artboard_paths, is_curve)
+        else:
+            selected = [(artboard_path, None) for artboard_path in self.artboard_paths]
+
+        if self.workers > 1 and len(selected) > 1:
+            # workers parse the GUID JSONs again, it's faster than pickling them
+            self.read_parallel(
+                [artboard_path for artboard_path, _ in selected], is_curve
+            )
+            return
 
         # Read Artboard (GUID JSON)
-        for artboard_path in artboard_paths:
+        for artboard_path, gid_json in selected:
             try:
-                gid_json = ext.extract_gid_json(self.archive, artboard_path)
-                decoder = CurveDecoder(
-                    archive=self.archive,
-                    gid_json=gid_json,
-                    is_curve=self.check_if_curve(self.app_version),
-                    file_version=self.file_version,
+                artboard, _ = decode_artboard(
+                    self.index,
+                    artboard_path,
+                    is_curve,
+                    self.file_version,
+                    self.images,
+                    gid_json,
                 )
-                self.artboards.append(decoder.artboard)
+                self.artboards.append(artboard)
             except FileNotFoundError as e:
                 logger.error(f"read.py: {e} skipped reading the artboard.")
 
+    def select_artboards(
+        self, artboard_paths: List[str], is_curve: bool
+    ) -> List[SelectedArtboard]:
+        """
+        Returns the paths of the selected artboards in document order,
+        with their GUID JSON if it has been parsed.
+
+        Indices need no reading, but titles are only stored in the GUID JSONs,
+        which are parsed (not decoded) to find them.
+        """
+        assert self.selection is not None
+        indices = {i for i in self.selection if isinstance(i, int)}
+        titles = {t for t in self.selection if isinstance(t, str)}
+
+        selected: List[SelectedArtboard] = []
+        found: set = set()
+        for i, artboard_path in enumerate(artboard_paths, start=1):
+            if i in indices:
+                selected.append((artboard_path, None))
+                found.add(i)
+                continue
+            if not titles:
+                continue
+            try:
+                gid_json = ext.extract_gid_json(self.index, artboard_path)
+            except FileNotFoundError as e:
+                logger.error(f"read.py: {e} skipped reading the artboard.")
+                continue
+            title = artboard_title(gid_json, is_curve, i)
+            if title in titles:
+                selected.append((artboard_path, gid_json))
+                found.add(title)
+
+        for missing in [s for s in self.selection if s not in found]:
+            logger.error(f"read.py: artboard {missing!r} is not in the document.")
+
+        assert selected, "No artboards match the selection."
+        return selected
+
+    def read_parallel(self, artboard_paths: List[str], is_curve: bool) -> None:
+        """
+        Decode artboards in worker processes, or threads if processes are unavailable.
+
+        Artboards are kept in document order.
+        """
+        # multiprocessing is imported only when it's used
+        import pickle
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        workers = min(self.workers, len(artboard_paths))
+        try:
+            with ProcessPoolExecutor(
+                workers, initializer=_init_worker, initargs=(self.archive_source(),)
+            ) as pool:
+                results = self.decode_with(
+                    pool, _decode_in_worker, artboard_paths, is_curve
+                )
+        except (BrokenProcessPool, NotImplementedError, pickle.PicklingError) as e:
+            logger.info(f"read.py: {e!r}, decoding artboards in threads.")
+            with ThreadPoolExecutor(workers) as pool:
+                results = self.decode_with(
+                    pool,
+                    lambda *args: decode_artboard(self.index, *args),
+                    artboard_paths,
+                    is_curve,
+                )
+
+        for result in results:
+            if isinstance(result, FileNotFoundError):
+                logger.error(f"read.py: {result} skipped reading the artboard.")
+                continue
+            artboard, images = result
+            self.merge_images(artboard, images)
+            self.artboards.append(artboard)
+
+    def decode_with(
+        self, pool: "Executor", func, artboard_paths: List[str], is_curve: bool
+    ) -> List[Union[DecodeResult, FileNotFoundError]]:
+        """Submit all artboards to `pool` and collect the results in order."""
+        futures = [
+            pool.submit(func, artboard_path, is_curve, self.file_version)
+            for artboard_path in artboard_paths
+        ]
+        results: List[Union[DecodeResult, FileNotFoundError]] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except FileNotFoundError as e:
+                results.append(e)
+        return results
+
+    def archive_source(self) -> Union[str, bytes]:
+        """Path of the archive, or its content for worker processes."""
+        name = getattr(self.stream, "name", None)
+        if isinstance(name, str) and os.path.isfile(name):
+            return name
+        self.stream.seek(0)
+        return self.stream.read()
+
+    def merge_images(self, artboard: VNArtboard, images: Dict[str, VNImageData]):
+        """Share bitmaps decoded separately with the rest of the document."""
+        replaced: Dict[int, VNImageData] = {}
+        for relative_path, image_data in images.items():
+            shared = self.images.get(relative_path)
+            if shared is None:
+                # bitmaps from worker processes have lost their archive handle
+                image_data.rebind(ext.open_dat_from_zip(self.index, relative_path))
+                self.images[relative_path] = image_data
+            else:
+                shared.references += image_data.references
+                replaced[id(image_data)] = shared
+
+        if replaced:
+            for element in artboard.iter_elements():
+                if isinstance(element, VNImageElement):
+                    element.imageData = replaced.get(
+                        id(element.imageData), element.imageData
+                    )
+
     def convert_unit(self):
         """Convert document unit to SVG."""
         unit_map = {
@@ -86,11 +344,10 @@ class CurveReader:
     @staticmethod
     def check_if_curve(input_version: str):
         """check if the app version is 5.x or not"""
-        required_version = version.parse("5.1.0")
         try:
-            current_version = version.parse(input_version)
-        except version.InvalidVersion:
+            current_version = parse_version(input_version)
+        except ValueError:
             logger.error(f"Invalid version string: {input_version}")
             return False
 
-        return current_version >= required_version
+        return current_version >= (5, 1, 0)
@@ -4,8 +4,7 @@ VI text tools
 Decodes Linearity Curve styledTexts and turn them into simpler format.
 """
 
-import copy
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set
 
 from inkex.utils import errormsg
 
@@ -13,14 +12,11 @@ from inkex.utils import errormsg
 def decode_new_text(styled_text: Dict) -> List[Dict]:
     """Decodes upperBound system used by newer text format, preserving nested structure."""
 
-    def _collect_upper_bounds(attrib: Dict, upper_bounds: List[int]):
-        """collect all upperBounds inside, without duplication"""
+    def _collect_upper_bounds(attrib: Dict, upper_bounds: Set[int]):
+        """collect all upperBounds inside"""
         values = attrib.get("values")
         if values:
-            for val in values:
-                ub = val["upperBound"]
-                if ub not in upper_bounds:
-                    upper_bounds.append(ub)
+            upper_bounds.update(val["upperBound"] for val in values)
         else:
             for v in attrib.values():
                 if isinstance(v, dict):
@@ -35,14 +31,18 @@ def decode_new_text(styled_text: Dict) -> List[Dict]:
         d[path[-1]] = value
 
     def _add_styles(
-        attrib: Dict, path: List[str], upper_bounds: List[int], styles: List[Dict]
+        attrib: Dict,
+        path: List[str],
+        upper_bounds: List[int],
+        indices: Dict[int, int],
+        styles: List[Dict],
     ):
         """add style and its effective range to list of `styles`"""
         values = attrib.get("values")
         if values:
             for val in values:
                 ub = val["upperBound"]
-                index = upper_bounds.index(ub)
+                index = indices[ub]
                 _insert_value_by_path(styles[index], path, val["value"])
 
                 if index == 0:
@@ -52,20 +52,25 @@ def decode_new_text(styled_text: Dict) -> List[Dict]:
         else:
             for key, child in attrib.items():
                 if isinstance(child, dict):
-                    _add_styles(child, path + [key], upper_bounds, styles)
+                    _add_styles(child, path + [key], upper_bounds, indices, styles)
 
     def _propagate_values(styles: List[Dict]):
-        """apply any missing styles with its previous style."""
+        """
+        apply any missing styles with its previous style.
+
+        Propagated values are shared between styles, strokeStyle is copied
+        before it is merged.
+        """
         if not styles:
             return
 
-        propagated_attrs = copy.deepcopy(styles[-1])
+        propagated_attrs = dict(styles[-1])
 
         for style in reversed(styles):
             # top-level
             for key, value in propagated_attrs.items():
                 if key not in style:
-                    style[key] = copy.deepcopy(value)
+                    style[key] = value
 
             key = "strokeStyle"
             if (
@@ -73,6 +78,7 @@ def decode_new_text(styled_text: Dict) -> List[Dict]:
                 and isinstance(style.get(key), dict)
                 and key in propagated_attrs
                 and isinstance(propagated_attrs.get(key), dict)
+                and style[key] is not propagated_attrs[key]
             ):
                 # add missing values (color, width)
                 for sub_key, sub_value in propagated_attrs[key].items():
@@ -82,23 +88,26 @@ def decode_new_text(styled_text: Dict) -> List[Dict]:
             # update propagated_attrs with current
             for key, value in style.items():
                 if key == "strokeStyle" and isinstance(value, dict):
-                    if not isinstance(propagated_attrs.get(key), dict):
-                        propagated_attrs[key] = {}
-                    propagated_attrs[key].update(value)
+                    previous = propagated_attrs.get(key)
+                    if previous is not value:
+                        merged = dict(previous) if isinstance(previous, dict) else {}
+                        merged.update(value)
+                        propagated_attrs[key] = merged
                 else:
                     propagated_attrs[key] = value
 
-    upper_bounds: List[int] = []
+    upper_bound_set: Set[int] = set()
     for key, val in styled_text.items():
         if isinstance(val, dict):
-            _collect_upper_bounds(val, upper_bounds)
-    upper_bounds.sort()
+            _collect_upper_bounds(val, upper_bound_set)
+    upper_bounds = sorted(upper_bound_set)
+    indices = {ub: index for index, ub in enumerate(upper_bounds)}
 
     styles: List[Dict] = [{} for _ in upper_bounds]
 
     for key, val in styled_text.items():
         if isinstance(val, dict):
-            _add_styles(val, [key], upper_bounds, styles)
+            _add_styles(val, [key], upper_bounds, indices, styles)
 
     _propagate_values(styles)
 
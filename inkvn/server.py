@@ -0,0 +1,265 @@
+"""
+inkvn Server
+
+Long-lived conversion server, keeps inkex, lxml and PIL imported between documents.
+Listens on a Unix socket (or a localhost TCP port where it's unavailable),
+see inkvn.client for the protocol.
+
+The Unix socket is only accessible by the user. Over TCP, any local user can
+connect (or listen on the port), so client and server prove to each other that
+they know the random token the server writes in a file only readable by the user
+(see inkvn.client.default_token_file()).
+
+Each request is converted in a forked child where fork is available,
+otherwise requests are converted one at a time in threads.
+
+usage: python -m inkvn.server [--socket PATH | --port N] [--token-file PATH]
+"""
+
+import argparse
+import contextlib
+import hmac
+import io
+import json
+import logging
+import os
+import secrets
+import signal
+import socketserver
+import sys
+import threading
+import traceback
+from typing import Iterator, List, Optional
+
+from inkvn.client import (
+    Address,
+    connect,
+    default_address,
+    default_token_file,
+    proof,
+    read_exactly,
+)
+from inkvn.vninput import CurveInput
+
+# converters share module state (ids, logging) when they run in threads
+_lock = threading.Lock()
+
+
+def convert_request(args: List[str], messages: io.StringIO, stream=None) -> bytes:
+    """
+    Run CurveInput with `args` on `stream`, or on the input file in `args`.
+
+    Returns the SVG, the messages of the extension are written in `messages`,
+    also when it fails.
+    """
+    output = io.BytesIO()
+    with _lock, contextlib.redirect_stderr(messages), _log_to(messages):
+        effect = CurveInput()
+        effect.parse_arguments(args)
+        check_paths(effect.options, stream is not None)
+        if stream is not None:
+            effect.options.input_file = stream
+        effect.options.output = output
+        try:
+            effect.load_raw()
+            effect.save_raw(effect.effect())
+        finally:
+            effect.clean_up()
+    return output.getvalue()
+
+
+@contextlib.contextmanager
+def _log_to(messages: io.StringIO) -> Iterator[None]:
+    """Write the records of the inkvn loggers in `messages`, as they'd be on stderr."""
+    handler = logging.StreamHandler(messages)
+    logger = logging.getLogger("inkvn")
+    logger.addHandler(handler)
+    try:
+        yield
+    finally:
+        logger.removeHandler(handler)
+
+
+def check_paths(options, from_stream: bool) -> None:
+    """
+    Raises ValueError for paths which would be relative to the server.
+
+    Without input path, external images need an image_dir,
+    CurveInput would write them in the working directory of the server.
+    """
+    for name in ("image_dir", "profile"):
+        value = getattr(options, name)
+        if value and not os.path.isabs(value):
+            raise ValueError(f"--{name} must be an absolute path.")
+    if from_stream and options.external_images and not options.image_dir:
+        raise ValueError("--external_images needs the input path or --image_dir.")
+
+
+class ConversionHandler(socketserver.StreamRequestHandler):
+    """Handles a single conversion request."""
+
+    timeout = 30
+    """seconds to wait for the client, when reading the request."""
+
+    def handle(self):
+        messages = io.StringIO()
+        try:
+            expected = self.authenticate()
+            line = self.rfile.readline()
+            if not line:
+                # the client gave up, e.g. it didn't trust the server
+                return
+            header = json.loads(line)
+            if expected is not None and not hmac.compare_digest(
+                str(header.get("proof", "")), expected
+            ):
+                self.send(
+                    {"status": "error", "message": "invalid token", "messages": ""}
+                )
+                return
+            args = [str(arg) for arg in header.get("args", [])]
+            if header.get("path") is not None:
+                # CurveInput opens the input file, and writes external images next to it
+                args.append(str(header["path"]))
+                svg = convert_request(args, messages)
+            else:
+                data = read_exactly(self.rfile, int(header["size"]))
+                svg = convert_request(args, messages, io.BytesIO(data))
+        except (Exception, SystemExit) as e:
+            self.send(
+                {
+                    "status": "error",
+                    "message": f"{type(e).__name__}: {e}",
+                    "messages": messages.getvalue(),
+                }
+            )
+            traceback.print_exc()
+            return
+
+        self.send(
+            {"status": "ok", "size": len(svg), "messages": messages.getvalue()}, svg
+        )
+
+    def authenticate(self) -> Optional[str]:
+        """
+        Prove the server knows the token, if it has one.
+
+        Returns the proof expected from the client, None without token.
+        """
+        token = getattr(self.server, "token", None)
+        if token is None:
+            return None
+        nonce = str(json.loads(self.rfile.readline()).get("nonce", ""))
+        server_nonce = secrets.token_urlsafe(16)
+        self.send(
+            {
+                "nonce": server_nonce,
+                "proof": proof(token, "server", nonce, server_nonce),
+            }
+        )
+        return proof(token, "client", nonce, server_nonce)
+
+    def send(self, header: dict, body: bytes = b"") -> None:
+        self.wfile.write(json.dumps(header).encode() + b"\n")
+        self.wfile.write(body)
+
+
+if hasattr(socketserver, "ForkingMixIn"):
+    ConcurrencyMixIn = socketserver.ForkingMixIn
+else:
+    ConcurrencyMixIn = socketserver.ThreadingMixIn  # type: ignore
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class UnixConversionServer(ConcurrencyMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+class TCPConversionServer(ConcurrencyMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    token: Optional[str] = None
+    """requests without this token are refused."""
+
+
+def write_token(token_file: str) -> str:
+    """Write a new random token in `token_file`, only readable by the user."""
+    token = secrets.token_urlsafe(32)
+    if os.path.exists(token_file):
+        os.remove(token_file)
+    old_umask = os.umask(0o177)
+    try:
+        fd = os.open(token_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    finally:
+        os.umask(old_umask)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    return token
+
+
+def make_server(
+    address: Address, token_file: Optional[str] = None
+) -> socketserver.BaseServer:
+    """
+    Create the server, a stale socket file at `address` is removed.
+
+    TCP servers write their token in `token_file` (default_token_file() by default).
+    """
+    if not isinstance(address, str):
+        server = TCPConversionServer(address, ConversionHandler)
+        server.token = write_token(token_file or default_token_file())
+        return server
+
+    if os.path.exists(address):
+        try:
+            connect(address, timeout=1).close()
+        except OSError:
+            os.remove(address)
+        else:
+            raise OSError(f"A server is already listening on {address}.")
+
+    # the socket is only accessible by the user
+    old_umask = os.umask(0o177)
+    try:
+        return UnixConversionServer(address, ConversionHandler)
+    finally:
+        os.umask(old_umask)
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the inkvn conversion server.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--socket", help="Unix socket path")
+    group.add_argument("--port", type=int, help="listen on this localhost port")
+    parser.add_argument(
+        "--token-file",
+        help="where a TCP server writes its token (default: %(default)s)",
+        default=default_token_file(),
+    )
+    options = parser.parse_args(args)
+
+    address: Address = default_address()
+    if options.socket is not None:
+        address = options.socket
+    elif options.port is not None:
+        address = ("127.0.0.1", options.port)
+
+    server = make_server(address, options.token_file)
+    # clean up the socket on kill as well
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"inkvn server listening on {address}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        # the socket file, or the token of a TCP server
+        owned = address if isinstance(address, str) else options.token_file
+        if os.path.exists(owned):
+            os.remove(owned)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,525 @@
+"""
+inkvn Bezier tools
+
+Arc length tables of paths, used to place PowerStroke offsets,
+and the geometry of the PowerStroke and fillet LPEs for baking them.
+"""
+
+import math
+from typing import List, Sequence, Tuple, Union
+
+import inkex
+import numpy as np
+
+# Gauss-Legendre nodes on [0, 1] and their weights
+_NODES, _WEIGHTS = np.polynomial.legendre.leggauss(4)
+_NODES = (_NODES + 1) / 2
+_WEIGHTS = _WEIGHTS / 2
+
+SUBDIVISIONS = 64
+"""
+intervals of the arc length table of each cubic Bezier,
+many low order intervals cope best with cusps
+"""
+
+CHUNK = 1024
+"""curves integrated at once"""
+
+NEWTON_STEPS = 4
+
+TURN_PER_PIECE = math.pi / 4
+"""turning of the path approximated by one piece of an outline"""
+
+MAX_PIECES = 8
+
+
+def _speed(points: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """|B'(t)| of cubic Beziers (rows of 4 complex points) at t (same rows)."""
+    p0, p1, p2, p3 = (points[:, i : i + 1] for i in range(4))
+    u = 1 - t
+    derivative = 3 * (u * u * (p1 - p0) + 2 * u * t * (p2 - p1) + t * t * (p3 - p2))
+    return np.abs(derivative)
+
+
+def _integrate(points: np.ndarray, t0: np.ndarray, t1: np.ndarray) -> np.ndarray:
+    """Arc lengths between t0 and t1 (columns) of cubic Beziers."""
+    span = t1 - t0
+    result = np.zeros(t0.shape)
+    for node, weight in zip(_NODES, _WEIGHTS):
+        result += weight * _speed(points, t0 + node * span)
+    return result * span
+
+
+class ArcLengths:
+    """
+    Cumulative arc lengths of the commands of a subpath.
+
+    Lines are measured exactly, cubic Beziers with a table of Gauss-Legendre
+    integrals over equal time intervals, other commands by inkex.
+    """
+
+    def __init__(self, subpath: inkex.Path) -> None:
+        self.commands: List[inkex.paths.Path.PathCommandProxy] = list(
+            subpath.proxy_iterator()
+        )
+        count = len(self.commands)
+        lengths = np.zeros(count)
+        self.curves = np.full(count, -1)
+
+        curve_points: List[Tuple[complex, complex, complex, complex]] = []
+        for i, command in enumerate(self.commands):
+            letter = command.letter
+            if letter in "Mm":
+                continue
+            if letter in "LlZzHhVv":
+                lengths[i] = abs(command.cend_point - command.cprevious_end_point)
+            elif letter in "Cc":
+                self.curves[i] = len(curve_points)
+                handle1, handle2, end = command.command.ccontrol_points(
+                    command.cfirst_point,
+                    command.cprevious_end_point,
+                    command.cprev2_control_point,
+                )
+                curve_points.append(
+                    (command.cprevious_end_point, handle1, handle2, end)
+                )
+            else:
+                lengths[i] = command.length()
+
+        # table[k, j]: length of curve k until the time j / SUBDIVISIONS
+        self.points = np.array(curve_points, dtype=complex).reshape(-1, 4)
+        self.table = np.zeros((len(self.points), SUBDIVISIONS + 1))
+        steps = np.linspace(0, 1, SUBDIVISIONS + 1)
+        for start in range(0, len(self.points), CHUNK):
+            points = self.points[start : start + CHUNK]
+            intervals = _integrate(
+                np.repeat(points, SUBDIVISIONS, axis=0),
+                np.tile(steps[:-1], len(points))[:, None],
+                np.tile(steps[1:], len(points))[:, None],
+            ).reshape(-1, SUBDIVISIONS)
+            np.cumsum(intervals, axis=1, out=self.table[start : start + CHUNK, 1:])
+        lengths[self.curves >= 0] = self.table[:, -1]
+
+        self.lengths = lengths
+        self.cumulative = np.cumsum(lengths)
+
+    def control_points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cubic Bezier control points of the commands (rows of 4 complex),
+        and which commands are lines.
+
+        Moves are points, other commands than lines, cubic and quadratic
+        Beziers are replaced by their chord.
+        """
+        rows = np.zeros((len(self.commands), 4), dtype=complex)
+        lines = np.ones(len(self.commands), dtype=bool)
+        thirds = np.array([0, 1, 2, 3]) / 3
+        for i, command in enumerate(self.commands):
+            start = command.cprevious_end_point
+            letter = command.letter
+            if letter in "Mm":
+                rows[i] = command.cend_point
+            elif self.curves[i] >= 0:
+                rows[i] = self.points[self.curves[i]]
+                lines[i] = False
+            elif letter in "QqTt":
+                control, end = command.command.ccontrol_points(
+                    command.cfirst_point, start, command.cprev2_control_point
+                )
+                rows[i] = (
+                    start,
+                    start + (control - start) * 2 / 3,
+                    end + (control - end) * 2 / 3,
+                    end,
+                )
+                lines[i] = False
+            else:
+                rows[i] = start + (command.cend_point - start) * thirds
+        return rows, lines
+
+    @property
+    def total(self) -> float:
+        return float(self.cumulative[-1])
+
+    def locate(self, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Index of the first command (after the move) reaching each arc length,
+        and the time on that command.
+        """
+        lengths = np.clip(np.asarray(lengths, dtype=float), 0, self.total)
+        index = np.searchsorted(self.cumulative, lengths, side="left")
+        index = np.clip(index, 1, len(self.commands) - 1)
+        remaining = lengths - self.cumulative[index - 1]
+
+        times = np.zeros(len(index))
+        curves = self.curves[index]
+        is_curve = curves >= 0
+        if is_curve.any():
+            times[is_curve] = self.curve_times(curves[is_curve], remaining[is_curve])
+
+        for k in np.flatnonzero(~is_curve):
+            command = self.commands[index[k]]
+            length = self.lengths[index[k]]
+            if command.letter in "LlZzHhVv":
+                times[k] = remaining[k] / length if length else 0.0
+            else:
+                times[k] = command.ilength(remaining[k])
+        return index, times
+
+    def curve_times(self, curves: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Times of arc `lengths` on the cubic Beziers `curves`."""
+        table = self.table[curves]
+        points = self.points[curves]
+        rows = np.arange(len(curves))
+
+        # interval of the table, then Newton's method inside it
+        interval = (table[:, 1:] < lengths[:, None]).sum(axis=1)
+        interval = np.minimum(interval, SUBDIVISIONS - 1)
+        start = interval / SUBDIVISIONS
+        end = (interval + 1) / SUBDIVISIONS
+        before = table[rows, interval]
+        within = table[rows, interval + 1] - before
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = start + np.where(
+                within > 0, (lengths - before) / within / SUBDIVISIONS, 0
+            )
+            for _ in range(NEWTON_STEPS):
+                error = before + _integrate(points, start[:, None], t[:, None])[:, 0]
+                error -= lengths
+                speed = _speed(points, t[:, None])[:, 0]
+                t = np.clip(t - np.where(speed > 0, error / speed, 0), start, end)
+
+        # degenerate curves, inkex gives the first bisection
+        return np.where(table[:, -1] > 0, t, 0.5)
+
+
+def _evaluate(
+    points: np.ndarray, t: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Points, first and second derivatives of cubic Beziers at t."""
+    p0, p1, p2, p3 = points.T
+    u = 1 - t
+    point = u * u * u * p0 + 3 * u * t * (u * p1 + t * p2) + t * t * t * p3
+    first = 3 * (u * u * (p1 - p0) + 2 * u * t * (p2 - p1) + t * t * (p3 - p2))
+    second = 6 * (u * (p2 - 2 * p1 + p0) + t * (p3 - 2 * p2 + p1))
+    return point, first, second
+
+
+def _directions(points: np.ndarray, t: np.ndarray, first: np.ndarray) -> np.ndarray:
+    """Unit tangents, also where the derivative vanishes at a handle."""
+    first = first.copy()
+    for step in (1e-4, 1e-2):
+        flat = np.abs(first) < 1e-9
+        if not flat.any():
+            break
+        inward = np.where(t[flat] < 0.5, step, -step)
+        first[flat] = _evaluate(points[flat], t[flat] + inward)[1]
+    flat = np.abs(first) < 1e-9
+    first[flat] = points[flat, 3] - points[flat, 0]
+    first[np.abs(first) == 0] = 1
+    return first / np.abs(first)
+
+
+def _hermite(
+    start: np.ndarray,
+    start_d: np.ndarray,
+    end: np.ndarray,
+    end_d: np.ndarray,
+    h: Union[float, np.ndarray],
+) -> np.ndarray:
+    """Cubic Beziers (rows) from end points and derivatives over a time span h."""
+    return np.stack([start, start + start_d * h / 3, end - end_d * h / 3, end], axis=1)
+
+
+def _arcs(
+    center: np.ndarray, start: np.ndarray, angle: np.ndarray, parts: int
+) -> np.ndarray:
+    """Circular arcs around `center` as `parts` cubic Beziers each (rows)."""
+    step = np.exp(1j * angle / parts)
+    k = 4 / 3 * np.tan(angle / parts / 4)
+    v0 = start - center
+    rows = []
+    for _ in range(parts):
+        v1 = v0 * step
+        rows.append(np.stack([v0, v0 * (1 + 1j * k), v1 * (1 - 1j * k), v1], axis=1))
+        v0 = v1
+    return np.stack(rows, axis=1).reshape(-1, 4) + np.repeat(center, parts)[:, None]
+
+
+def _path_data(rows: np.ndarray, lines: Sequence[bool] = ()) -> str:
+    """Path data of connected cubic Beziers (rows), `lines` are written as such."""
+    values = np.stack([rows.real, rows.imag], axis=2).reshape(-1, 8).tolist()
+    lines = list(lines) or [False] * len(values)
+    commands = [f"M {values[0][0]:.6g} {values[0][1]:.6g}"]
+    for row, line in zip(values, lines):
+        if line:
+            commands.append(f"L {row[6]:.6g} {row[7]:.6g}")
+        else:
+            commands.append(
+                "C {:.6g} {:.6g} {:.6g} {:.6g} {:.6g} {:.6g}".format(*row[2:])
+            )
+    return " ".join(commands)
+
+
+def round_corners(path: inkex.Path, radii: Sequence[float]) -> str:
+    """
+    Path data of `path` with circular fillets at the nodes of its first subpath,
+    like the fillet_chamfer LPE with fixed radii.
+
+    `radii` are taken in order for the nodes, a closed subpath has one node
+    per segment. A segment trimmed by two fillets gives half its length to each.
+    Fillets are cubic Beziers tangent to both trimmed segments.
+    """
+    subpaths = path.break_apart()
+    if not subpaths:
+        return str(path)
+    rest = " ".join(str(subpath) for subpath in subpaths[1:])
+
+    arc_lengths = ArcLengths(subpaths[0])
+    rows, lines = arc_lengths.control_points()
+    rows, lines, lengths = rows[1:], lines[1:], arc_lengths.lengths[1:]
+    closed = arc_lengths.commands[-1].letter in "Zz"
+    if closed and len(rows) > 1 and lengths[-1] == 0:
+        rows, lines, lengths = rows[:-1], lines[:-1], lengths[:-1]
+    count = len(rows)
+    if count == 0:
+        return str(path)
+
+    nodes = count if closed else count + 1
+    radius = np.zeros(nodes)
+    given = np.asarray(radii[:nodes], dtype=float)
+    radius[: len(given)] = given
+    if not closed:
+        radius[0] = radius[-1] = 0
+
+    # the node j joins the segments j - 1 and j
+    segments = np.arange(count)
+    ends = (segments + 1) % nodes
+    incoming = _directions(rows, np.ones(count), _evaluate(rows, np.ones(count))[1])
+    outgoing = _directions(rows, np.zeros(count), _evaluate(rows, np.zeros(count))[1])
+    turn = np.zeros(nodes)
+    inner = ends[: count if closed else count - 1]
+    turn[inner] = np.abs(np.angle(outgoing[inner % count] / incoming[inner - 1]))
+    valid = (radius > 0) & (turn > 1e-6) & (turn < math.pi - 1e-6)
+    distance = np.where(valid, radius * np.tan(np.where(valid, turn, 0) / 2), 0)
+
+    share = np.where((distance[segments] > 0) & (distance[ends] > 0), 0.5, 1.0)
+    limit = lengths * share
+    distance[inner] = np.minimum(
+        distance[inner], np.minimum(limit[inner - 1], limit[inner % count])
+    )
+
+    t0 = _segment_times(arc_lengths, lines, lengths, distance[segments])
+    t1 = _segment_times(arc_lengths, lines, lengths, lengths - distance[ends])
+    start, start_d, _ = _evaluate(rows, t0)
+    end, end_d, _ = _evaluate(rows, t1)
+    trimmed = _hermite(start, start_d, end, end_d, t1 - t0)
+    start_dir = _directions(rows, t0, start_d)
+    end_dir = _directions(rows, t1, end_d)
+
+    result: List[np.ndarray] = []
+    result_lines: List[bool] = []
+    for i in range(count):
+        if not lines[i] or t1[i] > t0[i]:
+            result.append(trimmed[i])
+            result_lines.append(bool(lines[i]))
+        j = ends[i]
+        if distance[j] > 0:
+            following = j % count
+            p, q = trimmed[i, 3], trimmed[following, 0]
+            u1, u2 = end_dir[i], start_dir[following]
+            angle = abs(np.angle(u2 / u1))
+            handle = (
+                4 / 3 * math.tan(angle / 4) * abs(q - p) / (2 * math.sin(angle / 2))
+            )
+            result.append(np.array([p, p + handle * u1, q - handle * u2, q]))
+            result_lines.append(False)
+
+    if not result:
+        return str(path)
+    d = _path_data(np.array(result), result_lines)
+    if closed:
+        d += " Z"
+    return f"{d} {rest}" if rest else d
+
+
+def _segment_times(
+    arc_lengths: ArcLengths, lines: np.ndarray, lengths: np.ndarray, at: np.ndarray
+) -> np.ndarray:
+    """Times of the arc lengths `at` on each segment (commands after the move)."""
+    at = np.clip(at, 0, lengths)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        times = np.where(lengths > 0, at / lengths, 0.0)
+    curves = arc_lengths.curves[1 : len(lengths) + 1]
+    is_curve = (curves >= 0) & ~lines
+    if is_curve.any():
+        times[is_curve] = arc_lengths.curve_times(curves[is_curve], at[is_curve])
+    return times
+
+
+def _johan(
+    points: np.ndarray, beta: float, time: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Widths and their derivatives at `time`, interpolated between the
+    (time, width) `points` like the CubicBezierJohan interpolator.
+
+    Each interval is a cubic Bezier with flat handles, beta of its length.
+    Outside the points, the width of the nearest one is kept.
+    """
+    if len(points) == 0:
+        return np.zeros(len(time)), np.zeros(len(time))
+    x, y = points[:, 0], points[:, 1]
+    if len(points) == 1:
+        return np.full(len(time), y[0]), np.zeros(len(time))
+
+    i = np.searchsorted(x, time, side="right") - 1
+    outside = (i < 0) | (i >= len(x) - 1)
+    i = np.clip(i, 0, len(x) - 2)
+    dx = x[i + 1] - x[i]
+    dy = y[i + 1] - y[i]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        u = np.clip(np.where(dx > 0, (time - x[i]) / dx, 0), 0, 1)
+
+    # solve x(s) = u for the Bezier time s, x is monotonic for beta < 1/2
+    s = u.copy()
+    for _ in range(NEWTON_STEPS * 2):
+        v = 1 - s
+        xs = 3 * beta * s * v * v + 3 * (1 - beta) * s * s * v + s * s * s
+        dxs = 3 * (beta * v * v + 2 * (1 - 2 * beta) * s * v + beta * s * s)
+        s = np.clip(s - (xs - u) / dxs, 0, 1)
+    v = 1 - s
+    dxs = 3 * (beta * v * v + 2 * (1 - 2 * beta) * s * v + beta * s * s)
+
+    width = y[i] + dy * s * s * (3 - 2 * s)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(dx > 0, dy * 6 * s * v / (dx * dxs), 0)
+    nearest = np.where(time < x[0], y[0], y[-1])
+    return np.where(outside, nearest, width), np.where(outside, 0, slope)
+
+
+def stroke_outline(
+    subpaths: Sequence[Tuple[ArcLengths, np.ndarray]],
+    widths: Sequence[Tuple[float, float]],
+    beta: float,
+) -> str:
+    """
+    Path data of the outline of a stroke of variable width,
+    like the PowerStroke LPE with round caps.
+
+    `subpaths` are the arc lengths of each subpath and the times of its commands
+    (number of the visible segment), `widths` are sorted (time, half width)
+    points interpolated like CubicBezierJohan. Sides are offset by cubic Beziers
+    of matching derivatives, outer joins are round and inner joins straight.
+    Closed subpaths give two loops.
+    """
+    points = np.array(widths, dtype=float).reshape(-1, 2)
+    outlines = []
+    for arc_lengths, visible in subpaths:
+        rows = arc_lengths.control_points()[0]
+        kept = np.flatnonzero(arc_lengths.lengths > 0)
+        if not len(kept):
+            continue
+        closed = arc_lengths.commands[-1].letter in "Zz"
+        rows = rows[kept]
+        start_times = visible[kept]
+
+        # samples at the ends of the pieces, evenly by the turning of each
+        # command, and at the width points and halfway between them
+        quarters = np.linspace(0, 1, 5)
+        probe = _directions(
+            np.repeat(rows, 5, axis=0),
+            np.tile(quarters, len(rows)),
+            _evaluate(np.repeat(rows, 5, axis=0), np.tile(quarters, len(rows)))[1],
+        ).reshape(-1, 5)
+        turning = np.abs(np.angle(probe[:, 1:] / probe[:, :-1])).sum(axis=1)
+        pieces = np.clip(np.ceil(turning / TURN_PER_PIECE), 1, MAX_PIECES).astype(int)
+        command = np.repeat(np.arange(len(rows)), pieces + 1)
+        first = np.concatenate([[0], np.cumsum(pieces + 1)[:-1]])
+        t = (np.arange(len(command)) - first[command]) / pieces[command]
+
+        extra = np.concatenate([points[:, 0], (points[1:, 0] + points[:-1, 0]) / 2])
+        owner = np.searchsorted(start_times, extra, side="right") - 1
+        valid = owner >= 0
+        owner = np.maximum(owner, 0)
+        valid &= extra < start_times[owner] + 1
+        command = np.concatenate([command, owner[valid]])
+        t = np.concatenate([t, extra[valid] - start_times[owner[valid]]])
+        order = np.lexsort((t, command))
+        command, t = command[order], t[order]
+        distinct = np.ones(len(t), dtype=bool)
+        distinct[1:] = (command[1:] != command[:-1]) | (t[1:] - t[:-1] > 1e-9)
+        command, t = command[distinct], t[distinct]
+        first = np.searchsorted(command, np.arange(len(rows)))
+        pieces = np.diff(np.append(first, len(command))) - 1
+
+        curve = rows[command]
+        point, derivative, second = _evaluate(curve, t)
+        tangent = _directions(curve, t, derivative)
+        speed = np.abs(derivative)
+        normal = 1j * tangent
+        with np.errstate(invalid="ignore", divide="ignore"):
+            normal_d = np.where(
+                speed > 1e-9,
+                -tangent * (np.conj(tangent) * second).imag / speed,
+                0,
+            )
+        width, width_d = _johan(points, beta, start_times[command] + t)
+
+        sides = []
+        for sign in (1, -1):
+            offset = point + sign * width * normal
+            offset_d = derivative + sign * (width_d * normal + width * normal_d)
+            a = np.flatnonzero(command[:-1] == command[1:])
+            h = t[a + 1] - t[a]
+            start_d, end_d = offset_d[a] * h, offset_d[a + 1] * h
+            # near cusps the offsets turn too fast, keep handles within the chord
+            chord = np.abs(offset[a + 1] - offset[a])
+            for handle in (start_d, end_d):
+                long = np.abs(handle) > 3 * chord
+                handle[long] *= 3 * chord[long] / np.abs(handle[long])
+            side = _hermite(offset[a], start_d, offset[a + 1], end_d, 1)
+
+            # joins after the last piece of each command
+            last = first[1:] - 1
+            following = first[1:]
+            if closed:
+                last = np.append(last, len(command) - 1)
+                following = np.append(following, 0)
+            p, q = offset[last], offset[following]
+            turn = np.angle(tangent[following] / tangent[last])
+            apart = np.abs(q - p) > 1e-6 * (1 + width[last])
+            # round outer joins in up to two arcs, straight inner joins
+            outer = apart & (sign * turn < 0)
+            wide = outer & (np.abs(turn) > np.pi / 2)
+            joins = np.zeros((len(last), 2, 4), dtype=complex)
+            joins[:, 0] = np.stack([p, p, q, q], axis=1)
+            center = point[last]
+            narrow = outer & ~wide
+            joins[narrow, 0] = _arcs(center[narrow], p[narrow], turn[narrow], 1)
+            joins[wide] = _arcs(center[wide], p[wide], turn[wide], 2).reshape(-1, 2, 4)
+            count = np.where(apart, np.where(wide, 2, 1), 0)
+            used = np.arange(2) < count[:, None]
+            after = np.cumsum(pieces)[: len(last)]
+            side = np.insert(side, np.repeat(after, count), joins[used], axis=0)
+            sides.append(side)
+
+        left, right = sides
+        if closed:
+            outlines.append(_path_data(left) + " Z")
+            outlines.append(_path_data(right[::-1, ::-1]) + " Z")
+            continue
+
+        caps = []
+        for i in (len(command) - 1, 0):
+            if width[i] > 1e-9:
+                start = point[i] + (width[i] if i else -width[i]) * normal[i]
+                caps.append(
+                    _arcs(point[i : i + 1], np.array([start]), np.array([-np.pi]), 2)
+                )
+            else:
+                caps.append(np.zeros((0, 4), dtype=complex))
+        loop = np.concatenate([left, caps[0], right[::-1, ::-1], caps[1]])
+        outlines.append(_path_data(loop) + " Z")
+    return " ".join(outlines)
@@ -6,25 +6,80 @@ Convert the intermediate data to Inkscape read by read.py
 
 import itertools
 import logging
-from typing import List, Optional, Tuple, Union
+import os
+import pathlib
+import urllib.parse
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import inkex
 import lxml.etree
+import numpy as np
 from inkex.base import SvgOutputMixin
 
-from ..elements.artboard import VNArtboard
+from ..elements.artboard import VNArtboard, VNLayer
 from ..elements.base import VNBaseElement
 from ..elements.group import VNGroupElement
 from ..elements.guide import VNGuideElement
-from ..elements.image import VNImageElement
+from ..elements.image import VNImageData, VNImageElement
 from ..elements.path import VNPathElement
 from ..elements.styles import VNColor, VNGradient, brushProfile, pathStrokeStyle
 from ..elements.text import VNTextElement, singleStyledText
 from ..reader.read import CurveReader
+from ..trace import traced
+from .bezier import ArcLengths, round_corners, stroke_outline
+from .ids import IdAllocator
 
 logger = logging.getLogger(__name__)
 
 
+def _def_key(elem: inkex.BaseElement) -> tuple:
+    """Content of `elem` and its children, without ids."""
+    attrib = tuple(sorted((k, v) for k, v in elem.attrib.items() if k != "id"))
+    return (elem.tag, attrib, tuple(_def_key(child) for child in elem))
+
+
+def _power_stroke_offsets(
+    path: inkex.Path, brush: brushProfile
+) -> Tuple[List[Tuple[ArcLengths, np.ndarray]], List[Tuple[float, float]]]:
+    """
+    Arc lengths of the subpaths of `path`, and the sorted (location, width)
+    offset points of `brush` on it.
+    """
+    # from extension-afdesign
+    locations = np.array([i[0] for i in brush.handles], dtype=float)
+
+    # Get local lengths
+    subpaths = path.break_apart()
+    start_indices = [0] + list(itertools.accumulate(len(s) for s in subpaths))
+    moves = 0
+    measured: List[Tuple[ArcLengths, np.ndarray]] = []
+    resulting_offsets: List[Tuple[float, float]] = []
+    for start_index, subpath in zip(start_indices, subpaths):
+        # the same width curve is applied to all subpaths
+        arc_lengths = ArcLengths(subpath)
+        index, times = arc_lengths.locate(locations * arc_lengths.total)
+
+        # commands of zero length and the move are not counted
+        # as visible segments, only those until the location
+        zero = np.diff(arc_lengths.cumulative, prepend=0.0) == 0
+        zero[0] = True
+        hidden = moves + np.cumsum(zero)
+        moves = int(hidden[-1])
+
+        # Coordinates are specified as
+        # no. visible segment + local path coordinate
+        visible = start_index + np.arange(len(zero)) - hidden
+        measured.append((arc_lengths, visible))
+        offsets = visible[index] + times
+        resulting_offsets.extend(
+            (offset, abs(point[1]))
+            for offset, point in zip(offsets.tolist(), brush.handles)
+        )
+
+    # remove duplicates
+    return measured, sorted(set(resulting_offsets), key=lambda item: item[0])
+
+
 class CurveConverter:
     """
     inkvn CurveConverter
@@ -32,15 +87,59 @@ class CurveConverter:
     Convert the intermediate data to Inkscape.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        image_dir: Optional[str] = None,
+        image_href_base: Optional[str] = None,
+        bake_effects: bool = False,
+        keep_effect_params: bool = False,
+    ) -> None:
+        """
+        Bitmaps are embedded as Base64 unless `image_dir` is given,
+        then they are written there and referenced by hrefs
+        relative to `image_href_base` (parent of `image_dir` by default).
+
+        With `bake_effects`, PowerStroke and rounded corners are written as
+        plain paths instead of LPEs, see bake_lpe() for `keep_effect_params`.
+        """
         self.reader: CurveReader
         self.has_transform_applied: bool
         self.doc: lxml.etree._ElementTree
         self.document: inkex.SvgDocumentElement
         self.offset_x: float
         self.offset_y: float
+        # ids only, written defs are dropped by CurveStreamConverter
+        self.image_defs: Dict[str, str] = {}
+        """ids of shared images by relativePath."""
+        self.shared_defs: Dict[tuple, str] = {}
+        """ids of defs shared by their content, see get_shared_def()."""
+        self.image_dir = image_dir
+        self.image_href_base = image_href_base
+        if image_dir is not None and image_href_base is None:
+            self.image_href_base = os.path.dirname(os.path.abspath(image_dir))
+        self.image_files: Dict[str, str] = {}
+        """hrefs of bitmaps written in image_dir by relativePath."""
+        self.image_names: Set[str] = set()
+        """file names taken in image_dir."""
+        self.bake_effects = bake_effects
+        self.keep_effect_params = keep_effect_params
+        self.ids = IdAllocator()
+        """ids of the defs added while converting."""
 
     def convert(self, reader: CurveReader, clip_page: bool = False) -> None:
+        self.start(reader)
+
+        for target_artboard in reader.artboards:
+            self.add_page(target_artboard)
+
+            self.load_page(
+                self.document.add(inkex.Layer.new(label=target_artboard.title)),
+                target_artboard,
+                clip_page,
+            )
+
+    def start(self, reader: CurveReader) -> None:
+        """Create the svg document for `reader`, without any artboards."""
         self.reader = reader
 
         """
@@ -72,33 +171,45 @@ class CurveConverter:
         self.offset_x = first_artboard.frame.x
         self.offset_y = first_artboard.frame.y
 
-        for target_artboard in reader.artboards:
-            page = inkex.Page.new(
-                width=target_artboard.frame.width,
-                height=target_artboard.frame.height,
-                x=target_artboard.frame.x - self.offset_x,
-                y=target_artboard.frame.y - self.offset_y,
-            )
-            self.document.namedview.add(page)
-            page.set("inkscape:label", target_artboard.title)
-
-            self.load_page(
-                self.document.add(inkex.Layer.new(label=target_artboard.title)),
-                target_artboard,
-                clip_page,
-            )
+    def add_page(self, artboard: VNArtboard) -> inkex.Page:
+        """Add inkex page of the artboard to namedview."""
+        page = inkex.Page.new(
+            width=artboard.frame.width,
+            height=artboard.frame.height,
+            x=artboard.frame.x - self.offset_x,
+            y=artboard.frame.y - self.offset_y,
+        )
+        self.document.namedview.add(page)
+        page.set("inkscape:label", artboard.title)
+        return page
 
     def load_page(
         self, root_layer: inkex.Layer, artboard: VNArtboard, clip_page: bool = False
     ) -> None:
         """Convert  VNArtboard to inkex page."""
+        self.load_background(root_layer, artboard, clip_page)
 
-        # translations of artboards
-        tr = inkex.transforms.Transform()
-        tr_vector = inkex.Vector2d(
+        # layers in the artboard
+        for layer in artboard.layers:
+            self.load_layer(root_layer, layer)
+
+        self.add_guides(artboard)
+
+    def artboard_offset(self, artboard: VNArtboard) -> inkex.Vector2d:
+        """Position of the artboard relative to the first one."""
+        return inkex.Vector2d(
             artboard.frame.x - self.offset_x, artboard.frame.y - self.offset_y
         )
-        tr.add_translate(tr_vector)
+
+    @traced(category="convert")
+    def load_background(
+        self, root_layer: inkex.Layer, artboard: VNArtboard, clip_page: bool = False
+    ) -> None:
+        """Set artboard translation, background and clipping to root_layer."""
+
+        # translations of artboards
+        tr = inkex.transforms.Transform()
+        tr.add_translate(self.artboard_offset(artboard))
         root_layer.transform = tr
 
         # Artboard color/gradient
@@ -111,11 +222,9 @@ class CurveConverter:
             self.set_fill_color_styles(rect, artboard.fillColor)
             root_layer.add(rect)
         elif artboard.fillGradient is not None:
-            if artboard.fillGradient.transform is not None:
-                artboard.fillGradient.gradient.set(
-                    "gradientTransform", artboard.fillGradient.transform
-                )
-            self.set_fill_grad_styles(rect, artboard.fillGradient)
+            self.set_fill_grad_styles(
+                rect, artboard.fillGradient, artboard.fillGradient.transform
+            )
             root_layer.add(rect)
         # if fill is none, rect will be dismissed
 
@@ -128,28 +237,32 @@ class CurveConverter:
             clip_rect.label = "page clipping"
 
             clip.add(clip_rect)
-            self.document.defs.add(clip)
+            self.add_defs(clip)
 
             if clip is not None:
-                root_layer.style["clip-path"] = clip.get_id(2)
-
-        # layers in the artboard
-        for layer in artboard.layers:
-            parent = root_layer.add(inkex.Layer.new(layer.name))
-            parent.set("opacity", layer.opacity)
-            parent.style["display"] = "inline" if layer.isVisible else "none"
-            if layer.isLocked:
-                parent.set("sodipodi:insensitive", "true")
-            # isExpanded is there, but not in use
-
-            # elements in the layer
-            for element in layer.elements:
-                elm = self.load_element(element)
-                if elm is not None:
-                    parent.add(elm)
-
-        # Guide
+                root_layer.style["clip-path"] = self.ids.get_id(clip, 2)
+
+    @traced(category="convert")
+    def load_layer(self, root_layer: inkex.Layer, layer: VNLayer) -> inkex.Layer:
+        """Convert VNLayer to inkex layer and add it to root_layer."""
+        parent = root_layer.add(inkex.Layer.new(layer.name))
+        parent.set("opacity", layer.opacity)
+        parent.style["display"] = "inline" if layer.isVisible else "none"
+        if layer.isLocked:
+            parent.set("sodipodi:insensitive", "true")
+        # isExpanded is there, but not in use
+
+        # elements in the layer
+        for element in layer.elements:
+            elm = self.load_element(element)
+            if elm is not None:
+                parent.add(elm)
+        return parent
+
+    def add_guides(self, artboard: VNArtboard) -> None:
+        """Add guides of the artboard to namedview."""
         if artboard.guides is not None:
+            tr_vector = self.artboard_offset(artboard)
             for guide in artboard.guides:
                 if guide is not None:
                     self.add_guide(guide, tr_vector)
@@ -182,6 +295,7 @@ class CurveConverter:
             )
             return None
 
+    @traced(category="convert")
     def convert_group(self, group_element: VNGroupElement) -> inkex.Group:
         """
         Converts a VNGroupElement to an SVG group (inkex.Group),
@@ -210,10 +324,10 @@ class CurveConverter:
             clip_path_element = self.convert_path(clip_path_child)
 
             clip.add(clip_path_element)
-            self.document.defs.add(clip)
+            self.add_defs(clip)
 
         if clip is not None:
-            group.style["clip-path"] = clip.get_id(2)
+            group.style["clip-path"] = self.ids.get_id(clip, 2)
 
         for child in group_element.groupElements:
             svg_element = self.load_element(child)
@@ -222,16 +336,27 @@ class CurveConverter:
                 if (
                     self.reader.file_version == 40
                     and clip is not None
-                    and isinstance(svg_element, inkex.Image)
+                    and isinstance(svg_element, (inkex.Image, inkex.Use))
                 ):
                     svg_element.transform = -group.transform @ svg_element.transform
                 group.add(svg_element)
 
         return group
 
-    def convert_image(self, image_element: VNImageElement) -> inkex.Image:
-        """Converts a VNImageElement to an SVG image (inkex.Image)."""
-        image = inkex.Image()
+    @traced(category="convert")
+    def convert_image(
+        self, image_element: VNImageElement
+    ) -> Union[inkex.Image, inkex.Use]:
+        """
+        Converts a VNImageElement to an SVG image (inkex.Image).
+        Returns inkex.Use when the bitmap is used by several elements.
+        """
+        image_data = image_element.imageData
+        image: Union[inkex.Image, inkex.Use]
+        if image_data.references > 1:
+            image = inkex.Use()
+        else:
+            image = inkex.Image()
 
         self.set_basic_attribs(image_element, image)
 
@@ -244,16 +369,11 @@ class CurveConverter:
             image.transform = image_element.localTransform.convert_transform()
 
         # Image
-        img_format = image_element.image_format()
-        width, height = image_element.image_dimension()
-
-        image.set("preserveAspectRatio", "none")
-        image.set(
-            inkex.addNS("href", "xlink"),
-            f"data:image/{img_format};base64,{image_element.imageData}",
-        )
-        image.set("width", width)
-        image.set("height", height)
+        if isinstance(image, inkex.Use):
+            image_id = self.get_shared_image(image_data)
+            image.set(inkex.addNS("href", "xlink"), f"#{image_id}")
+        else:
+            self.set_image_data(image, image_data)
 
         # image cropping with clipping mask
         if image_element.cropRect is not None:
@@ -262,11 +382,62 @@ class CurveConverter:
 
             if clip_element is not None:
                 clip.add(clip_element)
-                self.document.defs.add(clip)
-                image.style["clip-path"] = clip.get_id(2)
+                self.add_defs(clip)
+                image.style["clip-path"] = self.ids.get_id(clip, 2)
 
         return image
 
+    def get_shared_image(self, image_data: VNImageData) -> str:
+        """Returns the id of the image in defs for `image_data`, adding it on first use."""
+        image_id = self.image_defs.get(image_data.relative_path)
+        if image_id is None:
+            shared_image = inkex.Image()
+            self.set_image_data(shared_image, image_data)
+            self.add_defs(shared_image)
+            image_id = self.ids.get_id(shared_image)
+            self.image_defs[image_data.relative_path] = image_id
+        return image_id
+
+    @traced(category="convert")
+    def set_image_data(self, image: inkex.Image, image_data: VNImageData) -> None:
+        """Embed or link bitmap and its dimension to inkex.Image."""
+        width, height = image_data.dimension
+
+        if self.image_dir is not None:
+            href = self.write_image_file(image_data)
+        else:
+            href = f"data:image/{image_data.format};base64,{image_data.to_base64()}"
+
+        image.set("preserveAspectRatio", "none")
+        image.set(inkex.addNS("href", "xlink"), href)
+        image.set("width", width)
+        image.set("height", height)
+
+    def write_image_file(self, image_data: VNImageData) -> str:
+        """Write bitmap to image_dir once and returns its relative href."""
+        href = self.image_files.get(image_data.relative_path)
+        if href is None:
+            assert self.image_dir is not None and self.image_href_base is not None
+            os.makedirs(self.image_dir, exist_ok=True)
+
+            # bitmaps of other archive directories may have the same name
+            stem = os.path.splitext(os.path.basename(image_data.relative_path))[0]
+            name = f"{stem}.{image_data.format}"
+            count = 1
+            while name in self.image_names:
+                count += 1
+                name = f"{stem}-{count}.{image_data.format}"
+            self.image_names.add(name)
+
+            file_name = os.path.join(self.image_dir, name)
+            image_data.save(file_name)
+
+            relative = os.path.relpath(file_name, self.image_href_base)
+            href = urllib.parse.quote(pathlib.PurePath(relative).as_posix())
+            self.image_files[image_data.relative_path] = href
+        return href
+
+    @traced(category="convert")
     def convert_path(
         self, path_element: VNPathElement
     ) -> Union[inkex.PathElement, inkex.Group]:
@@ -278,10 +449,9 @@ class CurveConverter:
 
         self.set_basic_attribs(path_element, path)
 
-        # pathGeometry
+        # pathGeometry, the path data is written as is, without inkex.Path
         if path_element.pathGeometries:
-            for path_geometry in path_element.pathGeometries:
-                path.path += path_geometry.path
+            path.set("d", " ".join(g.d for g in path_element.pathGeometries if g.d))
 
         if not self.has_transform_applied and path_element.localTransform is not None:
             path.transform = path_element.localTransform.convert_transform()
@@ -309,21 +479,17 @@ class CurveConverter:
             # Add gradientTransform
             # matrix transform is based on Vectornator 4.13.2, format 13
             # and Linearity Curve 5.1.1, format 21
-            if path_element.fillGradient.transform is not None:
-                path_element.fillGradient.gradient.set(
-                    "gradientTransform", path_element.fillGradient.transform
-                )
-
-            elif (
-                not self.has_transform_applied
+            gradient_transform = path_element.fillGradient.transform
+            if (
+                gradient_transform is None
+                and not self.has_transform_applied
                 and path_element.localTransform is not None
             ):
                 gradient_transform = path_element.localTransform.convert_transform()
-                path_element.fillGradient.gradient.set(
-                    "gradientTransform", gradient_transform
-                )
 
-            self.set_fill_grad_styles(path, path_element.fillGradient)
+            self.set_fill_grad_styles(
+                path, path_element.fillGradient, gradient_transform
+            )
         else:
             path.style["fill"] = "none"
 
@@ -354,6 +520,7 @@ class CurveConverter:
 
         return path
 
+    @traced(category="convert")
     def convert_text(self, text_element: VNTextElement) -> inkex.TextElement:
         """Converts a VNTextElement to an SVG Text (inkex.TextElement)."""
         text = inkex.TextElement()
@@ -452,16 +619,16 @@ class CurveConverter:
                 ):
                     gradient_transform = text_element.localTransform.convert_transform()
                 if gradient_transform is not None:
-                    text_element.fillGradient.gradient.set(
-                        "gradientTransform",
-                        -text.transform @ gradient_transform,
-                    )
-                self.set_fill_grad_styles(text, text_element.fillGradient)
+                    gradient_transform = -text.transform @ gradient_transform
+                self.set_fill_grad_styles(
+                    text, text_element.fillGradient, gradient_transform
+                )
             else:
                 text.style["fill"] = "none"
 
         return text
 
+    @traced(category="convert")
     def convert_base(self, base_element: VNBaseElement) -> inkex.PathElement:
         """Converts a VNBaseElement to an empty SVG path (inkex.PathElement)."""
         logger.warning(
@@ -478,6 +645,11 @@ class CurveConverter:
 
         return path
 
+    @traced(category="convert")
+    def add_defs(self, elem: inkex.BaseElement) -> None:
+        """Add `elem` to the defs of the document."""
+        self.document.defs.add(elem)
+
     def set_basic_attribs(
         self, base_element: VNBaseElement, elem: inkex.BaseElement
     ) -> None:
@@ -523,71 +695,75 @@ class CurveConverter:
         elem.style["fill-opacity"] = fill.alpha
         elem.style["fill-rule"] = "nonzero"
 
-    def set_fill_grad_styles(self, elem: inkex.BaseElement, fill: VNGradient) -> None:
-        """Apply fillGradient to inkex.BaseElement."""
+    def set_fill_grad_styles(
+        self,
+        elem: inkex.BaseElement,
+        fill: VNGradient,
+        gradient_transform: Optional[inkex.Transform] = None,
+    ) -> None:
+        """
+        Apply fillGradient to inkex.BaseElement.
 
-        self.document.defs.add(fill.stops)
-        fill.gradient.set(inkex.addNS("href", "xlink"), fill.stops.get_id(1))
+        `fill` may be shared by several elements, its gradients are copied
+        once per distinct stops and position, then shared by xlink:href.
+        """
+        stops_id = self.get_shared_def(fill.stops)
+        attrib = {inkex.addNS("href", "xlink"): f"#{stops_id}"}
+        if gradient_transform is not None:
+            attrib["gradientTransform"] = str(gradient_transform)
+        gradient_id = self.get_shared_def(fill.gradient, attrib)
 
-        self.document.defs.add(fill.gradient)
-        elem.style["fill"] = fill.gradient.get_id(2)
+        elem.style["fill"] = f"url(#{gradient_id})"
         elem.style["fill-rule"] = "nonzero"
 
+    def get_shared_def(
+        self, elem: inkex.BaseElement, attrib: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Returns the id of the def equal to `elem` with `attrib` set,
+        adding a copy of `elem` to defs on first use.
+        """
+        attrib = attrib or {}
+        key = (_def_key(elem), tuple(sorted(attrib.items())))
+        shared_id = self.shared_defs.get(key)
+        if shared_id is None:
+            shared = elem.copy()
+            for name, value in attrib.items():
+                shared.set(name, value)
+            self.add_defs(shared)
+            shared_id = self.ids.get_id(shared)
+            self.shared_defs[key] = shared_id
+        return shared_id
+
+    @traced(category="convert")
     def set_power_stroke(self, elem: inkex.ShapeElement, brush: brushProfile) -> None:
-        """Apply Power Stroke LPE to inkex.PathElement."""
-        # from extension-afdesign
-        path = elem.path
-        locations = [i[0] for i in brush.handles]
-
-        # Get local lengths
-        subpaths = path.break_apart()
-        start_indices = [0] + list(itertools.accumulate(len(s) for s in subpaths))
-        moves = 0
-        resulting_offsets: List[Tuple[float, float]] = []
-        for start_index, subpath in zip(start_indices, subpaths):
-            # the same width curve is applied to all subpaths
-            lengths = [
-                command.length() if command.letter not in "Mm" else 0
-                for command in subpath.proxy_iterator()
-            ]
-            cumulative_lengths = list(itertools.accumulate(lengths))
-            total_length = cumulative_lengths[-1]
-            result = {}
-            moves += 1
-            for (_, l1), ((i, p2), l2) in inkex.utils.pairwise(
-                zip(enumerate(subpath.proxy_iterator()), cumulative_lengths),
-                start=False,
-            ):
-                if l2 - l1 == 0:
-                    moves += 1
-                for location in locations:
-                    if l1 <= location * total_length <= l2 and location not in result:
-                        # On the current segment and not processed yet
-                        # Coordinates are specified as
-                        # no. visible segment + local path coordinate
-                        result[location] = (start_index + i - moves) + p2.ilength(
-                            location * total_length - l1
-                        )
-            resulting_offsets.extend(
-                (result[point[0]], abs(point[1])) for point in brush.handles
-            )
-        width = elem.to_dimensionless(elem.style("stroke-width"))
+        """
+        Apply Power Stroke LPE to inkex.PathElement.
 
-        # remove duplicates
-        offset_sets = set(resulting_offsets)
-        sorted_offsets = sorted(list(offset_sets), key=lambda item: item[0])
+        The offset points of the LPE are located on the path before the LPEs,
+        also when the rounded corners are baked, so that the kept parameters
+        give the same result as the live LPEs.
+        """
+        measured, sorted_offsets = _power_stroke_offsets(elem.path, brush)
+        width = elem.to_dimensionless(elem.style("stroke-width"))
 
-        path_effect_str = elem.get("inkscape:path-effect", "")
+        # path before the rounded corners, baked or live
+        original_d = elem.get("data-original-d")
+        path_effect_str = elem.get("inkscape:path-effect", "") or original_d
+        if original_d:
+            _, lpe_offsets = _power_stroke_offsets(inkex.Path(original_d), brush)
+        else:
+            lpe_offsets = sorted_offsets
         if path_effect_str:
             # replicate offsets by doubling location
             offset_pts = " | ".join(
                 f"{location * 2:.6f},{offset * width / 2:.6f}"
-                for location, offset in sorted_offsets
+                for location, offset in lpe_offsets
             )
         else:
             offset_pts = " | ".join(
                 f"{location:.6f},{offset * width / 2:.6f}"
-                for location, offset in sorted_offsets
+                for location, offset in lpe_offsets
             )
 
         # FIXME Vectornator produces problematic paths
@@ -605,8 +781,18 @@ class CurveConverter:
             not_jump="false",
             offset_points=offset_pts,
         )
-        self.apply_lpe(elem, path_effect)
+        if self.bake_effects:
+            scale = float(path_effect.get("scale_width"))
+            widths = [
+                (location, offset * width / 2 * scale)
+                for location, offset in sorted_offsets
+            ]
+            beta = float(path_effect.get("interpolator_beta"))
+            self.bake_lpe(elem, path_effect, stroke_outline(measured, widths, beta))
+        else:
+            self.apply_lpe(elem, path_effect)
 
+    @traced(category="convert")
     def set_corner(self, elem: inkex.ShapeElement, corner_radius: List[float]) -> None:
         """Apply rounded corner to inkex.ShapeElement."""
         params = " @ ".join(f"F,0,0,1,0,{r},0,1" for r in corner_radius)
@@ -623,30 +809,59 @@ class CurveConverter:
             satellites_param=params,  # Inkscape 1.2
             nodesatellites_param=params,  # Inkscape 1.3
         )
-        self.apply_lpe(elem, path_effect)
+        if self.bake_effects:
+            self.bake_lpe(elem, path_effect, round_corners(elem.path, corner_radius))
+        else:
+            self.apply_lpe(elem, path_effect)
 
+    @traced(category="convert")
     def set_blur(
         self, elem: inkex.BaseElement, blur: inkex.Filter.GaussianBlur
     ) -> None:
-        """Apply blur to inkex.BaseElement."""
-        filt: inkex.Filter = inkex.Filter()
+        """Apply blur to inkex.BaseElement, sharing the filter of equal blurs."""
+        filt = inkex.Filter()
         filt.set("color-interpolation-filters", "sRGB")
         filt.add(blur)
-        self.document.defs.add(filt)
+        filter_id = self.get_shared_def(filt)
 
         # Only one filter will be there
-        elem.style["filter"] = filt
+        elem.style["filter"] = f"url(#{filter_id})"
 
     def apply_lpe(self, elem: inkex.ShapeElement, effect: inkex.PathEffect) -> None:
         """Apply LPE to inkex.ShapeElement."""
-        self.document.defs.add(effect)
+        self.add_defs(effect)
         path_effect_str = elem.get("inkscape:path-effect", "")
         if path_effect_str:
-            elem.set("inkscape:path-effect", f"{path_effect_str};{effect.get_id(1)}")
+            elem.set(
+                "inkscape:path-effect",
+                f"{path_effect_str};{self.ids.get_id(effect, 1)}",
+            )
         else:
-            elem.set("inkscape:path-effect", effect.get_id(1))
+            elem.set("inkscape:path-effect", self.ids.get_id(effect, 1))
             elem.set("inkscape:original-d", str(elem.path))
 
+    def bake_lpe(self, elem: inkex.ShapeElement, effect: inkex.PathEffect, d: str):
+        """
+        Replace the path of inkex.ShapeElement by `d`, the result of the LPE.
+
+        With keep_effect_params, the LPE is added to defs and referenced by
+        data-path-effect, with the path before the LPEs in data-original-d.
+        Renaming them to inkscape:path-effect and inkscape:original-d
+        makes the LPEs live again.
+        """
+        if self.keep_effect_params:
+            self.add_defs(effect)
+            path_effect_str = elem.get("data-path-effect", "")
+            if path_effect_str:
+                elem.set(
+                    "data-path-effect",
+                    f"{path_effect_str};{self.ids.get_id(effect, 1)}",
+                )
+            else:
+                elem.set("data-path-effect", self.ids.get_id(effect, 1))
+                elem.set("data-original-d", str(elem.path))
+        elem.set("d", d)
+
     @staticmethod
     def update_lpe(*paths: inkex.ShapeElement):
         """Strip original path to generate LPE path, if `path` has LPE."""
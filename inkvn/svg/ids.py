@@ -0,0 +1,56 @@
+"""
+inkvn Id Allocator
+
+Ids of the defs created while converting, counted per prefix
+instead of the random ids of inkex, so the output is the same on every run.
+"""
+
+from typing import Container, Dict, Set
+
+import inkex
+from inkex.utils import FragmentError
+
+
+class IdAllocator:
+    """
+    Counter based ids, "linearGradient1", "linearGradient2", "filter1"...
+
+    Ids in the document of the element and reserved ids are skipped,
+    each counter continues after its last id.
+    """
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        self.reserved: Set[str] = set()
+        """ids given by this allocator or reserved by reserve()"""
+
+    def reserve(self, eid: str) -> None:
+        """Never give `eid`, e.g. an id of an element written elsewhere."""
+        self.reserved.add(eid)
+
+    def new_id(self, prefix: str, used: Container[str] = ()) -> str:
+        """Next free id with `prefix`, not in `used` either."""
+        count = self.counters.get(prefix, 0)
+        while True:
+            count += 1
+            eid = f"{prefix}{count}"
+            if eid not in self.reserved and eid not in used:
+                break
+        self.counters[prefix] = count
+        self.reserved.add(eid)
+        return eid
+
+    def get_id(self, elem: inkex.BaseElement, as_url: int = 0) -> str:
+        """
+        inkex get_id() of `elem`, setting a new id prefixed by its tag if needed.
+
+        as_url 1 returns #id, 2 returns url(#id).
+        """
+        if "id" not in elem.attrib:
+            used: Container[str] = ()
+            try:
+                used = elem.root.ids
+            except FragmentError:
+                pass
+            elem.set("id", self.new_id(elem.TAG, used))
+        return elem.get_id(as_url)
@@ -0,0 +1,112 @@
+"""
+inkvn Streaming SVG Writer
+
+Writes the SVG one artboard layer at a time,
+instead of building the whole document before serializing it.
+
+This saves the SVG tree, not the decoded document: CurveReader decodes
+every artboard before the first layer is written, so the peak memory is
+bounded by the decoded document (plus the largest converted layer),
+not by the largest layer alone.
+"""
+
+from typing import IO
+
+import inkex
+import lxml.etree
+
+from ..reader.read import CurveReader
+from ..trace import traced
+from ..utils import remove_blank_text
+from .convert import CurveConverter
+
+
+class CurveStreamConverter(CurveConverter):
+    """
+    CurveConverter writing to a file-like object.
+
+    Only one layer (and the defs it needs) is kept in the tree at a time.
+    Defs are written in a <defs> block before the layer using them,
+    so there can be several <defs> in the output.
+    Ids of written elements stay reserved, ids are generated the same way as convert().
+    Shared defs are cached by id only, so written defs can be freed.
+    """
+
+    def write(
+        self,
+        reader: CurveReader,
+        output: IO[bytes],
+        clip_page: bool = False,
+        pretty_print: bool = True,
+    ) -> None:
+        """Convert `reader` and write the SVG to `output`."""
+        self.pretty_print = pretty_print
+        self.start(reader)
+
+        # pages and guides are small, namedview is written at once
+        for artboard in reader.artboards:
+            self.add_page(artboard)
+            self.add_guides(artboard)
+
+        root = self.document
+        # "svg" prefix is dropped, or lxml writes <svg:svg>
+        nsmap = {k: v for k, v in root.nsmap.items() if k != "svg"}
+
+        # xmlfile doesn't take text outside the root element
+        for previous in reversed(list(root.itersiblings(preceding=True))):
+            output.write(lxml.etree.tostring(previous, with_tail=False) + b"\n")
+
+        with lxml.etree.xmlfile(output) as xf:
+            with xf.element(root.tag, dict(root.attrib), nsmap=nsmap):
+                self.newline(xf)
+                self.write_chunk(xf, root.namedview)
+
+                for artboard in reader.artboards:
+                    root_layer = root.add(inkex.Layer.new(label=artboard.title))
+                    self.load_background(root_layer, artboard, clip_page)
+                    self.flush_defs(xf)
+
+                    with xf.element(root_layer.tag, dict(root_layer.attrib)):
+                        self.newline(xf)
+                        for child in list(root_layer):
+                            self.write_chunk(xf, child)
+
+                        for layer in artboard.layers:
+                            parent = self.load_layer(root_layer, layer)
+                            self.flush_defs(xf)
+                            self.write_chunk(xf, parent)
+                    self.newline(xf)
+
+                    self.forget(root_layer)
+        if pretty_print:
+            output.write(b"\n")
+
+    def newline(self, xf) -> None:
+        if self.pretty_print:
+            xf.write("\n")
+
+    def flush_defs(self, xf) -> None:
+        """Write the current defs in a <defs> block and remove them."""
+        defs = self.document.defs
+        if len(defs) == 0:
+            return
+        with xf.element(defs.tag, dict(defs.attrib)):
+            self.newline(xf)
+            for child in list(defs):
+                self.write_chunk(xf, child)
+        self.newline(xf)
+
+    @traced("serialize", "serialize")
+    def write_chunk(self, xf, elem: inkex.BaseElement) -> None:
+        """Write `elem` and remove it from the tree."""
+        if self.pretty_print:
+            remove_blank_text(elem)
+        xf.write(elem, pretty_print=self.pretty_print)
+        self.forget(elem)
+
+    def forget(self, elem: inkex.BaseElement) -> None:
+        """Remove `elem` from the tree, keeping its ids reserved."""
+        ids = [i for i in (el.get("id") for el in elem.iter()) if i is not None]
+        elem.getparent().remove(elem)
+        for i in ids:
+            self.document.ids.setdefault(i, None)
@@ -0,0 +1,234 @@
+"""
+inkvn Tracer
+
+Records spans of the conversion stages (archive, JSON parsing, decoding,
+converting, defs and serialization) to find where the time goes.
+
+Tracing is off unless a Tracer is active, spans are almost free then.
+Spans can be written as Chrome trace JSON (chrome://tracing, ui.perfetto.dev)
+and summarized in a text table.
+
+    with trace.tracing() as tracer:
+        api.convert(stream)
+    tracer.write_chrome_trace("trace.json")
+    print(tracer.summary())
+
+Artboards decoded in worker processes are not traced, only their total.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+S = TypeVar("S", bound="Span")
+
+
+class Span:
+    """A named interval, its name can be changed until it ends."""
+
+    __slots__ = ("name", "category", "args", "start", "end", "thread")
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]) -> None:
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+        self.end = 0
+        self.thread = 0
+
+    def __enter__(self: S) -> S:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+class _ActiveSpan:
+    """Context manager recording `span` in `tracer`."""
+
+    __slots__ = ("tracer", "span")
+
+    def __init__(self, tracer: "Tracer", span: Span) -> None:
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.span.thread = threading.get_ident()
+        self.span.start = time.perf_counter_ns()
+        return self.span
+
+    def __exit__(self, *exc) -> None:
+        self.span.end = time.perf_counter_ns()
+        self.tracer.spans.append(self.span)
+
+
+class Tracer:
+    """Collects spans, from any thread of this process."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self.origin = time.perf_counter_ns()
+
+    def span(self, name: str, category: str = "", **args) -> _ActiveSpan:
+        return _ActiveSpan(self, Span(name, category, args))
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Spans in the Chrome trace event format, as complete ("X") events."""
+        pid = os.getpid()
+        threads: Dict[int, int] = {}
+        events = []
+        for span in sorted(self.spans, key=lambda s: (s.start, -s.end)):
+            tid = threads.setdefault(span.thread, len(threads))
+            event = {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start - self.origin) / 1e3,
+                "dur": (span.end - span.start) / 1e3,
+                "pid": pid,
+                "tid": tid,
+            }
+            if span.args:
+                event["args"] = {k: str(v) for k, v in span.args.items()}
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, output: Any) -> None:
+        """Write the trace JSON to a path or text stream."""
+        if isinstance(output, str):
+            with open(output, "w") as f:
+                json.dump(self.chrome_trace(), f)
+        else:
+            json.dump(self.chrome_trace(), output)
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Count, total, self and max time (seconds) of spans by name.
+
+        Self time excludes the spans nested inside, in the same thread.
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        by_thread: Dict[int, List[Span]] = {}
+        for span in self.spans:
+            by_thread.setdefault(span.thread, []).append(span)
+
+        for spans in by_thread.values():
+            spans.sort(key=lambda s: (s.start, -s.end))
+            # open spans, with the time of their children
+            stack: List[List] = []
+            for span in spans:
+                _close_spans(stack, totals, span.start)
+                stack.append([span, 0])
+            _close_spans(stack, totals, float("inf"))
+        return totals
+
+    def summary(self, limit: Optional[int] = None) -> str:
+        """Text table of the spans by self time."""
+        rows = sorted(self.totals().items(), key=lambda item: -item[1]["self"])
+        if limit is not None:
+            rows = rows[:limit]
+        width = max([len(name) for name, _ in rows] + [4])
+        lines = [
+            f"{'span':<{width}} {'count':>7} {'total ms':>10} {'self ms':>10} {'max ms':>9}"
+        ]
+        for name, entry in rows:
+            lines.append(
+                f"{name:<{width}} {int(entry['count']):>7}"
+                f" {entry['total'] * 1e3:>10.2f} {entry['self'] * 1e3:>10.2f}"
+                f" {entry['max'] * 1e3:>9.2f}"
+            )
+        return "\n".join(lines)
+
+
+def _close_spans(
+    stack: List[List], totals: Dict[str, Dict[str, float]], until: float
+) -> None:
+    """Add the spans of `stack` ending before `until` to `totals`."""
+    while stack and stack[-1][0].end <= until:
+        span, children = stack.pop()
+        duration = span.end - span.start
+        entry = totals.setdefault(
+            span.name, {"count": 0, "total": 0.0, "self": 0.0, "max": 0.0}
+        )
+        entry["count"] += 1
+        entry["total"] += duration / 1e9
+        entry["self"] += (duration - children) / 1e9
+        entry["max"] = max(entry["max"], duration / 1e9)
+        if stack:
+            stack[-1][1] += duration
+
+
+_NO_SPAN = Span("", "", {})
+"""returned when tracing is off, changes to it are discarded."""
+
+_tracer: Optional[Tracer] = None
+"""the active tracer."""
+
+
+def active() -> bool:
+    """Whether tracing is on, hot paths skip preparing their spans otherwise."""
+    return _tracer is not None
+
+
+def span(name: str, category: str = "", **args):
+    """Context manager recording a span if tracing is on."""
+    if _tracer is None:
+        return _NO_SPAN
+    return _tracer.span(name, category, **args)
+
+
+def traced(name: Optional[str] = None, category: str = "") -> Callable[[F], F]:
+    """Decorator recording each call of the function as a span."""
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(span_name, category):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+@contextlib.contextmanager
+def tracing(tracer: Optional[Tracer] = None) -> Iterator[Tracer]:
+    """Activate `tracer` (a new one by default) inside the block."""
+    global _tracer
+    previous = _tracer
+    active = tracer if tracer is not None else Tracer()
+    _tracer = active
+    try:
+        yield active
+    finally:
+        _tracer = previous
+
+
+@contextlib.contextmanager
+def profiling(
+    trace_file: Optional[str], summary: Optional[IO[str]] = None
+) -> Iterator[Optional[Tracer]]:
+    """
+    Trace the block if `trace_file` is given, then write the Chrome trace there
+    and the summary table to `summary`.
+    """
+    if not trace_file:
+        yield None
+        return
+
+    with tracing() as tracer:
+        try:
+            yield tracer
+        finally:
+            tracer.write_chrome_trace(trace_file)
+            if summary is not None:
+                summary.write(tracer.summary() + "\n")
@@ -3,14 +3,13 @@
 # https://gitlab.com/inkscape/extras/extension-afdesign (GPL2+)
 # https://github.com/mohanson/leb128 (MIT)
 
-import copy
-import datetime
-import plistlib
 from io import BytesIO
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from lxml import etree
 
+from inkvn.trace import traced
+
 
 # from extension-afdesign
 def to_pretty_xml(xml_string: bytes) -> bytes:
@@ -25,6 +24,82 @@ def to_pretty_xml(xml_string: bytes) -> bytes:
     return etree.tostring(element, pretty_print=True)
 
 
+# "\r" is written as &#13;, a character reference is never blank to the parser
+XML_BLANKS = " \t\n"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+
+def _is_literal(text: str) -> bool:
+    """Check if `text` has characters which are not escaped by the serializer."""
+    return any(" " <= c < "\x7f" and c not in "<>&" or c in "\t\n" for c in text)
+
+
+def remove_blank_text(root: etree._Element) -> None:
+    """
+    Remove ignorable whitespace in place.
+
+    Follows the rules libxml2 applies for XMLParser(remove_blank_text=True):
+    blank text before a child element and blank tails are dropped,
+    unless xml:space="preserve" is set, the element starts with text,
+    or plain (unescaped) text has been kept before them.
+    Empty strings are dropped as well, they don't survive serialization.
+    """
+    # space: 1 preserve, 0 default, -1 unspecified
+    stack = [(root, -1)]
+    while stack:
+        elem, space = stack.pop()
+        xml_space = elem.get(XML_SPACE)
+        if xml_space == "preserve":
+            space = 1
+        elif xml_space == "default":
+            space = 0
+
+        # blanks after plain text are kept (libxml2 marks the element as mixed)
+        mixed = space == 1
+
+        children = list(elem)
+        text = elem.text
+        if text is not None:
+            if not text or (children and not mixed and not text.strip(XML_BLANKS)):
+                elem.text = text = None
+            elif space == -1 and _is_literal(text):
+                mixed = True
+
+        for child in children:
+            tail = child.tail
+            if tail is not None:
+                if not tail or (not mixed and not text and not tail.strip(XML_BLANKS)):
+                    child.tail = None
+                elif space == -1 and _is_literal(tail):
+                    mixed = True
+            if isinstance(child.tag, str):
+                stack.append((child, space))
+
+
+def pretty_tostring(root: etree._Element) -> bytes:
+    """
+    Return a pretty xml string of the document of `root`.
+
+    Gives the same result as to_pretty_xml(), without parsing the output again.
+    The whitespace in the tree is modified in place.
+    """
+    remove_blank_text(root)
+    return etree.tostring(etree.ElementTree(root), pretty_print=True)
+
+
+@traced("serialize", "serialize")
+def svg_to_bytes(svg, pretty_print: bool = True) -> bytes:
+    """Convert the SvgDocumentElement to a string.
+
+    This is mostly copied from inkex.elements._svg.SvgDocumentElement.tostring().
+    With `pretty_print`, ignorable whitespace is removed from `svg` in place
+    (see pretty_tostring()), copying a large document would double its memory.
+    """
+    if pretty_print:
+        return pretty_tostring(svg)
+    return svg.tostring()
+
+
 # from leb128
 def _decode_leb128(b: bytearray) -> int:
     """Decode the unsigned leb128 encoded bytearray."""
@@ -51,97 +126,110 @@ def read_varint(r: bytes, offset: int) -> Tuple[int, int]:
 
 
 # from NSKeyedUnArchiver
-def _unserialize(
-    o: dict, serialized: dict, removeClassName: bool, plist_top: bool = True
-):
-    if plist_top:
-        reassembled = copy.deepcopy(o)
-    else:
-        reassembled = o
-
-    finished = False
-    while not finished:
-        finished = True
-
-        cursor = None
-        if isinstance(reassembled, bytes):
-            try:
-                return NSKeyedUnarchiver(reassembled)
-            except:
-                # Not plist data, just plain binary
-                return reassembled
-        elif isinstance(reassembled, dict):
-            cursor = reassembled.keys()
-        elif isinstance(reassembled, list):
-            cursor = range(len(reassembled))
-        else:  # str, int etc
-            print("reassembled is a " + str(type(reassembled)) + ":" + str(reassembled))
-            return reassembled
-
-        for k in cursor:
-            #  print(f"cursor={k}")
-            # UIDs references items in "serialized" ($objects)
-            if isinstance(reassembled[k], plistlib.UID):
-                reassembled[k] = copy.deepcopy(serialized[reassembled[k].data])
-
-                # $null gets replaced by None
-                if str(reassembled[k]) == "$null":
-                    reassembled[k] = None
-
-                finished = False
-
-            elif isinstance(reassembled[k], dict) or isinstance(reassembled[k], list):
-                reassembled[k] = _unserialize(
-                    reassembled[k], serialized, removeClassName, plist_top=False
+class _Unarchiver:
+    """
+    Resolves the UIDs of a keyed archive, each `$objects` entry at most once.
+
+    Entries referenced more than once are shared, and containers are
+    registered before their contents so that cycles resolve to themselves.
+    """
+
+    def __init__(self, objects: list, removeClassName: bool):
+        # plistlib is already imported by NSKeyedUnarchiver
+        import plistlib
+
+        self._UID = plistlib.UID
+        self.objects = objects
+        self.removeClassName = removeClassName
+        self.memo: Dict[int, Any] = {}
+
+    def resolve(self, uid: int) -> Any:
+        """Decoded `$objects[uid]`."""
+        if uid in self.memo:
+            return self.memo[uid]
+
+        entry = self.objects[uid]
+        if isinstance(entry, (dict, list)):
+            return self.container(entry, uid)
+        # $null gets replaced by None
+        result = None if entry == "$null" else entry
+        self.memo[uid] = result
+        return result
+
+    def value(self, value: Any) -> Any:
+        """Decoded UID or inline value."""
+        if isinstance(value, self._UID):
+            return self.resolve(value.data)
+        if isinstance(value, (dict, list)):
+            return self.container(value, None)
+        # strings will remain unchanged.
+        return value
+
+    def class_names(self, entry: dict) -> Optional[list]:
+        """`$classes` of the `$class` of an archived object."""
+        cls = entry.get("$class")
+        if isinstance(cls, self._UID):
+            cls = self.objects[cls.data]
+        if isinstance(cls, dict):
+            return cls.get("$classes")
+        return None
+
+    def container(self, entry: Any, uid: Optional[int]) -> Any:
+        """Decoded list or dict, specialized for common class types."""
+
+        def register(result: Any) -> Any:
+            if uid is not None:
+                self.memo[uid] = result
+            return result
+
+        if isinstance(entry, list):
+            items: list = register([])
+            items.extend(self.value(v) for v in entry)
+            return items
+
+        classes = self.class_names(entry) if "$class" in entry else None
+        if classes is None:
+            result = register({})
+            result.update((k, self.value(v)) for k, v in entry.items())
+            return result
+
+        # Specialized handler for common class types
+        if "NSArray" in classes:
+            return self.container(entry["NS.objects"], uid)
+
+        if any(c in classes for c in ["NSMutableDictionary", "NSDictionary"]):
+            result = register({})
+            keys = [self.value(k) for k in entry["NS.keys"]]
+            result.update(zip(keys, (self.value(v) for v in entry["NS.objects"])))
+            return result
+
+        # scalars can't contain themselves, None stops malformed cycles
+        register(None)
+        if any(c in classes for c in ["NSMutableString", "NSString"]):
+            return register(self.value(entry["NS.string"]))
+
+        if any(c in classes for c in ["NSMutableData", "NSData"]):
+            return register(self.value(entry["NS.data"]))
+
+        if "NSDate" in classes:
+            import datetime
+
+            apple2001reference = datetime.datetime(
+                2001, 1, 1, tzinfo=datetime.timezone.utc
+            )
+            return register(
+                datetime.datetime.fromtimestamp(
+                    self.value(entry["NS.time"]) + apple2001reference.timestamp(),
+                    datetime.timezone.utc,
                 )
+            )
 
-                if (
-                    "$class" in reassembled[k]
-                    and "$classes" in reassembled[k]["$class"]
-                ):
-                    # Specialized handler for common class types
-                    if "NSArray" in reassembled[k]["$class"]["$classes"]:
-                        reassembled[k] = reassembled[k]["NS.objects"]
-
-                    elif any(
-                        c in reassembled[k]["$class"]["$classes"]
-                        for c in ["NSMutableDictionary", "NSDictionary"]
-                    ):
-                        reassembled[k] = dict(
-                            zip(reassembled[k]["NS.keys"], reassembled[k]["NS.objects"])
-                        )
-
-                    elif any(
-                        c in reassembled[k]["$class"]["$classes"]
-                        for c in ["NSMutableString", "NSString"]
-                    ):
-                        reassembled[k] = reassembled[k]["NS.string"]
-
-                    elif any(
-                        c in reassembled[k]["$class"]["$classes"]
-                        for c in ["NSMutableData", "NSData"]
-                    ):
-                        reassembled[k] = reassembled[k]["NS.data"]
-
-                    elif "NSDate" in reassembled[k]["$class"]["$classes"]:
-                        apple2001reference = datetime.datetime(
-                            2001, 1, 1, tzinfo=datetime.timezone.utc
-                        )
-                        reassembled[k] = datetime.datetime.fromtimestamp(
-                            reassembled[k]["NS.time"] + apple2001reference.timestamp(),
-                            datetime.timezone.utc,
-                        )
-                    if removeClassName and isinstance(reassembled[k], dict):
-                        # Remove visual polution
-                        if "$class" in reassembled[k]:  # check if it's there
-                            del reassembled[k]["$class"]
-
-                finished = True
-            else:
-                # strings will remain unchanged.
-                pass
-
-    return reassembled
+        result = register({})
+        for k, v in entry.items():
+            # Remove visual polution
+            if k != "$class" or not self.removeClassName:
+                result[k] = self.value(v)
+        return result
 
 
 def _decode_attrib_info(data: bytes) -> List[Dict]:
@@ -169,6 +257,7 @@ def NSKeyedUnarchiver(plist, removeClassName=True):
     • dict       ⟹ unserialize
     """
     # removed other formats as they are not needed
+    import plistlib
 
     if isinstance(plist, bytes):
         plistdata = plistlib.loads(plist)
@@ -181,8 +270,8 @@ def NSKeyedUnarchiver(plist, removeClassName=True):
         )
 
     if "$top" in plistdata:
-        o = copy.deepcopy(plistdata["$top"])
-        unserialized = _unserialize(o, plistdata["$objects"], removeClassName)
+        unarchiver = _Unarchiver(plistdata["$objects"], removeClassName)
+        unserialized = {k: unarchiver.value(v) for k, v in plistdata["$top"].items()}
     else:
         raise TypeError("Passed object is not an NSKeyedArchiver")
 
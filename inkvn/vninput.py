@@ -8,13 +8,10 @@ description: Linearity Curve / Vectornator file importer for Inkscape
 
 import os
 import sys
+from typing import List, Optional, Tuple, Union
 
 import inkex
 
-from inkvn.reader.read import CurveReader
-from inkvn.svg.convert import CurveConverter
-from inkvn.utils import to_pretty_xml
-
 HERE = os.path.dirname(__file__) or "."
 # This is suggested by https://docs.python-guide.org/writing/structure/.
 sys.path.insert(0, os.path.abspath(os.path.join(HERE, "..")))
@@ -50,23 +47,113 @@ class CurveInput(inkex.InputExtension):
             default=False,
             help="Print project file infos.",
         )
+        pars.add_argument(
+            "--external_images",
+            type=inkex.Boolean,
+            dest="external_images",
+            default=False,
+            help="Write bitmaps as files next to the document instead of embedding them.",
+        )
+        pars.add_argument(
+            "--image_dir",
+            type=str,
+            dest="image_dir",
+            default=None,
+            help="Directory for external bitmaps, defaults to <document name>_images.",
+        )
+        pars.add_argument(
+            "--workers",
+            type=int,
+            dest="workers",
+            default=0,
+            help="Decode artboards in parallel with this many worker processes.",
+        )
+        pars.add_argument(
+            "--artboards",
+            type=str,
+            dest="artboards",
+            default="",
+            help="Comma separated artboards to import, by number (from 1) or title.",
+        )
+        pars.add_argument(
+            "--bake_effects",
+            type=inkex.Boolean,
+            dest="bake_effects",
+            default=False,
+            help="Write PowerStroke and rounded corners as plain paths instead of LPEs.",
+        )
+        pars.add_argument(
+            "--keep_effect_params",
+            type=inkex.Boolean,
+            dest="keep_effect_params",
+            default=False,
+            help="Keep the parameters of baked LPEs in data-path-effect attributes.",
+        )
+        pars.add_argument(
+            "--profile",
+            type=str,
+            dest="profile",
+            default="",
+            help="Write a Chrome trace of the import to this file and print a summary.",
+        )
 
     def load(self, stream):
-        converter = CurveConverter()
-        converter.convert(
-            CurveReader(stream, self.options.debug_info), self.options.clip_page
-        )
-        return self.svg_to_string(converter.doc.getroot())
+        # imported here, so that starting the extension stays cheap
+        from inkvn import trace
+        from inkvn.reader.read import CurveReader
+        from inkvn.svg.convert import CurveConverter
+
+        with trace.profiling(self.options.profile, sys.stderr):
+            image_dir, image_href_base = self.external_image_dir()
+            converter = CurveConverter(
+                image_dir=image_dir,
+                image_href_base=image_href_base,
+                bake_effects=self.options.bake_effects,
+                keep_effect_params=self.options.keep_effect_params,
+            )
+            with CurveReader(
+                stream,
+                self.options.debug_info,
+                self.options.workers,
+                self.artboard_selection(),
+            ) as reader:
+                converter.convert(reader, self.options.clip_page)
+            return self.svg_to_string(converter.doc.getroot())
+
+    def artboard_selection(self) -> Optional[List[Union[int, str]]]:
+        """Parse --artboards, numbers are indices and others are titles."""
+        items = [item.strip() for item in self.options.artboards.split(",")]
+        items = [item for item in items if item]
+        if not items:
+            return None
+        return [int(item) if item.isdigit() else item for item in items]
+
+    def external_image_dir(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Returns the directory for external bitmaps and the base for their hrefs.
+
+        hrefs are relative to the imported document, which is where
+        Inkscape resolves them.
+        """
+        if not self.options.external_images:
+            return None, None
+
+        input_file = self.options.input_file
+        if isinstance(input_file, str):
+            base = os.path.dirname(os.path.abspath(input_file))
+            name = os.path.splitext(os.path.basename(input_file))[0]
+        else:
+            base = os.getcwd()
+            name = "document"
+
+        image_dir = self.options.image_dir or os.path.join(base, f"{name}_images")
+        return image_dir, base
 
     def svg_to_string(self, svg: inkex.SvgDocumentElement) -> bytes:
-        """Convert the SvgDocumentElement to a string.
+        """Convert the SvgDocumentElement to a string, see svg_to_bytes()."""
+        from inkvn.utils import svg_to_bytes
 
-        This is mostly copied from inkex.elements._svg.SvgDocumentElement.tostring().
-        """
-        result = svg.tostring()
-        if self.options.pretty_print:
-            return to_pretty_xml(result)
-        return result
+        return svg_to_bytes(svg, self.options.pretty_print)
 
 
 def main():
@@ -0,0 +1,20 @@
+from typing import Callable
+
+import pytest
+from inkex.base import SvgOutputMixin
+
+from inkvn.svg.convert import CurveConverter
+
+
+@pytest.fixture
+def make_converter() -> Callable[..., CurveConverter]:
+    """Converters with an empty document, arguments go to CurveConverter."""
+
+    def make(**kwargs) -> CurveConverter:
+        converter = CurveConverter(**kwargs)
+        converter.doc = SvgOutputMixin.get_template(width=100, height=100, unit="px")
+        converter.document = converter.doc.getroot()
+        converter.has_transform_applied = False
+        return converter
+
+    return make
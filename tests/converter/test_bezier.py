@@ -0,0 +1,92 @@
+import inkex
+import numpy as np
+import pytest
+
+from inkvn.svg.bezier import ArcLengths, round_corners, stroke_outline
+
+CURVE = "M 0 0 C 10 30 40 -20 50 10"
+
+
+def _reference_length(d: str, t: float = 1.0) -> float:
+    """Length of the first curve of `d` until `t`, from dense chords."""
+    p0, p1, p2, p3 = (complex(*point) for point in inkex.Path(d).control_points)
+    u = np.linspace(0, t, 100001)
+    points = (
+        (1 - u) ** 3 * p0
+        + 3 * (1 - u) ** 2 * u * p1
+        + 3 * (1 - u) * u**2 * p2
+        + u**3 * p3
+    )
+    return float(np.abs(np.diff(points)).sum())
+
+
+def test_lengths():
+    """Lines are exact, curves match a dense polyline."""
+    arc_lengths = ArcLengths(inkex.Path(f"{CURVE} L 50 20 Z"))
+    assert arc_lengths.lengths[0] == 0
+    assert arc_lengths.lengths[1] == pytest.approx(_reference_length(CURVE), abs=1e-6)
+    assert arc_lengths.lengths[2] == 10
+    assert arc_lengths.lengths[3] == pytest.approx(abs(50 + 20j))
+    assert arc_lengths.total == pytest.approx(arc_lengths.lengths.sum())
+
+
+def test_locate():
+    """Arc lengths are found on the first command reaching them."""
+    arc_lengths = ArcLengths(inkex.Path(f"{CURVE} L 50 10 L 50 20"))
+    curve = arc_lengths.lengths[1]
+    index, times = arc_lengths.locate(
+        np.array([0, _reference_length(CURVE, 0.3), curve, curve + 5])
+    )
+    # the zero length line isn't reached before the curve ends
+    assert index.tolist() == [1, 1, 1, 3]
+    assert times == pytest.approx([0, 0.3, 1, 0.5], abs=1e-6)
+
+
+def test_degenerate():
+    """Zero length commands don't divide by zero."""
+    index, times = ArcLengths(inkex.Path("M 0 0 L 0 0 C 0 0 0 0 0 0")).locate(
+        np.array([0.0])
+    )
+    assert index.tolist() == [1]
+    assert times.tolist() == [0.0]
+
+
+def test_round_corners():
+    """Fillets of the given radii, open ends are kept sharp."""
+    square = inkex.Path("M 0 0 L 100 0 L 100 100 L 0 100 L 0 0 Z")
+    assert round_corners(square, [10, 20, 0, 0, 10]) == (
+        "M 10 0 L 80 0 C 91.0457 0 100 8.95431 100 20 L 100 100 L 0 100 "
+        "L 0 10 C 0 4.47715 4.47715 0 10 0 Z"
+    )
+    assert round_corners(inkex.Path("M 0 0 L 100 0 L 100 100"), [5, 20, 5]) == (
+        "M 0 0 L 80 0 C 91.0457 0 100 8.95431 100 20 L 100 100"
+    )
+    # segments shared by two fillets are split between them
+    triangle = round_corners(inkex.Path("M 0 0 L 10 0 L 10 10 Z"), [50, 50, 50])
+    assert triangle.startswith("M 5 0 C 7.76142 0 10 2.23858 10 5 C")
+
+
+def test_stroke_outline():
+    """Sides at the width from the path, round caps, two loops if closed."""
+    line = ArcLengths(inkex.Path("M 0 0 L 100 0"))
+    outline = inkex.Path(
+        stroke_outline([(line, np.array([-1.0, 0.0]))], [(0, 5)], 0.22)
+    )
+    box = outline.bounding_box()
+    assert (box.left, box.right, box.top, box.bottom) == pytest.approx((-5, 105, -5, 5))
+    assert str(outline).count("Z") == 1
+
+    # widths from 2 to 6 along the line, interpolated with flat ends
+    widths = [(0, 2), (1, 6)]
+    outline = inkex.Path(stroke_outline([(line, np.array([-1.0, 0.0]))], widths, 0.22))
+    ends = [complex(*point) for point in outline.end_points]
+    assert 0 + 2j in [pytest.approx(point) for point in ends]
+    assert 100 + 6j in [pytest.approx(point) for point in ends]
+    assert outline.bounding_box().bottom == pytest.approx(6)
+
+    square = ArcLengths(inkex.Path("M 0 0 L 10 0 L 10 10 L 0 10 Z"))
+    visible = np.array([-1.0, 0.0, 1.0, 2.0, 3.0])
+    outline = inkex.Path(stroke_outline([(square, visible)], [(0, 1)], 0.22))
+    assert str(outline).count("Z") == 2
+    box = outline.bounding_box()
+    assert (box.left, box.right, box.top, box.bottom) == pytest.approx((-1, 11, -1, 11))
@@ -0,0 +1,45 @@
+import os
+
+import inkex
+import pytest
+
+from inkvn.reader.read import CurveReader
+from inkvn.svg.convert import CurveConverter
+
+DATA = os.path.join(os.path.dirname(__file__), "data")
+
+
+def _convert(name: str, **options) -> inkex.SvgDocumentElement:
+    converter = CurveConverter(**options)
+    with open(os.path.join(DATA, name), "rb") as stream:
+        converter.convert(CurveReader(stream, False))
+    return converter.document
+
+
+@pytest.mark.parametrize("name", ["brush_51.curve", "variousshapes_51.curve"])
+def test_bake_effects(name):
+    """Baked LPEs are plain paths, their parameters are kept on request."""
+    live = _convert(name)
+    effects = live.xpath("//inkscape:path-effect")
+    assert effects
+
+    baked = _convert(name, bake_effects=True)
+    assert not baked.xpath("//inkscape:path-effect | //*[@inkscape:path-effect]")
+    assert all(path.get("d") for path in baked.xpath("//svg:path"))
+
+    kept = _convert(name, bake_effects=True, keep_effect_params=True)
+    assert len(kept.xpath("//inkscape:path-effect")) == len(effects)
+    for path in kept.xpath("//svg:path[@data-path-effect]"):
+        assert path.get("d") and path.get("data-original-d")
+        for effect_id in path.get("data-path-effect").split(";"):
+            assert kept.getElementById(effect_id[1:]) is not None
+
+
+def test_kept_power_stroke_params():
+    """Kept PowerStroke parameters are those of the live LPE, after rounded corners."""
+    query = "//inkscape:path-effect[@effect='powerstroke']"
+    live = _convert("brush_51.curve").xpath(query)
+    kept = _convert("brush_51.curve", bake_effects=True, keep_effect_params=True)
+    assert [e.get("offset_points") for e in kept.xpath(query)] == [
+        e.get("offset_points") for e in live
+    ]
@@ -0,0 +1,37 @@
+import os
+
+import inkex
+from inkex.base import SvgOutputMixin
+
+from inkvn.api import convert
+from inkvn.svg.ids import IdAllocator
+
+DATA = os.path.join(os.path.dirname(__file__), "data")
+
+
+def test_counters():
+    """Ids count per prefix and skip ids of the document and reserved ones."""
+    document = SvgOutputMixin.get_template(width=1, height=1, unit="px").getroot()
+    document.defs.add(inkex.LinearGradient(id="linearGradient2"))
+    ids = IdAllocator()
+    ids.reserve("filter1")
+
+    gradients = [document.defs.add(inkex.LinearGradient()) for _ in range(3)]
+    assert [ids.get_id(g) for g in gradients] == [
+        "linearGradient1",
+        "linearGradient3",
+        "linearGradient4",
+    ]
+    assert ids.get_id(inkex.Filter(), 2) == "url(#filter2)"
+    # existing ids are kept
+    assert ids.get_id(gradients[0], 1) == "#linearGradient1"
+
+
+def test_deterministic_output():
+    """Conversions give the same bytes, without seeding random."""
+    outputs = []
+    for _ in range(2):
+        with open(os.path.join(DATA, "brush_51.curve"), "rb") as stream:
+            outputs.append(convert(stream))
+    assert outputs[0] == outputs[1]
+    assert b'id="path-effect1"' in outputs[0]
@@ -0,0 +1,93 @@
+import io
+
+import inkex
+import pytest
+from PIL import Image
+
+from inkvn.elements.image import VNImageData, VNImageElement
+
+
+def _png_bytes(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _image_element(name: str, image_data: VNImageData) -> VNImageElement:
+    image_data.references += 1
+    return VNImageElement(
+        name=name,
+        blur=0.0,
+        opacity=1.0,
+        blendMode=0,
+        isHidden=False,
+        isLocked=False,
+        localTransform=None,
+        imageData=image_data,
+        transform=[1, 0, 0, 1, 10, 20],
+        cropRect=None,
+    )
+
+
+def test_image_data_header():
+    """Format and dimension are read from the header."""
+    data = _png_bytes(3, 2)
+    image_data = VNImageData("a.dat", lambda: io.BytesIO(data))
+
+    assert image_data.format == "png"
+    assert image_data.dimension == (3, 2)
+
+
+def test_shared_images_are_defined_once(make_converter):
+    """Repeated bitmaps are embedded once in defs and referenced by <use>."""
+    data = _png_bytes(3, 2)
+    image_data = VNImageData("a.dat", lambda: io.BytesIO(data))
+    elements = [_image_element(f"logo{i}", image_data) for i in range(3)]
+
+    converter = make_converter()
+    converted = [converter.convert_image(element) for element in elements]
+
+    shared = converter.document.defs.findall(inkex.addNS("image", "svg"))
+    assert len(shared) == 1
+    assert all(isinstance(elem, inkex.Use) for elem in converted)
+    assert {elem.get("xlink:href") for elem in converted} == {shared[0].get_id(1)}
+    assert str(converted[0].transform) == "translate(10, 20)"
+
+
+def test_single_image_is_inlined(make_converter):
+    """Bitmaps used once stay as plain <image>."""
+    data = _png_bytes(3, 2)
+    image_data = VNImageData("a.dat", lambda: io.BytesIO(data))
+
+    image = make_converter().convert_image(_image_element("photo", image_data))
+
+    assert isinstance(image, inkex.Image)
+    assert image.get("xlink:href").startswith("data:image/png;base64,")
+    assert image.get("width") == "3"
+
+
+@pytest.mark.parametrize(
+    "names, hrefs",
+    [
+        (["dir/a.dat"], ["doc_images/a.png"]),
+        # the same name in different directories is kept apart
+        (["dir/a.dat", "other/a.dat"], ["doc_images/a.png", "doc_images/a-2.png"]),
+    ],
+)
+def test_external_images(tmp_path, make_converter, names, hrefs):
+    """Bitmaps are written next to the document and linked by relative href."""
+    datas = [_png_bytes(3 + i, 2) for i in range(len(names))]
+    images = [
+        VNImageData(name, lambda data=data: io.BytesIO(data))
+        for name, data in zip(names, datas)
+    ]
+
+    converter = make_converter(image_dir=str(tmp_path / "doc_images"))
+    converted = [
+        converter.convert_image(_image_element(f"photo{i}", image))
+        for i, image in enumerate(images)
+    ]
+
+    assert [image.get("xlink:href") for image in converted] == hrefs
+    for href, data in zip(hrefs, datas):
+        assert (tmp_path / href).read_bytes() == data
@@ -0,0 +1,45 @@
+import inkex
+
+from benchmarks.builder import hsba
+from inkvn.elements.styles import VNGradient
+
+
+def _gradient(hue: float, x: float) -> VNGradient:
+    stops = [{"color": hsba(hue), "ratio": 0}, {"color": hsba(0, 0, 0), "ratio": 1}]
+    transform = {"start": [x, 0], "end": [x + 10, 0], "secondaryEnd": [x, 10]}
+    return VNGradient(transform, None, stops, 0)
+
+
+def test_shared_gradients(make_converter):
+    """Equal stops and positions are defined once."""
+    converter = make_converter()
+    paths = [converter.document.add(inkex.PathElement()) for _ in range(5)]
+    converter.set_fill_grad_styles(paths[0], _gradient(0.5, 0))
+    converter.set_fill_grad_styles(paths[1], _gradient(0.5, 0))
+    # same stops, other position or transform
+    converter.set_fill_grad_styles(paths[2], _gradient(0.5, 5))
+    converter.set_fill_grad_styles(
+        paths[3], _gradient(0.5, 0), inkex.Transform(scale=2)
+    )
+    # other stops
+    converter.set_fill_grad_styles(paths[4], _gradient(0.25, 0))
+
+    fills = [path.style("fill") for path in paths]
+    assert fills[0].get_id() == fills[1].get_id()
+    assert len({fill.get_id() for fill in fills}) == 4
+
+    stops = {fill.href.get_id() for fill in fills}
+    assert len(stops) == 2
+    assert len(converter.document.defs) == 6
+
+
+def test_shared_filters(make_converter):
+    """Blurs with the same radius share their filter."""
+    converter = make_converter()
+    paths = [converter.document.add(inkex.PathElement()) for _ in range(3)]
+    for path, radius in zip(paths, [1.5, 1.5, 3]):
+        converter.set_blur(path, inkex.Filter.GaussianBlur.new(stdDeviation=radius))
+
+    filters = [path.style.get("filter") for path in paths]
+    assert filters[0] == filters[1] != filters[2]
+    assert len(converter.document.defs) == 2
@@ -0,0 +1,56 @@
+import io
+import os
+import re
+
+import pytest
+from lxml import etree
+
+from inkvn.api import convert, convert_to
+from inkvn.reader.read import CurveReader
+from inkvn.svg.stream import CurveStreamConverter
+
+DATA = os.path.join(os.path.dirname(__file__), "data")
+
+
+def _convert_both(name: str):
+    with open(os.path.join(DATA, name), "rb") as stream:
+        tree = convert(stream)
+
+    output = io.BytesIO()
+    with open(os.path.join(DATA, name), "rb") as stream:
+        convert_to(stream, output)
+    return etree.fromstring(tree), etree.fromstring(output.getvalue())
+
+
+@pytest.mark.parametrize(
+    "name", ["artboards_and_guides_51.curve", "blur_51.curve", "gradient.vectornator"]
+)
+def test_stream_matches_tree(name):
+    """Streamed SVG has the same elements and ids as the tree output."""
+    tree, streamed = _convert_both(name)
+
+    assert sorted(tree.xpath("//@id")) == sorted(streamed.xpath("//@id"))
+    defs = "{http://www.w3.org/2000/svg}defs"
+    assert sorted(el.tag for el in tree.iter() if el.tag != defs) == sorted(
+        el.tag for el in streamed.iter() if el.tag != defs
+    )
+
+    # every reference resolves to an element written somewhere in the stream
+    ids = set(streamed.xpath("//@id"))
+    refs = re.findall(r"url\(#([\w-]+)\)", etree.tostring(streamed).decode())
+    refs += [href[1:] for href in streamed.xpath("//@*[local-name()='href']")]
+    assert refs
+    for ref in refs:
+        assert ref in ids
+
+
+def test_written_defs_are_dropped():
+    """Shared defs are cached by id, nothing written stays in the tree."""
+    converter = CurveStreamConverter()
+    with open(os.path.join(DATA, "gradient_51.curve"), "rb") as stream:
+        converter.write(CurveReader(stream, False), io.BytesIO())
+
+    assert converter.shared_defs
+    assert all(isinstance(i, str) for i in converter.shared_defs.values())
+    assert len(converter.document.defs) == 0
+    assert len(converter.document.xpath("//svg:g")) == 0
@@ -0,0 +1,105 @@
+import io
+import json
+import random
+import zipfile
+
+from benchmarks.builder import ArtboardBuilder
+from inkvn.elements.path import VNPathElement
+from inkvn.reader.decode import CurveDecoder
+from inkvn.reader.read import CurveReader
+from inkvn.svg.convert import CurveConverter
+
+
+def _decoder(gid_json: dict, is_curve: bool = True, file_version: int = 44):
+    artboard = {"title": "A", "frame": {"width": 1, "height": 1, "x": 0, "y": 0}}
+    if is_curve:
+        gid_json = dict(gid_json, artboards=[artboard])
+    else:
+        gid_json = dict(artboard, **gid_json)
+    return CurveDecoder(None, gid_json, is_curve, file_version)  # type: ignore
+
+
+def test_get_child_curve():
+    decoder = _decoder(
+        {
+            "elements": [{"name": "a"}, {"name": "b"}],
+            "localTransforms": [{"rotation": 1}],
+            "strokeStyles": [{"width": 2}],
+            "stylables": [{"mask": 1}],
+            "abstractPaths": [{"fillId": 0}],
+        }
+    )
+    assert decoder.get_child({"elementIds": [1, 0]}, "elements", True) == [
+        {"name": "b"},
+        {"name": "a"},
+    ]
+    assert decoder.get_child({"localTransformId": 0}, "localTransform", True) == {
+        "rotation": 1
+    }
+    # second candidate list of strokeStyle
+    assert decoder.get_child({"strokeStyleId": 0}, "strokeStyle", True) == {"width": 2}
+    # subElement by key, or by the id of the mapping
+    element = {"subElement": {"stylable": {"_0": 0}}}
+    assert decoder.get_child(element, "stylable", True) == {"mask": 1}
+    assert decoder.get_child({"subElement": 0}, "abstractPath", True) == {"fillId": 0}
+    # missing lists and ids
+    assert decoder.get_child({"fillId": 0}, "fill", True) is None
+    assert decoder.get_child({}, "elements", True) is None
+    # out of range ids are logged
+    assert decoder.get_child({"elementIds": [5]}, "elements", True) is None
+
+
+def test_get_child_vectornator():
+    decoder = _decoder({}, is_curve=False, file_version=19)
+    assert decoder.get_child({"fill": {"color": 1}}, "fill") == {"color": 1}
+    assert decoder.get_child({"subElement": {"group": {"_0": 3}}}, "group") == 3
+    # format 19, singleStyle subElement is the abstractPath
+    sub = {"pathData": {}}
+    assert decoder.get_child({"subElement": sub}, "abstractPath") == sub
+
+
+def _shared_gradient_document() -> bytes:
+    """Two paths with the same gradient, stroke and transform."""
+    builder = ArtboardBuilder(51, random.Random(0))
+    fill = builder.gradient_fill(0, 0)
+    transform = builder.transform(10, 10)
+    element_ids = [
+        builder.stylable(
+            name, transform, builder.path(builder.geometry(0, 0, 4), fill, None)
+        )
+        for name in ("a", "b")
+    ]
+    builder.artboard("A", 100, 100, [builder.layer("Layer", element_ids)])
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as archive:
+        archive.writestr("Manifest.json", json.dumps({"fileFormatVersion": 51}))
+        document = {
+            "appVersion": "6.1.0",
+            "drawing": {"artboardPaths": ["A.json"], "settings": {"units": "Pixels"}},
+        }
+        archive.writestr("Document.json", json.dumps(document))
+        archive.writestr("A.json", json.dumps(builder.lists))
+    return output.getvalue()
+
+
+def test_shared_styles():
+    """Shared entries are decoded once, and converted to shared gradients."""
+    reader = CurveReader(io.BytesIO(_shared_gradient_document()), False)
+    first, second = reader.artboards[0].layers[0].elements
+    assert isinstance(first, VNPathElement) and isinstance(second, VNPathElement)
+    assert first.fillGradient is second.fillGradient
+    assert first.strokeStyle is second.strokeStyle
+    assert first.localTransform is second.localTransform
+
+    converter = CurveConverter()
+    converter.convert(reader)
+    svg = converter.document
+    assert len(svg.xpath("//svg:linearGradient | //svg:radialGradient")) == 2
+    fills = {path.style("fill") for path in svg.xpath("//svg:path[@inkscape:label]")}
+    assert len(fills) == 1
+
+    # the decoded gradient is left as it was
+    assert first.fillGradient is not None
+    assert first.fillGradient.gradient.getparent() is None
+    assert first.fillGradient.gradient.get("gradientTransform") is None
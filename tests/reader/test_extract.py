@@ -4,7 +4,7 @@ import zipfile
 
 import pytest
 
-from inkvn.reader.extract import read_json_from_zip
+from inkvn.reader.extract import ArchiveIndex, read_json_from_zip
 
 
 @pytest.fixture
@@ -54,3 +54,28 @@ def test_read_json_from_nested_zip(nested_zip_with_json):
         data = read_json_from_zip(archive, "nested.json")
 
     assert data == {"nested": "data"}
+
+
+def test_archive_index_lookups(nested_zip_with_json):
+    """Test ArchiveIndex lookups in embedded archives."""
+    with zipfile.ZipFile(nested_zip_with_json, "r") as archive:
+        index = ArchiveIndex(archive)
+
+        assert "nested.json" in index
+        assert "missing.json" not in index
+        assert read_json_from_zip(index, "nested.json") == {"nested": "data"}
+        # embedded archive is opened only once
+        assert index.nested is index.nested
+
+        with pytest.raises(FileNotFoundError):
+            index.open("missing.json")
+
+
+def test_archive_index_close(nested_zip_with_json):
+    """Closing the index closes the embedded archives with it."""
+    with ArchiveIndex(zipfile.ZipFile(nested_zip_with_json, "r")) as index:
+        nested = index.nested[0].archive
+        assert nested.fp is not None
+
+    assert nested.fp is None
+    assert index.archive.fp is None
@@ -0,0 +1,86 @@
+import concurrent.futures
+import io
+import os
+
+import pytest
+
+import inkvn.reader.extract as ext
+from inkvn.api import convert
+from inkvn.reader.read import CurveReader, artboard_title, parse_version
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "converter", "data")
+
+
+def _convert(name: str, workers: int) -> bytes:
+    with open(os.path.join(DATA, name), "rb") as stream:
+        return convert(stream, workers=workers)
+
+
+@pytest.mark.parametrize(
+    "name", ["artboards_and_guides_51.curve", "artboards_and_guides.vectornator"]
+)
+def test_parallel_matches_serial(name):
+    """Artboards decoded by worker processes give the same document."""
+    assert _convert(name, workers=2) == _convert(name, workers=0)
+
+
+def test_thread_fallback(monkeypatch):
+    """Threads are used when worker processes can't be started."""
+
+    def no_processes(*args, **kwargs):
+        raise NotImplementedError("no processes")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_processes)
+    with open(os.path.join(DATA, "artboards_and_guides_51.curve"), "rb") as stream:
+        data = io.BytesIO(stream.read())
+
+    serial = [a.title for a in CurveReader(data, False).artboards]
+    data.seek(0)
+    parallel = [a.title for a in CurveReader(data, False, workers=3).artboards]
+    assert parallel == serial
+
+
+@pytest.mark.parametrize(
+    "name", ["artboards_and_guides_51.curve", "artboards_and_guides.vectornator"]
+)
+def test_artboard_selection(name):
+    """Artboards are selected by index or title, in document order."""
+    with open(os.path.join(DATA, name), "rb") as stream:
+        reader = CurveReader(stream, False, artboards=["Texts", 2])
+        assert [a.title for a in reader.artboards] == ["VariousShapes", "Texts"]
+
+
+def test_selected_artboards_are_parsed_once(monkeypatch):
+    """GUID JSONs read to find titles are not parsed again to decode them."""
+    parsed = []
+    extract_gid_json = ext.extract_gid_json
+
+    def counting(archive, artboard_path):
+        parsed.append(artboard_path)
+        return extract_gid_json(archive, artboard_path)
+
+    monkeypatch.setattr(ext, "extract_gid_json", counting)
+    with open(os.path.join(DATA, "artboards_and_guides_51.curve"), "rb") as stream:
+        reader = CurveReader(stream, False, artboards=["Texts"])
+
+    assert [a.title for a in reader.artboards] == ["Texts"]
+    assert len(parsed) == len(set(parsed)) == len(reader.artboard_paths)
+
+
+def test_check_if_curve():
+    """Curve is 5.1.0 and later, invalid versions are Vectornator."""
+    assert parse_version("5.1") == (5, 1, 0)
+    assert parse_version("5.19.0 (1234)") == (5, 19, 0)
+    assert CurveReader.check_if_curve("6.1.0")
+    assert CurveReader.check_if_curve("5.10")
+    assert not CurveReader.check_if_curve("5.0.9")
+    assert not CurveReader.check_if_curve("4.13.4")
+    assert not CurveReader.check_if_curve("unknown")
+
+
+def test_artboard_title():
+    """Artboards without a title are named by their position."""
+    assert artboard_title({"artboards": [{"title": "Cover"}]}, True, 1) == "Cover"
+    assert artboard_title({"title": "Cover"}, False, 1) == "Cover"
+    assert artboard_title({"artboards": [{}]}, True, 2) == "Artboard 2"
+    assert artboard_title({}, False, 3) == "Artboard 3"
@@ -358,3 +358,27 @@ def test_decode_old_text():
     data = decode_old_text(ENCODED_OLD_TEXT)
 
     assert data == DECODED_OLD_TEXT
+
+
+def test_decode_new_text_propagation():
+    """Missing values come from the next run, without leaking into it."""
+    data = decode_new_text(
+        {
+            "fontSize": {"values": [{"upperBound": 8, "value": 10}]},
+            "strokeStyle": {
+                "color": {"values": [{"upperBound": 5, "value": "a"}]},
+                "width": {
+                    "values": [
+                        {"upperBound": 3, "value": 1.0},
+                        {"upperBound": 8, "value": 3.0},
+                    ]
+                },
+            },
+        }
+    )
+
+    assert data == [
+        {"strokeStyle": {"width": 1.0, "color": "a"}, "length": 3, "fontSize": 10},
+        {"strokeStyle": {"color": "a", "width": 3.0}, "length": 2, "fontSize": 10},
+        {"strokeStyle": {"width": 3.0}, "length": 3, "fontSize": 10},
+    ]
@@ -0,0 +1,75 @@
+import json
+import os
+
+import inkvn.batch
+from inkvn.batch import find_documents, main, output_paths
+
+DATA = os.path.join(os.path.dirname(__file__), "converter", "data")
+
+
+def test_batch_report(tmp_path):
+    """Each file gets a report entry, failures don't stop the batch."""
+    report_file = tmp_path / "report.json"
+    missing = str(tmp_path / "missing.curve")
+    status = main(
+        [
+            "-j",
+            "2",
+            "-o",
+            str(tmp_path),
+            "--report",
+            str(report_file),
+            os.path.join(DATA, "blur_51.curve"),
+            missing,
+        ]
+    )
+    assert status == 1
+
+    report = json.loads(report_file.read_text())
+    assert report["summary"]["files"] == 2
+    ok, failed = report["files"]
+
+    assert ok["error"] is None
+    assert set(ok["times"]) == {"read", "decode", "convert", "serialize", "total"}
+    assert ok["counts"]["artboards"] == 1
+    assert os.path.isfile(tmp_path / "blur_51.svg")
+
+    assert failed["error"]["type"] == "FileNotFoundError"
+    assert failed["error"]["stage"] == "read"
+
+
+def test_output_paths(tmp_path):
+    """Searched directories are mirrored, outputs of the same name get a suffix."""
+    for name in ["a/x.curve", "a/x.vectornator", "b/x.curve", "b/c/y.curve"]:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).touch()
+    documents = list(find_documents([str(tmp_path), str(tmp_path / "a" / "x.curve")]))
+
+    assert output_paths(documents, "out") == [
+        os.path.join("out", "a", "x.svg"),
+        os.path.join("out", "a", "x-2.svg"),
+        os.path.join("out", "b", "x.svg"),
+        os.path.join("out", "b", "c", "y.svg"),
+        os.path.join("out", "x.svg"),
+    ]
+    assert output_paths(documents, None)[:2] == [
+        str(tmp_path / "a" / "x.svg"),
+        str(tmp_path / "a" / "x-2.svg"),
+    ]
+
+
+def _exit(*args):
+    os._exit(1)
+
+
+def test_worker_failure(tmp_path, monkeypatch):
+    """Files of a worker which died are reported as failed."""
+    monkeypatch.setattr(inkvn.batch, "convert_one", _exit)
+    report_file = tmp_path / "report.json"
+    path = os.path.join(DATA, "blur_51.curve")
+    assert main(["-o", str(tmp_path), "--report", str(report_file), path]) == 1
+
+    (failed,) = json.loads(report_file.read_text())["files"]
+    assert failed["input"] == path
+    assert failed["error"]["stage"] == "worker"
+    assert failed["error"]["type"] == "BrokenProcessPool"
@@ -0,0 +1,44 @@
+import pytest
+
+from benchmarks.generate import main
+from inkvn.elements.group import VNGroupElement
+from inkvn.elements.image import VNImageElement
+from inkvn.elements.path import VNPathElement
+from inkvn.elements.text import VNTextElement
+from inkvn.reader.read import CurveReader
+
+
+@pytest.mark.parametrize("file_version", [44, 51])
+def test_generated_document(tmp_path, file_version):
+    """Generated documents decode to the requested elements."""
+    output = str(tmp_path / "generated.curve")
+    args = ["--format", str(file_version), "--artboards", "2", "--layers", "2"]
+    args += ["--group-depth", "2", "--paths", "3", "--nodes", "5", "--gradients", "1"]
+    args += ["--brushes", "1", "--texts", "1", "--text-runs", "4", "--images", "2"]
+    main(args + [output])
+
+    with open(output, "rb") as stream:
+        reader = CurveReader(stream, False)
+    assert reader.file_version == file_version
+    assert len(reader.artboards) == 2
+
+    for artboard in reader.artboards:
+        assert len(artboard.layers) == 2
+        assert len(artboard.guides) == 1
+        elements = list(artboard.iter_elements())
+        kinds = [type(element) for element in elements]
+        assert kinds.count(VNGroupElement) == 4
+        assert kinds.count(VNPathElement) == 10
+        assert kinds.count(VNTextElement) == 2
+        assert kinds.count(VNImageElement) == 4
+
+        paths = [e for e in elements if isinstance(e, VNPathElement)]
+        assert sum(1 for p in paths if p.fillGradient is not None) == 2
+        assert sum(1 for p in paths if p.brushProfile is not None) == 2
+        # move, 5 segments back to the start and close
+        assert all(len(p.pathGeometries[0].path) == 7 for p in paths)
+        texts = [e for e in elements if isinstance(e, VNTextElement)]
+        assert all(len(t.styledText) == 4 for t in texts)
+
+    # one bitmap shared by all images
+    assert len(reader.images) == 1
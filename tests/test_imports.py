@@ -0,0 +1,15 @@
+import subprocess
+import sys
+
+
+def test_lazy_imports():
+    """Starting the extension doesn't import the converter or rarely used modules."""
+    code = (
+        "import sys, inkvn.vninput;"
+        "print(' '.join(m for m in ('PIL', 'packaging', 'plistlib', 'multiprocessing',"
+        " 'inkvn.reader.read', 'inkvn.svg.convert') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+from lxml import etree
+
+from inkvn.vninput import CurveInput
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+INX = "{http://www.inkscape.org/namespace/inkscape/extension}"
+
+
+@pytest.mark.parametrize("inx_file", ["inkvn.inx", "inkvn-curve.inx"])
+def test_inx_params(inx_file):
+    """Params are options of the extension, and default to its defaults."""
+    root = etree.parse(os.path.join(ROOT, inx_file)).getroot()
+    params = {param.get("name"): param.text or "" for param in root.iter(INX + "param")}
+    for name in ["artboards", "external_images", "image_dir", "workers"]:
+        assert name in params
+    assert "bake_effects" in params and "keep_effect_params" in params
+
+    # Inkscape passes every param as --name=value
+    parser = CurveInput().arg_parser
+    options = parser.parse_args([f"--{name}={value}" for name, value in params.items()])
+    defaults = parser.parse_args([])
+    # Inkscape reads the SVG again, it doesn't need to be pretty
+    del params["pretty"]
+    for name in params:
+        # empty strings stand for None
+        assert (getattr(options, name) or None) == (getattr(defaults, name) or None)
@@ -0,0 +1,63 @@
+import copy
+import pickle
+
+import pytest
+
+from inkvn.elements import path as path_module
+from inkvn.elements.path import pathGeometry
+
+
+def _node(anchor, in_point=None, out_point=None, disconnected=False):
+    node = {
+        "anchorPoint": anchor,
+        "inPoint": in_point or anchor,
+        "outPoint": out_point or anchor,
+        "cornerRadius": 2.0,
+    }
+    if disconnected:
+        node["nodeType"] = {"disconnected": {}}
+    return node
+
+
+NODES = [
+    _node([0, 0], disconnected=True),
+    _node([10, -0.0], out_point=[10, 5]),
+    _node([10, 10], in_point=[12, 8], disconnected=True),
+    # handles within the tolerance of the anchor
+    _node([0, 10], in_point=[1e-9, 10], out_point=[0, 10.00001]),
+]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_path_geometry(monkeypatch, use_numpy):
+    """Lines and curves from the node arrays, with or without numpy."""
+    if not use_numpy:
+        monkeypatch.setattr(path_module, "np", None)
+    nodes = copy.deepcopy(NODES)
+
+    geometry = pathGeometry(True, nodes)
+    expected = "M 0 0 L 10 0 C 10 5 12 8 10 10 L 0 10 L 0 0 Z"
+    assert geometry.d == expected
+    assert str(geometry.path) == expected
+    # the first node closes the path again
+    assert geometry.corner_radius == [2.0, 2.0, 2.0]
+    assert nodes == NODES
+
+    geometry = pathGeometry(False, nodes)
+    assert geometry.d == str(geometry.path) == "M 0 0 L 10 0 C 10 5 12 8 10 10 L 0 10"
+    assert pathGeometry(False, []).d == ""
+
+
+def test_path_geometry_lazy():
+    """Nodes are read on first use, and pickled without the cached values."""
+    nodes = copy.deepcopy(NODES)
+    geometry = pathGeometry(False, nodes)
+    nodes.append({})  # not read yet
+    with pytest.raises(KeyError):
+        _ = geometry.d
+    nodes.pop()
+
+    assert geometry.path is geometry.path
+    copied = pickle.loads(pickle.dumps(geometry))
+    assert "path" not in vars(copied)
+    assert copied.d == str(geometry.path)
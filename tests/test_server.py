@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import socket
+import threading
+
+import pytest
+from lxml import etree
+
+from inkvn.api import convert
+from inkvn.client import (
+    ServerError,
+    proof,
+    read_token,
+    request,
+    split_input_file,
+)
+from inkvn.server import ConversionHandler, make_server
+
+DATA = os.path.join(os.path.dirname(__file__), "converter", "data")
+
+
+@pytest.fixture
+def server_address(tmp_path):
+    address = str(tmp_path / "inkvn.sock")
+    server = make_server(address)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield address
+    server.shutdown()
+    server.server_close()
+
+
+def test_convert_by_path_and_bytes(server_address):
+    """Documents are converted from a path or from bytes, as in this process."""
+    path = os.path.join(DATA, "blur_51.curve")
+    by_path, _ = request(["--pretty=false"], path=path, address=server_address)
+    with open(path, "rb") as f:
+        by_bytes, _ = request(["--pretty=false"], data=f.read(), address=server_address)
+    with open(path, "rb") as f:
+        expected = convert(f, pretty_print=False)
+
+    assert by_path.startswith(b"<!-- Converted by extension-curve -->")
+    assert by_path == by_bytes == expected
+
+
+def test_error_is_reported(server_address):
+    """Errors come with the messages of the failed conversion."""
+    with pytest.raises(ServerError) as error:
+        request(
+            ["--artboards=9"],
+            path=os.path.join(DATA, "blur_51.curve"),
+            address=server_address,
+        )
+    message, messages = error.value.args
+    assert "No artboards" in message
+    assert "artboard 9 is not in the document" in messages
+
+
+def test_socket_must_be_private(server_address):
+    """Sockets writable by other users aren't trusted."""
+    os.chmod(server_address, 0o777)
+    with pytest.raises(PermissionError):
+        request([], path=os.path.join(DATA, "blur_51.curve"), address=server_address)
+
+
+def test_external_images_next_to_document(server_address, tmp_path, monkeypatch):
+    """External bitmaps are written next to the document, not in the server cwd."""
+    path = tmp_path / "doc" / "image_51.curve"
+    path.parent.mkdir()
+    shutil.copy(os.path.join(DATA, "image_51.curve"), path)
+    cwd = tmp_path / "cwd"
+    cwd.mkdir()
+    monkeypatch.chdir(cwd)
+
+    svg, _ = request(["--external_images=true"], path=str(path), address=server_address)
+
+    hrefs = etree.fromstring(svg).xpath("//@*[local-name()='href']")
+    files = [href for href in hrefs if not href.startswith("#")]
+    assert files and all(href.startswith("image_51_images/") for href in files)
+    for href in files:
+        assert (path.parent / href).is_file()
+    assert not os.listdir(cwd)
+
+    # without input path, the server can't tell where to write them
+    with pytest.raises(ServerError):
+        request(
+            ["--external_images=true"], data=path.read_bytes(), address=server_address
+        )
+
+
+def test_tcp_token(tmp_path, monkeypatch):
+    """Client and server of TCP requests prove they know the token."""
+    # handlers forked from this process keep the sockets of the client open,
+    # they see the client leave only when reading times out
+    monkeypatch.setattr(ConversionHandler, "timeout", 1)
+    token_file = str(tmp_path / "token")
+    server = make_server(("127.0.0.1", 0), token_file)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        address = server.server_address[:2]
+        path = os.path.join(DATA, "blur_51.curve")
+        # the server doesn't know this token, nothing is sent to it
+        with pytest.raises(PermissionError):
+            request([], path=path, address=address, token="wrong")
+        assert oct(os.stat(token_file).st_mode & 0o777) == "0o600"
+        svg, _ = request([], path=path, address=address, token=read_token(token_file))
+        assert svg.startswith(b"<!-- Converted by extension-curve -->")
+
+        # a client which doesn't know the token can't convert
+        with socket.create_connection(address) as sock:
+            stream = sock.makefile("rwb")
+            stream.write(b'{"nonce": "n"}\n')
+            stream.flush()
+            reply = json.loads(stream.readline())
+            client_proof = proof("wrong", "client", "n", reply["nonce"])
+            header = {"args": [], "path": path, "proof": client_proof}
+            stream.write(json.dumps(header).encode() + b"\n")
+            stream.flush()
+            response = json.loads(stream.readline())
+        assert response["status"] == "error"
+        assert response["message"] == "invalid token"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_split_input_file():
+    """Only the last argument is the input file, options need their value."""
+    options, input_file = split_input_file(["--pretty=false", "--image_dir=out", "a"])
+    assert options == ["--pretty=false", f"--image_dir={os.path.abspath('out')}"]
+    assert input_file == "a"
+    assert split_input_file(["--pretty=false"]) == (["--pretty=false"], None)
+    with pytest.raises(ValueError):
+        split_input_file(["--artboards", "2", "a.curve"])
@@ -0,0 +1,35 @@
+import json
+import os
+
+from benchmarks.suite import compare, main
+
+DATA = os.path.join(os.path.dirname(__file__), "converter", "data")
+
+
+def _results(**walls: float) -> dict:
+    return {"results": {"a.curve": {s: {"wall": w} for s, w in walls.items()}}}
+
+
+def test_compare():
+    """Slower stages are regressions, fast and unknown stages are skipped."""
+    baseline = _results(read=0.010, decode=0.010, convert=0.0001)
+    results = _results(read=0.0105, decode=0.020, convert=0.001, pretty=1.0)
+
+    assert compare(results, baseline, 0.1, 0.001) == ["a.curve decode: 2.00x slower"]
+    assert compare(results, {"results": {}}, 0.1, 0.001) == []
+
+
+def test_compare_with_saved_baseline(tmp_path):
+    """--compare fails on regressions against a baseline saved with --output."""
+    path = os.path.join(DATA, "blur_51.curve")
+    output = str(tmp_path / "baseline.json")
+    assert main([path, "--repeat=1", f"--output={output}"]) == 0
+    assert main([path, "--repeat=1", f"--compare={output}", "--threshold=100"]) == 0
+
+    with open(output) as f:
+        baseline = json.load(f)
+    for stage in baseline["results"]["blur_51.curve"].values():
+        stage["wall"] /= 1000
+    with open(output, "w") as f:
+        json.dump(baseline, f)
+    assert main([path, "--repeat=1", f"--compare={output}", "--min-time=0"]) == 1
@@ -0,0 +1,60 @@
+import io
+import json
+import os
+
+from inkvn import trace
+from inkvn.api import convert
+
+DATA = os.path.join(os.path.dirname(__file__), "converter", "data")
+
+
+def test_trace_conversion():
+    """Spans of every stage are recorded and exported."""
+    with open(os.path.join(DATA, "brush_51.curve"), "rb") as stream:
+        with trace.tracing() as tracer:
+            convert(stream)
+
+    totals = tracer.totals()
+    for name in [
+        "open archive",
+        "parse json",
+        "decode artboard",
+        "read_element (VNPathElement)",
+        "convert_path",
+        "set_power_stroke",
+        "add_defs",
+        "serialize",
+    ]:
+        assert totals[name]["count"] > 0, name
+
+    output = io.StringIO()
+    tracer.write_chrome_trace(output)
+    events = json.loads(output.getvalue())["traceEvents"]
+    assert len(events) == len(tracer.spans)
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    assert "convert_path" in tracer.summary()
+
+
+def test_self_time():
+    """Self time excludes nested spans."""
+    tracer = trace.Tracer()
+    outer = trace.Span("outer", "", {})
+    outer.start, outer.end = 0, 10_000
+    inner = trace.Span("inner", "", {})
+    inner.start, inner.end = 2_000, 5_000
+    tracer.spans = [inner, outer]
+
+    totals = tracer.totals()
+    assert totals["outer"]["total"] * 1e9 == 10_000
+    assert round(totals["outer"]["self"] * 1e9) == 7_000
+    assert round(totals["inner"]["self"] * 1e9) == 3_000
+
+
+def test_tracing_off():
+    assert not trace.active()
+    with trace.span("ignored") as span:
+        span.name = "renamed"
+    with trace.tracing() as tracer:
+        assert trace.active()
+    assert tracer.spans == []
+    assert not trace.active()
@@ -0,0 +1,125 @@
+import datetime
+import plistlib
+
+import pytest
+from lxml import etree
+
+from inkvn.utils import (
+    NSKeyedUnarchiver,
+    _is_literal,
+    pretty_tostring,
+    remove_blank_text,
+    to_pretty_xml,
+)
+
+DOCUMENTS = [
+    b"<!-- comment --><svg>\n    <g><path/>\n  </g>  </svg>",
+    b"<svg><text xml:space='preserve'> <tspan>a</tspan> <tspan> </tspan></text></svg>",
+    b"<svg><g>text<path/>\n  <path/></g><g>&#160;<path/>\n  </g><tspan></tspan></svg>",
+    b"<svg xml:space='default'><g>a<path/>\n  </g></svg>",
+]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_pretty_tostring_matches_reparse(document):
+    """Pretty printing the tree gives the same bytes as re-parsing it."""
+    tree = etree.ElementTree(etree.fromstring(document))
+    expected = to_pretty_xml(etree.tostring(tree))
+
+    assert pretty_tostring(tree.getroot()) == expected
+
+
+def test_is_literal():
+    """Only text written as is by the serializer counts as plain text."""
+    assert _is_literal("a") and _is_literal(" ") and _is_literal("\n\t")
+    # escaped as &lt; &amp; &#13; &#160;
+    assert not _is_literal("<&\r\xa0")
+    assert not _is_literal("")
+
+
+def _element(tag, text=None, tail=None, children=(), space=None):
+    elem = etree.Element(tag)
+    elem.text, elem.tail = text, tail
+    if space is not None:
+        elem.set("{http://www.w3.org/XML/1998/namespace}space", space)
+    elem.extend(children)
+    return elem
+
+
+BLANK_TEXT_TREES = [
+    # mixed content, blanks after plain text are kept
+    lambda: _element(
+        "g", "text", None, [_element("path", tail="\n  "), _element("path")]
+    ),
+    lambda: _element(
+        "g", "\n", None, [_element("path", tail="a\n"), _element("path", tail=" ")]
+    ),
+    lambda: _element("g", "\n  ", None, [_element("path", tail="\n")]),
+    # escaped characters don't make the element mixed, but aren't blank either
+    lambda: _element("g", "\xa0", None, [_element("path", tail="\n  ")]),
+    lambda: _element("g", "\r", None, [_element("path", tail=" ")]),
+    lambda: _element("g", " \r\n", None, [_element("path", tail="\n")]),
+    lambda: _element(
+        "g", None, None, [_element("path", tail="<"), _element("path", tail=" ")]
+    ),
+    # xml:space, inherited and reset
+    lambda: _element(
+        "svg",
+        " ",
+        None,
+        [
+            _element("g", " ", " ", [_element("path", tail=" ")]),
+            _element("g", " ", " ", [_element("path", tail=" ")], space="default"),
+        ],
+        space="preserve",
+    ),
+    lambda: _element("g", "a", None, [_element("path", tail="\n  ")], space="default"),
+    lambda: _element("g", " ", None, [_element("path", tail=" ")], space="bogus"),
+    # comments are children too, empty strings are dropped
+    lambda: _element("g", " ", None, [etree.Comment("c"), _element("path", "", " ")]),
+]
+
+
+@pytest.mark.parametrize("tree", BLANK_TEXT_TREES)
+def test_remove_blank_text(tree):
+    """Whitespace is removed like re-parsing the output with remove_blank_text."""
+    root = tree()
+    parser = etree.XMLParser(remove_blank_text=True)
+    expected = etree.tostring(etree.fromstring(etree.tostring(root), parser))
+
+    remove_blank_text(root)
+    assert etree.tostring(root) == expected
+
+
+def test_unarchiver_shared_and_cyclic():
+    """Shared entries are decoded once, cycles resolve to the same object."""
+    uid = plistlib.UID
+    objects = [
+        "$null",
+        {"$classname": "NSMutableArray", "$classes": ["NSMutableArray", "NSArray"]},
+        {"$classname": "NSDictionary", "$classes": ["NSDictionary", "NSObject"]},
+        {"$classname": "NSDate", "$classes": ["NSDate", "NSObject"]},
+        {"$classname": "Item", "$classes": ["Item", "NSObject"]},
+        # 5: array containing itself and the shared item twice
+        {"$class": uid(1), "NS.objects": [uid(5), uid(6), uid(6), uid(0)]},
+        # 6: item
+        {"$class": uid(4), "name": uid(7), "date": uid(8)},
+        "item",
+        {"$class": uid(3), "NS.time": 0.0},
+        # 9: dictionary
+        {"$class": uid(2), "NS.keys": [uid(7)], "NS.objects": [uid(6)]},
+    ]
+    archive = {"$top": {"root": uid(5), "other": uid(9)}, "$objects": objects}
+
+    top = NSKeyedUnarchiver(plistlib.dumps(archive, fmt=plistlib.FMT_BINARY))
+    array = top["root"]
+    assert array[0] is array
+    assert array[1] is array[2] is top["other"]["item"]
+    assert array[1] == {
+        "name": "item",
+        "date": datetime.datetime(2001, 1, 1, tzinfo=datetime.timezone.utc),
+    }
+    assert array[3] is None
+
+    kept = NSKeyedUnarchiver(archive, removeClassName=False)
+    assert kept["root"][1]["$class"]["$classname"] == "Item"